@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.rules.instrumentation import format_metric
+
+
+# ---------------------------------------------------------------------------
+# Cache keys
+# ---------------------------------------------------------------------------
+
+def payload_digest(data: Dict[str, Any]) -> str:
+    """SHA-256 of a canonical JSON encoding (sorted keys, no whitespace)."""
+    canonical = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def result_cache_key(
+    data: Dict[str, Any],
+    rules_version: Optional[str],
+    mode: str,
+    today: Optional[date] = None,
+) -> str:
+    """
+    Key a validation result by payload, rule set and evaluation mode. Pass
+    `today` when the rule set has date-dependent transforms (RulesEngine.
+    date_dependent) so results roll over at midnight.
+    """
+    day = today.isoformat() if today is not None else "-"
+    return f"{rules_version or '-'}:{mode}:{day}:{payload_digest(data)}"
+
+
+# ---------------------------------------------------------------------------
+# Result cache interface
+# ---------------------------------------------------------------------------
+
+class ResultCache(ABC):
+    """
+    Serialized validation responses keyed by `result_cache_key`.
+
+    Implementations must be thread-safe: sync endpoints call them from the
+    threadpool. Values are opaque bytes, so a shared out-of-process store
+    can implement the same interface.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry (called when the rules are reloaded)."""
+
+    def render_prometheus(self) -> str:
+        return ""
+
+
+class LRUResultCache(ResultCache):
+    """
+    In-process LRU bounded by entry count and total value bytes, with a
+    per-entry TTL. Expired entries are dropped when they are next read.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be >= 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._bytes -= len(value)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            entries, size = len(self._entries), self._bytes
+        return "".join([
+            format_metric(
+                "fafsa_result_cache_requests_total",
+                "counter",
+                "Result cache lookups by outcome.",
+                [({"outcome": "hit"}, self.hits), ({"outcome": "miss"}, self.misses)],
+            ),
+            format_metric(
+                "fafsa_result_cache_evictions_total",
+                "counter",
+                "Entries removed by the size limits (lru) or on read after their TTL (expired).",
+                [({"reason": "lru"}, self.evictions), ({"reason": "expired"}, self.expirations)],
+            ),
+            format_metric(
+                "fafsa_result_cache_entries",
+                "gauge",
+                "Entries currently cached.",
+                [({}, entries)],
+            ),
+            format_metric(
+                "fafsa_result_cache_bytes",
+                "gauge",
+                "Bytes of cached response bodies.",
+                [({}, size)],
+            ),
+        ])
@@ -0,0 +1,239 @@
+import asyncio
+import itertools
+import logging
+import pickle
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from app.responses import render_summary
+from app.rules.engine import RulesEngine
+from app.rules.instrumentation import Histogram, format_histogram, format_metric
+from app.rules.models import EvaluationMode
+
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Queue wait histogram bounds, in nanoseconds
+WAIT_BUCKETS_NS: Tuple[int, ...] = (
+    100_000, 500_000, 1_000_000, 5_000_000, 10_000_000, 25_000_000,
+    50_000_000, 100_000_000, 250_000_000, 1_000_000_000,
+)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a validation cannot be admitted; callers answer 503."""
+
+
+# ---------------------------------------------------------------------------
+# Work units (module-level so process pools can pickle them)
+# ---------------------------------------------------------------------------
+
+def _validate_to_json(
+    engine: RulesEngine,
+    data: Dict[str, Any],
+    mode: EvaluationMode,
+    owned: bool = False,
+) -> Tuple[int, bytes]:
+    """Validate and render in the worker; returns (run time in ns, JSON body)."""
+    start = time.perf_counter_ns()
+    body = render_summary(engine.validate(data, mode, owned=owned), engine)
+    return time.perf_counter_ns() - start, body
+
+
+# Engines a worker process keeps, most recently used last: the parent's
+# current rule set plus a few award years or engines still finishing requests
+WORKER_MAX_ENGINES = 8
+
+# rule-set key -> engine built from the definition the parent sent
+_worker_engines: "OrderedDict[str, RulesEngine]" = OrderedDict()
+
+# _validate_in_process outcomes
+_DONE, _NEEDS_RULES, _BUILD_FAILED = "done", "needs_rules", "build_failed"
+
+
+def _validate_in_process(
+    key: str,
+    definition: Optional[bytes],
+    backend: str,
+    data: Dict[str, Any],
+    mode: EvaluationMode,
+) -> Tuple[str, Any]:
+    """
+    Validate with the worker's engine for rule set `key`. Workers never read
+    rule files: a worker without that engine asks for `definition` (the
+    parent engine's pickled rules) and builds it once.
+    """
+    engine = _worker_engines.get(key)
+    if engine is not None:
+        _worker_engines.move_to_end(key)
+    elif definition is None:
+        return _NEEDS_RULES, None
+    else:
+        try:
+            rules, transforms, version = pickle.loads(definition)
+            engine = RulesEngine(rules, transforms, version=version, backend=backend)
+        except Exception as exc:
+            return _BUILD_FAILED, f"{type(exc).__name__}: {exc}"
+        _worker_engines[key] = engine
+        while len(_worker_engines) > WORKER_MAX_ENGINES:
+            _worker_engines.popitem(last=False)
+    # `data` was unpickled for this call, so it is always ours to write into
+    return _DONE, _validate_to_json(engine, data, mode, owned=True)
+
+
+# ---------------------------------------------------------------------------
+# Bounded validation executor
+# ---------------------------------------------------------------------------
+
+class ValidationExecutor:
+    """
+    Runs engine evaluation on a dedicated pool of `workers` threads or
+    processes, admitting at most `max_queue` validations beyond the ones
+    running. Further submissions raise ExecutorSaturated instead of waiting.
+
+    Admission and bookkeeping happen on the event loop thread only, so no
+    locking is needed. In process mode each worker builds its own copy of
+    the engine it is given, from that engine's rules (never from the rules
+    file, which may have changed since), without engine metrics.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 4,
+        max_queue: int = 64,
+    ):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind {kind!r}; expected one of {EXECUTOR_KINDS}")
+        if workers < 1 or max_queue < 0:
+            raise ValueError("workers must be >= 1 and max_queue >= 0")
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        # engine -> (rule-set key, pickled definition), built on first use
+        self._definitions: "weakref.WeakKeyDictionary[RulesEngine, Tuple[str, bytes]]" = weakref.WeakKeyDictionary()
+        self._keys = itertools.count()
+        self._pool: Executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validate")
+            if kind == "thread"
+            else ProcessPoolExecutor(max_workers=workers)
+        )
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait = Histogram(WAIT_BUCKETS_NS)
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def validate(
+        self,
+        engine: RulesEngine,
+        data: Dict[str, Any],
+        mode: EvaluationMode = EvaluationMode.FULL,
+        owned: bool = False,
+    ) -> bytes:
+        """
+        Validate `data` on the pool and return the rendered /validate body.
+        `owned` is as for RulesEngine.validate.
+        """
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturated(f"{self.in_flight} validations in flight")
+
+        self.in_flight += 1
+        submitted = time.perf_counter_ns()
+        try:
+            if self.kind == "thread":
+                future = self._pool.submit(_validate_to_json, engine, data, mode, owned)
+                run_ns, body = await asyncio.wrap_future(future)
+            else:
+                run_ns, body = await self._validate_in_worker(engine, data, mode, owned)
+        finally:
+            self.in_flight -= 1
+        # Time not spent validating: queueing (plus IPC in process mode)
+        self.wait.observe(max(0, time.perf_counter_ns() - submitted - run_ns))
+        self.completed += 1
+        return body
+
+    def _definition(self, engine: RulesEngine) -> Tuple[str, bytes]:
+        found = self._definitions.get(engine)
+        if found is None:
+            # Keyed per engine object: engines built outside a rules file
+            # have no version, and equal versions may differ in backend
+            key = f"{engine.version or '-'}:{next(self._keys)}"
+            found = self._definitions[engine] = (
+                key, pickle.dumps((engine.rules, engine.transforms, engine.version))
+            )
+        return found
+
+    async def _validate_in_worker(
+        self,
+        engine: RulesEngine,
+        data: Dict[str, Any],
+        mode: EvaluationMode,
+        owned: bool,
+    ) -> Tuple[int, bytes]:
+        key, definition = self._definition(engine)
+        # Send only the key; a worker that hasn't built this engine asks for
+        # the definition, once per worker and rule set
+        outcome, value = await asyncio.wrap_future(
+            self._pool.submit(_validate_in_process, key, None, engine.backend, data, mode)
+        )
+        if outcome == _NEEDS_RULES:
+            outcome, value = await asyncio.wrap_future(
+                self._pool.submit(_validate_in_process, key, definition, engine.backend, data, mode)
+            )
+        if outcome == _BUILD_FAILED:
+            # Shouldn't happen (the parent built the same rules); stay correct
+            logger.warning("Validation worker could not build rules %s: %s; validating in-process", key, value)
+            return await asyncio.to_thread(_validate_to_json, engine, data, mode, owned)
+        return value
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def render_prometheus(self) -> str:
+        return "".join([
+            format_metric(
+                "fafsa_validate_executor_in_flight",
+                "gauge",
+                "Validations admitted to the executor (running or queued).",
+                [({"kind": self.kind}, self.in_flight)],
+            ),
+            format_metric(
+                "fafsa_validate_executor_queue_depth",
+                "gauge",
+                "Admitted validations waiting for a free worker.",
+                [({"kind": self.kind}, self.queued)],
+            ),
+            format_metric(
+                "fafsa_validate_executor_capacity",
+                "gauge",
+                "Workers plus admission queue slots.",
+                [({"kind": self.kind}, self.workers + self.max_queue)],
+            ),
+            format_metric(
+                "fafsa_validate_executor_completed_total",
+                "counter",
+                "Validations completed by the executor.",
+                [({"kind": self.kind}, self.completed)],
+            ),
+            format_metric(
+                "fafsa_validate_executor_rejected_total",
+                "counter",
+                "Validations rejected with 503 because the admission queue was full.",
+                [({"kind": self.kind}, self.rejected)],
+            ),
+            format_histogram(
+                "fafsa_validate_executor_wait_seconds",
+                "Time from submission until a worker finished, minus evaluation time.",
+                [({"kind": self.kind}, self.wait)],
+            ),
+        ])
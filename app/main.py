@@ -1,19 +1,43 @@
-from pathlib import Path
-from typing import Any, Dict
+import asyncio
+import copy
+import hmac
+import json
+import logging
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 
-from fastapi import Depends, FastAPI, Request
-from fastapi.concurrency import asynccontextmanager
-from fastapi.responses import JSONResponse
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.concurrency import asynccontextmanager, run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import ValidationError
 
-from app.models import ApplicationData
-from app.rules.engine import RulesEngine, ValidationSummary
+from app.cache import LRUResultCache, ResultCache, result_cache_key
+from app.executor import ExecutorSaturated, ValidationExecutor
+from app.middleware import RulesVersionHeaderMiddleware
+from app.models import ApplicationData, DeltaRequest
+from app.ndjson import NDJSONStreamingResponse, iter_ndjson_lines
+from app.registry import RuleSetRegistry, UnknownAwardYear, estimate_size
+from app.reloader import RulesReloader
+from app.responses import (
+    render_json,
+    render_summary,
+    schema_error_to_dict,
+    summary_to_dict,
+    validate_json,
+)
+from app.rules import helpers
+from app.rules.batch import BatchScope, active_scope
+from app.rules.engine import RulesEngine
+from app.rules.instrumentation import EngineMetrics
+from app.rules.models import EvaluationMode
+from app.serializer import encoder_for
+from app.sessions import DeltaSession, SessionStore
+from app.shadow import ShadowEvaluator
+from app.settings import Settings
+from app.singleflight import SingleFlight, single_flight_key
 
 
-app = FastAPI(
-    title="FAFSA Validation Service",
-    version="1.0.0",
-    description="Applies FAFSA edit rules to application data."
-)
+logger = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
@@ -23,23 +47,155 @@ app = FastAPI(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup ---------------------------------------------------------------
-    configured_rules_filepath = Path(__file__).parent / "config/rules.yaml"
-    app.state.rules_engine = RulesEngine.from_yaml(
-        configured_rules_filepath.absolute()
+    settings = Settings.from_env()
+    metrics_enabled = settings.metrics_enabled
+    if metrics_enabled and settings.validate_executor == "process":
+        # Worker processes have their own engines; their counts would be lost
+        logger.warning(
+            "Engine metrics are disabled: FAFSA_VALIDATE_EXECUTOR=process doesn't export them "
+            "(set FAFSA_METRICS_ENABLED=false to silence this)"
+        )
+        metrics_enabled = False
+    app.state.settings = settings
+    app.state.engine_metrics = (
+        EngineMetrics(sample_every=settings.metrics_sample_every)
+        if metrics_enabled
+        else None
+    )
+
+    def build_engine(path) -> RulesEngine:
+        engine = RulesEngine.load(path, metrics=app.state.engine_metrics, backend=settings.rules_backend)
+        encoder_for(engine)  # pre-encode the static response fragments now
+        for finding in engine.analysis.findings:
+            logger.warning("%s: %s", path, finding.message)
+        return engine
+
+    reloader = RulesReloader(
+        settings.rules_path.absolute(),
+        build=build_engine,
+        poll_interval=settings.rules_watch_interval,
+    )
+    reloader.add_listener(lambda engine: setattr(app.state, "rules_engine", engine))
+
+    app.state.rule_sets = (
+        RuleSetRegistry(
+            settings.rules_dir.absolute(),
+            build=build_engine,
+            max_engines=settings.rules_max_loaded,
+            max_bytes=settings.rules_max_loaded_bytes,
+            # The metrics registry is shared by every engine, not held by one
+            sizer=lambda engine: estimate_size(engine, shared=[app.state.engine_metrics]),
+        )
+        if settings.rules_dir is not None
+        else None
+    )
+
+    app.state.result_cache = (
+        LRUResultCache(
+            max_entries=settings.result_cache_max_entries,
+            max_bytes=settings.result_cache_max_bytes,
+            ttl_seconds=settings.result_cache_ttl,
+        )
+        if settings.result_cache_enabled
+        else None
+    )
+    if app.state.result_cache is not None:
+        # Keys carry the rules version; clearing just frees the stale entries
+        reloader.add_listener(lambda engine: app.state.result_cache.clear())
+
+    app.state.single_flight = SingleFlight() if settings.single_flight_enabled else None
+
+    app.state.delta_sessions = SessionStore(
+        max_sessions=settings.delta_max_sessions,
+        ttl_seconds=settings.delta_session_ttl,
+    )
+    app.state.validate_executor = ValidationExecutor(
+        kind=settings.validate_executor,
+        workers=settings.validate_workers,
+        max_queue=settings.validate_queue,
+    )
+    app.state.shadow = (
+        ShadowEvaluator(
+            # No engine metrics: shadow results must not mix with live ones
+            RulesEngine.load(settings.shadow_rules_path, backend=settings.rules_backend),
+            sample_every=settings.shadow_sample_every,
+            max_queue=settings.shadow_queue,
+        )
+        if settings.shadow_rules_path is not None
+        else None
     )
+    app.state.rules_reloader = reloader
+    app.state.rules_engine = reloader.engine
+    reloader.start()
+    if app.state.shadow is not None:
+        app.state.shadow.start()
 
     yield   # <-- application runs here
 
     # Shutdown --------------------------------------------------------------
-    # (no-op for now, but here's the place for future cleanup)
-    # e.g., close DB connections, release cached data, etc.
+    await reloader.stop()
+    app.state.validate_executor.shutdown()
+    if app.state.shadow is not None:
+        app.state.shadow.stop()
 
 
-def get_rules_engine(request: Request) -> RulesEngine:
+app = FastAPI(
+    title="FAFSA Validation Service",
+    version="1.0.0",
+    description="Applies FAFSA edit rules to application data.",
+    lifespan=lifespan,
+)
+app.add_middleware(RulesVersionHeaderMiddleware)
+
+
+def get_rules_engine(
+    request: Request,
+    award_year: Optional[str] = Query(None, description="Award year whose rules apply, e.g. 2024-25"),
+    x_award_year: Optional[str] = Header(None),
+) -> RulesEngine:
+    """
+    The engine for the requested award year (query parameter, else the
+    `X-Award-Year` header), or the default rule set when none is given.
+    """
+    selected = award_year or x_award_year
+    if selected:
+        rule_sets: Optional[RuleSetRegistry] = getattr(request.app.state, "rule_sets", None)
+        try:
+            if rule_sets is None:
+                raise UnknownAwardYear(selected)
+            # Loads on first use; concurrent requests share one build
+            engine = rule_sets.get(selected)
+        except UnknownAwardYear:
+            raise HTTPException(status_code=404, detail=f"No rules for award year {selected!r}")
+        request.state.rules_version = engine.version
+        request.state.award_year = selected
+        return engine
+
     if not hasattr(request.app.state, "rules_engine"):
-        rules_path = Path(__file__).parent / "config" / "rules.yaml"
-        request.app.state.rules_engine = RulesEngine.from_yaml(rules_path)
-    return request.app.state.rules_engine
+        settings = Settings.from_env()
+        request.app.state.rules_engine = RulesEngine.load(
+            settings.rules_path,
+            metrics=getattr(request.app.state, "engine_metrics", None),
+            backend=settings.rules_backend,
+        )
+    # Resolve once: the request finishes on this engine even if a reload
+    # swaps app.state.rules_engine mid-flight.
+    engine: RulesEngine = request.app.state.rules_engine
+    request.state.rules_version = engine.version
+    return engine
+
+
+def get_validate_executor(request: Request) -> ValidationExecutor:
+    if not hasattr(request.app.state, "validate_executor"):
+        request.app.state.validate_executor = ValidationExecutor()
+    return request.app.state.validate_executor
+
+
+def require_admin(request: Request, x_admin_token: Optional[str] = Header(None)) -> None:
+    settings: Optional[Settings] = getattr(request.app.state, "settings", None)
+    expected = settings.admin_token if settings else None
+    if expected and not hmac.compare_digest(x_admin_token or "", expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
 
 
 # ---------------------------------------------------------------------------
@@ -51,50 +207,330 @@ def health():
     return {"status": "ok"}
 
 
+# ---------------------------------------------------------------------------
+# Metrics Endpoint
+# ---------------------------------------------------------------------------
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request):
+    """Prometheus text exposition of engine metrics (empty when disabled)."""
+    engine_metrics: Optional[EngineMetrics] = getattr(request.app.state, "engine_metrics", None)
+    reloader: Optional[RulesReloader] = getattr(request.app.state, "rules_reloader", None)
+    result_cache: Optional[ResultCache] = getattr(request.app.state, "result_cache", None)
+    body = engine_metrics.render_prometheus() if engine_metrics is not None else ""
+    if reloader is not None:
+        body += reloader.render_prometheus()
+    if result_cache is not None:
+        body += result_cache.render_prometheus()
+    executor: Optional[ValidationExecutor] = getattr(request.app.state, "validate_executor", None)
+    if executor is not None:
+        body += executor.render_prometheus()
+    single_flight: Optional[SingleFlight] = getattr(request.app.state, "single_flight", None)
+    if single_flight is not None:
+        body += single_flight.render_prometheus()
+    rule_sets: Optional[RuleSetRegistry] = getattr(request.app.state, "rule_sets", None)
+    if rule_sets is not None:
+        body += rule_sets.render_prometheus()
+    shadow: Optional[ShadowEvaluator] = getattr(request.app.state, "shadow", None)
+    if shadow is not None:
+        body += shadow.render_prometheus()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Admin Endpoints
+# ---------------------------------------------------------------------------
+
+@app.get("/admin/rules", dependencies=[Depends(require_admin)])
+def rules_status(request: Request):
+    """
+    Reports the active rule set and its static analysis, the outcome of the
+    last reload and the loaded award years.
+    """
+    reloader: RulesReloader = request.app.state.rules_reloader
+    rule_sets: Optional[RuleSetRegistry] = getattr(request.app.state, "rule_sets", None)
+    return {
+        "version": reloader.engine.version,
+        "path": str(reloader.path),
+        "loaded_at": reloader.loaded_at,
+        "last_error": reloader.last_error,
+        "analysis": reloader.engine.analysis.report(),
+        "award_years": rule_sets.status() if rule_sets is not None else None,
+    }
+
+
+@app.post("/admin/rules/reload", dependencies=[Depends(require_admin)])
+async def reload_rules(request: Request):
+    """
+    Rebuilds the engine from the rules file in the background and swaps it
+    in atomically. On a parse/validation failure the current engine stays
+    active and 422 is returned. When a new engine is swapped in, loaded
+    award-year rule sets are dropped and rebuilt from their files on next use.
+    """
+    reloader: RulesReloader = request.app.state.rules_reloader
+    result = await reloader.reload()
+    rule_sets: Optional[RuleSetRegistry] = getattr(request.app.state, "rule_sets", None)
+    if rule_sets is not None and result.reloaded:
+        rule_sets.clear()
+    body = {
+        "reloaded": result.reloaded,
+        "version": result.version,
+        "previous_version": result.previous_version,
+        "error": result.error,
+    }
+    return JSONResponse(content=body, status_code=422 if result.error else 200)
+
+
+def get_shadow(request: Request) -> ShadowEvaluator:
+    shadow: Optional[ShadowEvaluator] = getattr(request.app.state, "shadow", None)
+    if shadow is None:
+        raise HTTPException(status_code=404, detail="Shadow evaluation is not configured")
+    return shadow
+
+
+@app.get("/admin/shadow", dependencies=[Depends(require_admin)])
+def shadow_report(shadow: ShadowEvaluator = Depends(get_shadow)):
+    """
+    Per-rule differences between the candidate rules and the served results
+    on sampled /validate traffic: failures the candidate adds
+    (`new_failures`), failures it no longer reports (`resolved_failures`)
+    and error/warning flips (`severity_changes`).
+    """
+    return shadow.report()
+
+
+@app.post("/admin/shadow/reset", dependencies=[Depends(require_admin)])
+async def reset_shadow(request: Request, shadow: ShadowEvaluator = Depends(get_shadow)):
+    """
+    Reloads the candidate rules file and starts counting from zero. If the
+    file fails to load, the current candidate and counts are kept and 422 is
+    returned.
+    """
+    settings: Settings = request.app.state.settings
+    try:
+        candidate = await asyncio.to_thread(
+            RulesEngine.load, settings.shadow_rules_path, backend=settings.rules_backend
+        )
+    except Exception as exc:
+        return JSONResponse(content={"error": f"{type(exc).__name__}: {exc}"}, status_code=422)
+    shadow.reset(candidate)
+    return shadow.report()
+
+
 # ---------------------------------------------------------------------------
 # Validation Endpoint
 # ---------------------------------------------------------------------------
 
+def _offer_shadow(request: Request, payload: ApplicationData, mode: EvaluationMode, body: bytes) -> None:
+    # Candidates are compared with the default rule set only
+    shadow: Optional[ShadowEvaluator] = getattr(request.app.state, "shadow", None)
+    if shadow is not None and getattr(request.state, "award_year", None) is None:
+        shadow.offer(payload, mode, body)
+
+
 @app.post("/validate")
-def validate_application(payload: ApplicationData, engine: RulesEngine = Depends(get_rules_engine),):
+async def validate_application(
+    request: Request,
+    payload: ApplicationData,
+    mode: EvaluationMode = Query(EvaluationMode.FULL, description="full, errors_only or fail_fast"),
+    engine: RulesEngine = Depends(get_rules_engine),
+    executor: ValidationExecutor = Depends(get_validate_executor),
+):
     """
     Accepts FAFSA application data, applies the configured rules,
-    and returns the validation summary.
-    """
-    data: Dict[str, Any] = payload.model_dump()
-    summary: ValidationSummary = engine.validate(data)
-
-    response = {
-        "valid": summary.valid,
-        "errors": [
-            {
-                "rule": err.name,
-                "severity": err.severity.value,
-                "message": err.message,
-                "details": err.details,
-            }
-            for err in summary.errors
-        ],
-        "warnings": [
-            {
-                "rule": warn.name,
-                "severity": warn.severity.value,
-                "message": warn.message,
-                "details": warn.details,
-            }
-            for warn in summary.warnings
-        ],
-        "passed": [
-            {
-                "rule": res.name,
-                "passed": res.passed,
-                "severity": res.severity.value,
-                "message": res.message,
-                "details": res.details,
-            }
-            for res in summary.successes
-        ],
-    }
+    and returns the validation summary. With `mode=errors_only` or
+    `mode=fail_fast`, `passed` is empty.
+
+    Evaluation runs on the bounded validation executor; when its admission
+    queue is full the request is shed with 503 and `Retry-After`.
+    Concurrent requests with byte-identical bodies (and the same rules and
+    mode) share one evaluation. With shadow rules configured, a sample of
+    responses is queued for comparison in the background.
+    """
+    # Only the fields the rules read, as model_dump() would give them; the
+    # dict is ours, so transforms write into it directly
+    data: Dict[str, Any] = engine.project(payload)
+
+    result_cache: Optional[ResultCache] = getattr(request.app.state, "result_cache", None)
+    cache_key = None
+    if result_cache is not None:
+        cache_key = result_cache_key(
+            data, engine.version, mode.value, date.today() if engine.date_dependent else None
+        )
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            _offer_shadow(request, payload, mode, cached)
+            return Response(content=cached, media_type="application/json")
+
+    def evaluate() -> Awaitable[bytes]:
+        return executor.validate(engine, data, mode, owned=True)
+
+    single_flight: Optional[SingleFlight] = getattr(request.app.state, "single_flight", None)
+    try:
+        if single_flight is not None:
+            # The raw body is already read (and kept) by the payload parsing
+            key = single_flight_key(
+                await request.body(), engine.version, mode.value,
+                date.today() if engine.date_dependent else None,
+            )
+            body = await single_flight.do(key, evaluate)
+        else:
+            body = await evaluate()
+    except ExecutorSaturated:
+        settings: Optional[Settings] = getattr(request.app.state, "settings", None)
+        retry_after = settings.validate_retry_after if settings else 1
+        raise HTTPException(
+            status_code=503,
+            detail="Validation capacity exhausted; retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
 
     # HTTP 200 always; validity is reported in the body
-    return JSONResponse(content=response)
+    if cache_key is not None:
+        result_cache.set(cache_key, body)  # type: ignore[union-attr]
+    _offer_shadow(request, payload, mode, body)
+    return Response(content=body, media_type="application/json")
+
+
+# ---------------------------------------------------------------------------
+# Batch Validation Endpoint
+# ---------------------------------------------------------------------------
+
+@app.post("/validate/batch")
+def validate_batch(
+    payloads: List[Any] = Body(...),
+    columnar: bool = Query(False, description="Evaluate rules column-wise with NumPy"),
+    mode: EvaluationMode = Query(EvaluationMode.FULL, description="full, errors_only or fail_fast"),
+    engine: RulesEngine = Depends(get_rules_engine),
+):
+    """
+    Accepts an array of FAFSA applications and returns one result per item,
+    in request order. Items that fail the schema are reported in place
+    (with `schema_errors`) instead of failing the whole batch.
+    """
+    results: List[Optional[bytes]] = [None] * len(payloads)
+    positions: List[int] = []
+    records: List[Dict[str, Any]] = []
+
+    for i, raw in enumerate(payloads):
+        try:
+            application = ApplicationData.model_validate(raw)
+        except ValidationError as exc:
+            results[i] = render_json(schema_error_to_dict(exc))
+            continue
+        positions.append(i)
+        records.append(engine.project(application))
+
+    try:
+        summaries = engine.validate_many(records, columnar=columnar, mode=mode, owned=True)
+    except ImportError as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+
+    for i, summary in zip(positions, summaries):
+        results[i] = render_summary(summary, engine)
+
+    body = b'{"results":[' + b",".join(results) + b"]}"  # type: ignore[arg-type]
+    return Response(content=body, media_type="application/json")
+
+
+# ---------------------------------------------------------------------------
+# Incremental Validation Endpoint
+# ---------------------------------------------------------------------------
+
+@app.post("/validate/delta")
+def validate_delta(
+    request: Request,
+    body: DeltaRequest,
+    engine: RulesEngine = Depends(get_rules_engine),
+):
+    """
+    Starts a session from a full `application`, or applies `changes` to the
+    session behind `token` and re-evaluates only the transforms and rules
+    that read a changed path. Returns the /validate shape plus a new
+    `token` for the next edit, which replaces the one sent. Unknown, expired
+    or replaced tokens answer 404.
+    """
+    if not hasattr(request.app.state, "delta_sessions"):
+        request.app.state.delta_sessions = SessionStore()
+    sessions: SessionStore = request.app.state.delta_sessions
+
+    if body.application is not None:
+        application = body.application.model_dump()
+        state = engine.validate_state(application)
+        replaces: Optional[str] = None
+    else:
+        session = sessions.get(body.token)  # type: ignore[arg-type]
+        if session is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired validation token")
+
+        edited = copy.deepcopy(session.application)
+        for path, value in body.changes.items():
+            helpers.set_by_path(edited, path, value)
+        try:
+            application = ApplicationData.model_validate(edited).model_dump()
+        except ValidationError as exc:
+            return JSONResponse(
+                status_code=422,
+                content={"detail": json.loads(exc.json(include_url=False))},
+            )
+        # Take changed values from the parsed application (coerced types, defaults)
+        changes = {path: helpers.get_by_path(application, path) for path in body.changes}
+        state = engine.validate_delta(session.state, changes)
+        replaces = body.token
+
+    token = sessions.put(DeltaSession(application=application, state=state), replaces=replaces)
+    return JSONResponse(content={**summary_to_dict(state.summary()), "token": token})
+
+
+# ---------------------------------------------------------------------------
+# Streaming Validation Endpoint
+# ---------------------------------------------------------------------------
+
+def _validate_ndjson_lines(
+    engine: RulesEngine,
+    lines: List[Tuple[int, Optional[bytes]]],
+    scope: Optional[BatchScope] = None,
+) -> bytes:
+    if scope is not None:
+        with scope.active():
+            return _validate_ndjson_lines(engine, lines)
+    active = active_scope()
+    out = bytearray()
+    for line_number, line in lines:
+        if active is not None:
+            active.next_record()
+        if line is None:
+            result: Dict[str, Any] = {
+                "valid": False,
+                "errors": [],
+                "warnings": [],
+                "passed": [],
+                "schema_errors": [
+                    {"type": "line_too_long", "loc": [], "msg": "Line exceeds maximum length"}
+                ],
+            }
+        else:
+            result = validate_json(engine, line)
+        out += json.dumps({"line": line_number, **result}, separators=(",", ":")).encode("utf-8")
+        out += b"\n"
+    return bytes(out)
+
+
+@app.post("/validate/stream")
+async def validate_stream(request: Request, engine: RulesEngine = Depends(get_rules_engine)):
+    """
+    Accepts an `application/x-ndjson` body (one application per line) and
+    streams back one NDJSON result per line, tagged with its 1-based line
+    number. The body is consumed incrementally, so memory stays flat
+    regardless of upload size; malformed lines yield error records.
+    Batch-scoped rules compare each line with the earlier lines of the
+    same upload.
+    """
+    scope = BatchScope() if engine.batch_scoped else None
+
+    async def results() -> AsyncIterator[bytes]:
+        async for lines in iter_ndjson_lines(request.stream()):
+            # Keep rule evaluation off the event loop
+            yield await run_in_threadpool(_validate_ndjson_lines, engine, lines, scope)
+
+    return NDJSONStreamingResponse(results())
@@ -0,0 +1,33 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RulesVersionHeaderMiddleware:
+    """
+    Reports the checksum of the rule set that served each request in an
+    `X-Rules-Version` header (falls back to the active engine when the
+    request never resolved one, e.g. /health).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_version(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                version = scope.get("state", {}).get("rules_version")
+                if version is None:
+                    engine = getattr(scope["app"].state, "rules_engine", None)
+                    version = getattr(engine, "version", None)
+                if version:
+                    message.setdefault("headers", [])
+                    message["headers"] = [
+                        *message["headers"],
+                        (b"x-rules-version", version.encode("latin-1")),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_version)
@@ -1,7 +1,7 @@
 from datetime import date
-from typing import Optional, Literal
+from typing import Any, Dict, Optional, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 # ---------------------------------------------------------------------------
@@ -51,3 +51,29 @@ class ApplicationData(BaseModel):
         "extra": "forbid",
         "populate_by_name": True,
     }
+
+
+# ---------------------------------------------------------------------------
+# Incremental Validation Request
+# ---------------------------------------------------------------------------
+
+class DeltaRequest(BaseModel):
+    """
+    Body of /validate/delta: either a full `application` (starts a session)
+    or the `token` of a previous result plus `changes` (dotted path -> value).
+    """
+    token: Optional[str] = None
+    application: Optional[ApplicationData] = None
+    changes: Dict[str, Any] = {}
+
+    model_config = {"extra": "forbid"}
+
+    @model_validator(mode="after")
+    def _token_xor_application(self) -> "DeltaRequest":
+        if (self.token is None) == (self.application is None):
+            raise ValueError("Provide exactly one of 'token' or 'application'")
+        if self.application is not None and self.changes:
+            raise ValueError("'changes' requires a 'token'")
+        if any(not path for path in self.changes):
+            raise ValueError("Change paths must be non-empty")
+        return self
@@ -0,0 +1,74 @@
+from typing import AsyncIterator, List, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+# Lines longer than this are reported as errors and discarded, so a missing
+# newline can't make the reader buffer an unbounded amount of input.
+MAX_LINE_BYTES = 1024 * 1024
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = MAX_LINE_BYTES,
+) -> AsyncIterator[List[Tuple[int, Optional[bytes]]]]:
+    """
+    Incrementally split an NDJSON byte stream into numbered lines.
+
+    Yields one list per received chunk holding the complete lines found in
+    it as `(line_number, line)` pairs (1-based, blank lines skipped). A line
+    over `max_line_bytes` is yielded as `(line_number, None)`. Only the
+    trailing partial line is carried between chunks.
+    """
+    buffer = bytearray()
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        lines: List[Tuple[int, Optional[bytes]]] = []
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                break
+            line_number += 1
+            if oversized or len(buffer) + (end - start) > max_line_bytes:
+                lines.append((line_number, None))
+            else:
+                buffer += chunk[start:end]
+                if buffer.strip():
+                    lines.append((line_number, bytes(buffer)))
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+        if not oversized:
+            if len(buffer) + (len(chunk) - start) > max_line_bytes:
+                oversized = True
+                buffer.clear()
+            else:
+                buffer += chunk[start:]
+        if lines:
+            yield lines
+
+    if oversized or buffer.strip():
+        line_number += 1
+        yield [(line_number, None if oversized else bytes(buffer))]
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body is produced while the request body is still
+    being read. Starlette's default (pre ASGI 2.4) disconnect listener would
+    call `receive()` concurrently and swallow request-body messages, so this
+    streams directly; a client disconnect surfaces as a failed send instead.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
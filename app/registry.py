@@ -0,0 +1,242 @@
+import enum
+import gc
+import logging
+import re
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+from app.rules.engine import RulesEngine
+from app.rules.instrumentation import format_metric
+
+
+logger = logging.getLogger(__name__)
+
+# Rule files are named after the award year they implement: 2024-25.yaml
+AWARD_YEAR = re.compile(r"^\d{4}-\d{2}$")
+
+
+class UnknownAwardYear(LookupError):
+    """No rules file exists for the requested award year."""
+
+
+# ---------------------------------------------------------------------------
+# Memory accounting
+# ---------------------------------------------------------------------------
+
+def _is_shared(obj: Any, module_dicts: Set[int]) -> bool:
+    """Objects every engine refers to but none owns: code and constants of imported modules."""
+    if isinstance(obj, (type, types.ModuleType, types.BuiltinFunctionType, enum.Enum)):
+        return True
+    if isinstance(obj, dict) and id(obj) in module_dicts:
+        return True
+    if isinstance(obj, types.FunctionType):
+        module = sys.modules.get(obj.__module__ or "")
+        return module is not None and getattr(module, obj.__qualname__, None) is obj
+    return False
+
+
+def estimate_size(root: Any, shared: Iterable[Any] = ()) -> int:
+    """
+    Approximate bytes retained by `root`: sys.getsizeof over every object
+    reachable from it, stopping at classes, modules, module-level functions
+    and the `shared` objects, which outlive any one engine.
+    """
+    module_dicts = {id(vars(module)) for module in list(sys.modules.values()) if module is not None}
+    seen: Set[int] = {id(obj) for obj in shared}
+    pending = [root]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or _is_shared(obj, module_dicts):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj, 0)
+        pending.extend(gc.get_referents(obj))
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Rule set registry
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class _Entry:
+    engine: RulesEngine
+    path: Path
+    size_bytes: int
+    loaded_at: float
+
+
+class RuleSetRegistry:
+    """
+    The rule sets of several award years, one `<award year>.yaml` file each
+    in `directory`.
+
+    Engines are built on first use and kept in an LRU bounded by count and
+    by estimated size (`estimate_size`); the least recently used ones are
+    dropped first, but the newest is always kept. Concurrent first requests
+    for one award year share a single build: the first caller builds, the
+    others wait for its result (or its exception). `get` blocks, so call it
+    from worker threads, not the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        build: Callable[[Path], RulesEngine],
+        max_engines: int = 4,
+        max_bytes: int = 256 * 1024 * 1024,
+        sizer: Callable[[Any], int] = estimate_size,
+    ):
+        if max_engines < 1 or max_bytes < 1:
+            raise ValueError("max_engines and max_bytes must be >= 1")
+        self.directory = directory
+        self.max_engines = max_engines
+        self.max_bytes = max_bytes
+        self._build = build
+        self._sizer = sizer
+        self._lock = threading.Lock()
+        # award year -> entry, least recently used first
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._loading: Dict[str, "Future[RulesEngine]"] = {}
+        self._paths = self._discover()
+        self._bytes = 0
+        # Bumped by clear(): builds started before it aren't cached
+        self._generation = 0
+        self.hits = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.evictions = 0
+
+    def _discover(self) -> Dict[str, Path]:
+        try:
+            candidates = sorted(self.directory.glob("*.yaml"))
+        except OSError:
+            return {}
+        return {path.stem: path for path in candidates if AWARD_YEAR.match(path.stem)}
+
+    @property
+    def award_years(self) -> List[str]:
+        with self._lock:
+            return sorted(self._paths)
+
+    def get(self, award_year: str) -> RulesEngine:
+        """The engine for `award_year`, building it if needed. Raises UnknownAwardYear."""
+        with self._lock:
+            entry = self._entries.get(award_year)
+            if entry is not None:
+                self._entries.move_to_end(award_year)
+                self.hits += 1
+                return entry.engine
+            future = self._loading.get(award_year)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                path = self._paths.get(award_year)
+                if path is None and AWARD_YEAR.match(award_year):
+                    # Files added since the last scan
+                    self._paths = self._discover()
+                    path = self._paths.get(award_year)
+                if path is None:
+                    raise UnknownAwardYear(award_year)
+                future = self._loading[award_year] = Future()
+                generation = self._generation
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            engine = self._build(path)
+            size = self._sizer(engine)
+        except BaseException as exc:
+            with self._lock:
+                del self._loading[award_year]
+                self.failures += 1
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._loading[award_year]
+            self.loads += 1
+            if generation == self._generation:
+                self._entries[award_year] = _Entry(engine, path, size, time.time())
+                self._bytes += size
+                self._evict()
+        logger.info("Loaded rules for award year %s (%s, ~%d bytes)", award_year, engine.version, size)
+        future.set_result(engine)
+        return engine
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (len(self._entries) > self.max_engines or self._bytes > self.max_bytes):
+            award_year, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size_bytes
+            self.evictions += 1
+            logger.info("Evicted rules for award year %s", award_year)
+
+    def clear(self) -> None:
+        """Drop every loaded engine and rescan the directory."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+            self._paths = self._discover()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": str(self.directory),
+                "award_years": sorted(self._paths),
+                "loaded": {
+                    award_year: {
+                        "version": entry.engine.version,
+                        "size_bytes": entry.size_bytes,
+                        "loaded_at": entry.loaded_at,
+                    }
+                    for award_year, entry in self._entries.items()
+                },
+                "size_bytes": self._bytes,
+            }
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            engines, size = len(self._entries), self._bytes
+        return "".join([
+            format_metric(
+                "fafsa_rule_sets_requests_total",
+                "counter",
+                "Award-year rule set lookups by outcome (coalesced: waited on another request's load).",
+                [
+                    ({"outcome": "hit"}, self.hits),
+                    ({"outcome": "load"}, self.loads),
+                    ({"outcome": "coalesced"}, self.coalesced),
+                    ({"outcome": "failure"}, self.failures),
+                ],
+            ),
+            format_metric(
+                "fafsa_rule_sets_evictions_total",
+                "counter",
+                "Loaded rule sets dropped by the registry's size limits.",
+                [({}, self.evictions)],
+            ),
+            format_metric(
+                "fafsa_rule_sets_loaded",
+                "gauge",
+                "Award-year rule sets currently loaded.",
+                [({}, engines)],
+            ),
+            format_metric(
+                "fafsa_rule_sets_bytes",
+                "gauge",
+                "Estimated memory held by loaded award-year rule sets.",
+                [({}, size)],
+            ),
+        ])
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from app.rules.engine import RulesEngine
+from app.rules.instrumentation import format_metric
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReloadResult:
+    reloaded: bool
+    version: Optional[str]
+    previous_version: Optional[str] = None
+    error: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Rules hot-reload
+# ---------------------------------------------------------------------------
+
+class RulesReloader:
+    """
+    Keeps the active RulesEngine in sync with its rules file.
+
+    New engines are built (parsed + compiled) in a worker thread and only
+    swapped in once they are complete; the swap itself is a single reference
+    assignment, so requests that already hold the previous engine finish on
+    it. If the file fails to parse or compile, the current engine stays
+    active and the error is recorded.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        build: Callable[[Path], RulesEngine],
+        poll_interval: float = 0.0,
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._build = build
+        self._listeners: List[Callable[[RulesEngine], None]] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stamp = self._file_stamp()
+        self.engine: RulesEngine = build(path)
+        self.loaded_at = time.time()
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+        self.failures = 0
+
+    def add_listener(self, callback: Callable[[RulesEngine], None]) -> None:
+        """Call `callback(new_engine)` after every successful swap."""
+        self._listeners.append(callback)
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def reload(self) -> ReloadResult:
+        """Rebuild the engine from disk and swap it in if the rules changed."""
+        async with self._lock:
+            current = self.engine
+            self._stamp = self._file_stamp()
+            try:
+                engine = await asyncio.to_thread(self._build, self.path)
+            except Exception as exc:
+                self.failures += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                logger.error("Rules reload failed; keeping version %s: %s", current.version, self.last_error)
+                return ReloadResult(reloaded=False, version=current.version, error=self.last_error)
+
+            self.last_error = None
+            if engine.version == current.version:
+                return ReloadResult(reloaded=False, version=current.version)
+
+            self.engine = engine
+            self.loaded_at = time.time()
+            self.reloads += 1
+            for callback in self._listeners:
+                callback(engine)
+            logger.info("Rules reloaded: %s -> %s", current.version, engine.version)
+            return ReloadResult(reloaded=True, version=engine.version, previous_version=current.version)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self._file_stamp() != self._stamp:
+                await self.reload()
+
+    def start(self) -> None:
+        """Start polling the rules file (no-op when poll_interval <= 0)."""
+        if self.poll_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def render_prometheus(self) -> str:
+        return "".join([
+            format_metric(
+                "fafsa_rules_info",
+                "gauge",
+                "Active rule set (checksum of the rules file).",
+                [({"version": self.engine.version or ""}, 1)],
+            ),
+            format_metric(
+                "fafsa_rules_reloads_total",
+                "counter",
+                "Rules reload attempts by outcome.",
+                [({"outcome": "success"}, self.reloads), ({"outcome": "failure"}, self.failures)],
+            ),
+        ])
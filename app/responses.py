@@ -0,0 +1,100 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import ValidationError
+
+from app.models import ApplicationData
+from app.rules.engine import RulesEngine
+from app.rules.models import Details, RuleResult, ValidationSummary
+from app.serializer import encoder_for
+
+
+# ---------------------------------------------------------------------------
+# Response shaping shared by every validation endpoint
+# ---------------------------------------------------------------------------
+
+def _plain_details(details: Any) -> Any:
+    # Details share their static part with other results; `json` needs a dict
+    return details.to_dict() if isinstance(details, Details) else details
+
+
+def failure_to_dict(result: RuleResult) -> Dict[str, Any]:
+    """Render one failed rule as an item of `errors` or `warnings`."""
+    return {
+        "rule": result.name,
+        "severity": result.severity.value,
+        "message": result.message,
+        "details": _plain_details(result.details),
+    }
+
+
+def summary_to_dict(summary: ValidationSummary) -> Dict[str, Any]:
+    """Render a ValidationSummary in the /validate response contract."""
+    return {
+        "valid": summary.valid,
+        "errors": [failure_to_dict(err) for err in summary.errors],
+        "warnings": [failure_to_dict(warn) for warn in summary.warnings],
+        "passed": [
+            {
+                "rule": res.name,
+                "passed": res.passed,
+                "severity": res.severity.value,
+                "message": res.message,
+                "details": _plain_details(res.details),
+            }
+            for res in summary.successes
+        ],
+    }
+
+
+def render_json(content: Any) -> bytes:
+    """`content` encoded exactly as JSONResponse does."""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_summary(summary: ValidationSummary, engine: Optional[RulesEngine] = None) -> bytes:
+    """
+    The /validate body for `summary`, encoded exactly as JSONResponse does.
+    Pass the engine that produced it to use its pre-encoded fast path.
+    """
+    if engine is not None:
+        return encoder_for(engine).encode(summary)
+    return render_json(summary_to_dict(summary))
+
+
+def schema_error_to_dict(exc: ValidationError) -> Dict[str, Any]:
+    """
+    Render a per-item schema failure. Keeps the /validate keys so consumers
+    can treat every item alike, and adds the pydantic error list.
+    """
+    schema_errors: List[Dict[str, Any]] = json.loads(exc.json(include_url=False))
+    return {
+        "valid": False,
+        "errors": [],
+        "warnings": [],
+        "passed": [],
+        "schema_errors": schema_errors,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Raw payload validation (bulk and streaming paths)
+# ---------------------------------------------------------------------------
+
+def validate_json(engine: RulesEngine, raw: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Parse one JSON-encoded application, run it through the schema and the
+    engine, and render the result. Malformed JSON and schema failures are
+    returned as schema-error results rather than raised.
+    """
+    try:
+        application = ApplicationData.model_validate_json(raw)
+    except ValidationError as exc:
+        return schema_error_to_dict(exc)
+    return summary_to_dict(engine.validate_model(application))
@@ -0,0 +1,6 @@
+import sys
+
+from app.rules.cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Load-time analysis of a rule set.
+
+`analyze` reads the parsed rules and transforms, and the pydantic schema of
+the applications they validate, and returns a RuleSetAnalysis: what the
+engine can change in its plan without changing results, what looks wrong,
+and an estimate of the evaluation cost saved. The engine acts on three of
+its results when it compiles:
+
+* dead transforms (nothing reads their output) are left out of the plan;
+* rules with identical checks (same type, fields, operands and `when`; only
+  name, severity and message differ) share one evaluation per application,
+  each still reporting under its own name;
+* in FAIL_FAST mode rules run cheapest first, so a failing application is
+  rejected after less work.
+
+Everything else is only reported: fields the schema doesn't have, `when`
+conditions that can never hold, transforms the registry doesn't know.
+
+Costs are estimates in units of one path lookup, from a per-rule-type table
+(`rule_cost`), not measurements; compare them with each other only.
+"""
+import datetime
+import typing
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from pydantic import BaseModel
+
+from app.rules.helpers import TRANSFORM_REGISTRY, split_path
+from app.rules.models import (
+    FieldComparisonRule,
+    PresenceRule,
+    RequiresRule,
+    Rule,
+    RuleSeverity,
+    StringMatchRule,
+    TransformRule,
+    UniqueInBatchRule,
+    ValueComparisonRule,
+    ValueInSetRule,
+)
+
+
+# Work per check beyond its path lookups, in path lookups
+_OPERATION_COST: Dict[type, float] = {
+    PresenceRule: 0.0,
+    ValueInSetRule: 0.0,
+    RequiresRule: 0.0,
+    ValueComparisonRule: 0.5,   # float() of the value
+    FieldComparisonRule: 1.0,   # float() of both sides
+    StringMatchRule: 1.5,       # str() and a regex match
+    UniqueInBatchRule: 3.0,     # a keyed hash per value
+}
+_UNKNOWN_OPERATION_COST = 3.0
+
+# Built-in rules whose results only carry their name, severity and message
+# from the rule itself, so identical checks can share one evaluation
+_SHAREABLE = (PresenceRule, StringMatchRule, ValueComparisonRule, FieldComparisonRule, ValueInSetRule, RequiresRule)
+
+# Rule attributes that don't affect pass/fail or details
+_PRESENTATION = frozenset({"name", "severity", "message"})
+
+FINDING_KINDS = (
+    "unknown_field",
+    "unreachable_condition",
+    "unknown_transform",
+    "dead_transform",
+    "duplicate_check",
+)
+
+
+def rule_cost(rule: Rule) -> float:
+    """Estimated cost of one check of `rule`: its lookups plus its own work."""
+    return len(rule.read_fields()) + _OPERATION_COST.get(type(rule), _UNKNOWN_OPERATION_COST)
+
+
+@dataclass(frozen=True)
+class Finding:
+    kind: str
+    # Rule or transform names, in file order
+    subjects: Tuple[str, ...]
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "subjects": list(self.subjects), "message": self.message}
+
+
+@dataclass
+class RuleSetAnalysis:
+    findings: List[Finding]
+    # Transforms no rule or condition reads, directly or through other transforms
+    dead_transforms: List[TransformRule]
+    # Rule positions with identical checks; whichever is reached first evaluates
+    shared_checks: List[List[int]]
+    # Rule positions in FAIL_FAST evaluation order
+    fail_fast_order: List[int]
+    costs: Dict[str, Dict[str, float]]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "findings": [finding.to_dict() for finding in self.findings],
+            "dead_transforms": [t.name for t in self.dead_transforms],
+            "shared_checks": len(self.shared_checks),
+            "fail_fast_reordered": self.fail_fast_order != sorted(self.fail_fast_order),
+            "costs": self.costs,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+# Below this, any path may exist (dicts, Any, models accepting extra fields)
+_OPEN = object()
+
+
+def _unwrap_optional(annotation: Any) -> Tuple[Any, bool]:
+    """(annotation without None, whether None is allowed)."""
+    if typing.get_origin(annotation) is Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        nullable = len(args) < len(typing.get_args(annotation))
+        return (args[0] if len(args) == 1 else _OPEN), nullable
+    return annotation, annotation is type(None)
+
+
+def _resolve(schema: type, parts: Tuple[str, ...]) -> Tuple[bool, Any, bool]:
+    """(path can exist, annotation of its value or _OPEN, value may be None)."""
+    current: Any = schema
+    nullable = False
+    for part in parts:
+        if not (isinstance(current, type) and issubclass(current, BaseModel)):
+            # Scalars have nothing below them; containers can't be checked
+            if current in (str, int, float, bool, datetime.date, datetime.datetime) or typing.get_origin(current) is typing.Literal:
+                return False, None, True
+            return True, _OPEN, True
+        field = current.model_fields.get(part)
+        if field is None:
+            if current.model_config.get("extra") == "allow":
+                return True, _OPEN, True
+            return False, None, True
+        current, optional = _unwrap_optional(field.annotation)
+        nullable = nullable or optional or not field.is_required()
+    return True, current, nullable
+
+
+def _reachable(annotation: Any, nullable: bool, equals: Any) -> bool:
+    """Whether a value of `annotation` can `==` equals."""
+    if equals is None:
+        return nullable
+    if annotation is _OPEN:
+        return True
+    if typing.get_origin(annotation) is typing.Literal:
+        return any(equals == option for option in typing.get_args(annotation))
+    if annotation is bool:
+        return equals in (True, False)
+    if annotation in (int, float):
+        return isinstance(equals, (int, float))
+    if annotation is str:
+        return isinstance(equals, str)
+    return True
+
+
+def _default_schema() -> Optional[type]:
+    from app.models import ApplicationData
+
+    return ApplicationData
+
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+def _frozen(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_frozen(v) for v in value))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((repr(k), _frozen(v)) for k, v in value.items())))
+    try:
+        hash(value)
+    except TypeError:
+        return ("repr", repr(value))
+    # 1 == 1.0 == True compare equal but can give different details
+    return (type(value).__name__, value)
+
+
+def _check_key(rule: Rule) -> Optional[Tuple[Any, ...]]:
+    if type(rule) not in _SHAREABLE or not is_dataclass(rule):
+        return None
+    return (type(rule), *(
+        (f.name, _frozen(getattr(rule, f.name))) for f in fields(rule) if f.name not in _PRESENTATION
+    ))
+
+
+class _Outputs:
+    """Paths transforms derive: a path at, above or below one of them may exist."""
+
+    def __init__(self, outputs: Iterable[Tuple[str, ...]]):
+        self.outputs = set(outputs)
+        self.prefixes = {o[:depth] for o in self.outputs for depth in range(1, len(o) + 1)}
+
+    def cover(self, parts: Tuple[str, ...]) -> bool:
+        return parts in self.prefixes or any(parts[:depth] in self.outputs for depth in range(1, len(parts)))
+
+
+def _mean_cost_to_errors(order: Sequence[int], costs: Sequence[float], errors: Set[int]) -> float:
+    """Mean cost spent up to and including each ERROR rule, in `order`."""
+    if not errors:
+        return 0.0
+    spent = total = 0.0
+    for i in order:
+        spent += costs[i]
+        if i in errors:
+            total += spent
+    return total / len(errors)
+
+
+def analyze(
+    rules: Sequence[Rule],
+    transforms: Sequence[TransformRule],
+    live_transforms: Iterable[TransformRule],
+    schema: Optional[type] = None,
+) -> RuleSetAnalysis:
+    """
+    Analyze a rule set. `live_transforms` are the transforms some rule or
+    condition reads (the engine works this out from its transform graph);
+    `schema` defaults to ApplicationData.
+    """
+    schema = schema or _default_schema()
+    findings: List[Finding] = []
+
+    # Transforms
+    live = {id(t) for t in live_transforms}
+    dead: List[TransformRule] = []
+    for t in transforms:
+        if t.transform not in TRANSFORM_REGISTRY:
+            findings.append(Finding(
+                "unknown_transform", (t.name,),
+                f"Transform {t.name!r} uses unknown transform {t.transform!r} and is ignored",
+            ))
+        elif id(t) not in live:
+            dead.append(t)
+            findings.append(Finding(
+                "dead_transform", (t.name,),
+                f"Nothing reads {t.output_field!r}, the output of transform {t.name!r}; it is dropped",
+            ))
+    outputs = _Outputs(split_path(t.output_field) for t in transforms if t.transform in TRANSFORM_REGISTRY)
+    resolved: Dict[Tuple[str, ...], Tuple[bool, Any, bool]] = {}
+
+    def resolve(parts: Tuple[str, ...]) -> Tuple[bool, Any, bool]:
+        if schema is None:
+            return True, _OPEN, True
+        found = resolved.get(parts)
+        if found is None:
+            found = resolved[parts] = _resolve(schema, parts)
+        return found
+
+    # Fields and conditions against the schema
+    for rule in rules:
+        if schema is not None:
+            missing = [
+                path for path in rule.read_fields()
+                if not outputs.cover(split_path(path)) and not resolve(split_path(path))[0]
+            ]
+            if missing:
+                findings.append(Finding(
+                    "unknown_field", (rule.name,),
+                    f"Rule {rule.name!r} reads {', '.join(map(repr, missing))}, which no application has",
+                ))
+        if rule.when is None:
+            continue
+        parts = split_path(rule.when.field)
+        if outputs.cover(parts):
+            continue
+        exists, annotation, nullable = resolve(parts)
+        # A path no application has always reads as None
+        reachable = _reachable(annotation, nullable, rule.when.equals) if exists else rule.when.equals is None
+        if not reachable:
+            findings.append(Finding(
+                "unreachable_condition", (rule.name,),
+                f"Rule {rule.name!r} never runs: {rule.when.field!r} can't equal {rule.when.equals!r}",
+            ))
+
+    # Identical checks
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
+    for i, rule in enumerate(rules):
+        key = _check_key(rule)
+        if key is not None:
+            groups.setdefault(key, []).append(i)
+    shared = [positions for positions in groups.values() if len(positions) > 1]
+    for positions in shared:
+        names = tuple(rules[i].name for i in positions)
+        findings.append(Finding(
+            "duplicate_check", names,
+            f"Rules {', '.join(map(repr, names))} check the same thing; they share one evaluation",
+        ))
+
+    # FAIL_FAST order: cheapest first, file order among equals; rules that
+    # share a check sort with the rule evaluating it. Batch-scoped rules
+    # keep their place: whether they run changes what later records see.
+    costs = [rule_cost(rule) for rule in rules]
+    sort_cost = list(costs)
+    for positions in shared:
+        for i in positions[1:]:
+            sort_cost[i] = costs[positions[0]]
+    order: List[int] = []
+    segment: List[int] = []
+    for i, rule in enumerate(rules):
+        if rule.batch_scoped:
+            order += sorted(segment, key=lambda j: (sort_cost[j], j))
+            order.append(i)
+            segment = []
+        else:
+            segment.append(i)
+    order += sorted(segment, key=lambda j: (sort_cost[j], j))
+
+    # Cost estimates, with shared checks free after the first
+    effective = list(costs)
+    for positions in shared:
+        for i in positions[1:]:
+            effective[i] = 0.0
+    errors = {i for i, rule in enumerate(rules) if rule.severity == RuleSeverity.ERROR}
+    full_before = sum(costs)
+    full_after = sum(effective)
+    to_error_before = _mean_cost_to_errors(range(len(rules)), costs, errors)
+    to_error_after = _mean_cost_to_errors(order, effective, errors)
+
+    def saving(before: float, after: float) -> Dict[str, float]:
+        return {
+            "before": round(before, 2),
+            "after": round(after, 2),
+            "saved_percent": round(100 * (before - after) / before, 1) if before else 0.0,
+        }
+
+    return RuleSetAnalysis(
+        findings=findings,
+        dead_transforms=dead,
+        shared_checks=shared,
+        fail_fast_order=order,
+        costs={
+            # Every rule checked once (no conditions, no early exit)
+            "all_rules": saving(full_before, full_after),
+            # FAIL_FAST: mean cost until an application failing one error rule is rejected
+            "fail_fast_to_error": saving(to_error_before, to_error_after),
+        },
+    )
@@ -0,0 +1,423 @@
+"""
+Command-line entry points for the rules engine.
+
+    python -m app.rules validate archive.jsonl [more.jsonl ...] \
+        --rules app/config/rules.yaml --output results.jsonl \
+        --report report.json --workers 8
+
+    python -m app.rules snapshot [app/config/rules.yaml] [--output PATH]
+
+    python -m app.rules codegen [app/config/rules.yaml]
+
+    python -m app.rules analyze [app/config/rules.yaml]
+
+Inputs are JSONL files of applications (one per line, `-` for stdin). Lines
+are sharded in chunks across a process pool; every worker loads the engine
+once via RulesEngine.load (its snapshot when fresh, else the YAML). Results
+are written in input order, one JSON record per line, and an aggregate
+per-rule pass/fail/skipped report is written at the end. Throughput is
+printed to stderr.
+
+Batch-scoped rules (`unique_in_batch`) see the whole run. Workers evaluate
+them provisionally and send back the salted digests they read; the driver
+keeps the one index, resolves the digests in input order and marks the
+duplicates in the results it writes. `--bloom-capacity` puts a Bloom
+filter in front of that index, so values not seen before skip the exact
+lookup; results are the same either way.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from app.models import ApplicationData
+from app.responses import failure_to_dict, schema_error_to_dict, summary_to_dict
+from app.rules.batch import BatchScope, Keys
+from app.rules.engine import BACKENDS, RulesEngine
+from app.rules.models import CONDITION_NOT_MET, RuleSeverity, UniqueInBatchRule, ValidationSummary
+from app.rules.snapshot import snapshot_path_for
+
+
+DEFAULT_RULES_PATH = Path(__file__).parent.parent / "config" / "rules.yaml"
+DEFAULT_CHUNK_SIZE = 1000
+
+# (source name, line number, raw JSON line)
+_Line = Tuple[str, int, bytes]
+
+# (index in chunk, [(rule name, digests read)]) for records whose
+# batch-scoped rules were evaluated provisionally
+_Deferred = List[Tuple[int, List[Tuple[str, Keys]]]]
+
+
+# ---------------------------------------------------------------------------
+# Aggregate report
+# ---------------------------------------------------------------------------
+
+class RuleTally:
+    """Per-rule pass/fail/skipped counts plus record totals; mergeable."""
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.valid = 0
+        self.invalid = 0
+        self.schema_errors = 0
+        self.rules: Dict[str, Dict[str, int]] = {}
+
+    def _rule(self, name: str) -> Dict[str, int]:
+        counts = self.rules.get(name)
+        if counts is None:
+            counts = self.rules[name] = {"passed": 0, "failed": 0, "skipped": 0}
+        return counts
+
+    def add_summary(self, summary: ValidationSummary) -> None:
+        self.records += 1
+        if summary.valid:
+            self.valid += 1
+        else:
+            self.invalid += 1
+        for result in summary.successes:
+            skipped = result.details == CONDITION_NOT_MET
+            self._rule(result.name)["skipped" if skipped else "passed"] += 1
+        for result in (*summary.errors, *summary.warnings):
+            self._rule(result.name)["failed"] += 1
+
+    def add_schema_error(self) -> None:
+        self.records += 1
+        self.invalid += 1
+        self.schema_errors += 1
+
+    def merge(self, other: "RuleTally") -> None:
+        self.records += other.records
+        self.valid += other.valid
+        self.invalid += other.invalid
+        self.schema_errors += other.schema_errors
+        for name, counts in other.rules.items():
+            mine = self._rule(name)
+            for key, value in counts.items():
+                mine[key] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "records": self.records,
+            "valid": self.valid,
+            "invalid": self.invalid,
+            "schema_errors": self.schema_errors,
+            "rules": self.rules,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Worker side (one engine per process)
+# ---------------------------------------------------------------------------
+
+_worker_engine: Optional[RulesEngine] = None
+# Batch-scoped rule state; deferred in pool workers
+_worker_scope: Optional[BatchScope] = None
+
+
+def _init_worker(rules_path: str, backend: str = "interpreted", scope: Optional[BatchScope] = None) -> None:
+    global _worker_engine, _worker_scope
+    _worker_engine = RulesEngine.load(rules_path, backend=backend)
+    _worker_scope = scope if _worker_engine.batch_scoped else None
+
+
+def _validate_records(records: List[Dict[str, Any]], columnar: bool) -> Tuple[List[ValidationSummary], _Deferred]:
+    assert _worker_engine is not None, "worker not initialised"
+    scope = _worker_scope
+    if scope is None or not scope.deferred:
+        return _worker_engine.validate_many(records, columnar=columnar, owned=True, scope=scope), []
+    # Row by row, to know which digests belong to which record
+    validate = _worker_engine.validate
+    summaries: List[ValidationSummary] = []
+    deferred: _Deferred = []
+    with scope.active():
+        for i, record in enumerate(records):
+            scope.next_record()
+            summaries.append(validate(record, owned=True))
+            if scope.collected:
+                deferred.append((i, scope.collected))
+    return summaries, deferred
+
+
+def _validate_chunk(chunk: List[_Line], columnar: bool = False) -> Tuple[bytes, RuleTally, _Deferred]:
+    assert _worker_engine is not None, "worker not initialised"
+    tally = RuleTally()
+    rendered: List[Optional[Dict[str, Any]]] = [None] * len(chunk)
+    positions: List[int] = []
+    records: List[Dict[str, Any]] = []
+
+    for i, (_, _, raw) in enumerate(chunk):
+        try:
+            application = ApplicationData.model_validate_json(raw)
+        except ValidationError as exc:
+            rendered[i] = schema_error_to_dict(exc)
+            tally.add_schema_error()
+            continue
+        positions.append(i)
+        records.append(_worker_engine.project(application))
+
+    summaries, deferred = _validate_records(records, columnar)
+    for i, summary in zip(positions, summaries):
+        rendered[i] = summary_to_dict(summary)
+        tally.add_summary(summary)
+
+    out = bytearray()
+    for (source, line_number, _), result in zip(chunk, rendered):
+        record = {"source": source, "line": line_number, **result}  # type: ignore[dict-item]
+        out += json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+        out += b"\n"
+    return bytes(out), tally, [(positions[i], collected) for i, collected in deferred]
+
+
+# ---------------------------------------------------------------------------
+# Batch-scoped rules across workers
+# ---------------------------------------------------------------------------
+
+class _DuplicateResolver:
+    """
+    The driver's side of deferred batch-scoped rules: one index for the
+    whole run, fed chunk by chunk in input order.
+    """
+
+    def __init__(self, rules_path: str, index: BatchScope):
+        self.rules_path = rules_path
+        self.index = index
+        # Loaded on the first duplicate: rule name -> position in the plan, rule
+        self._rules: Optional[Dict[str, Tuple[int, Any]]] = None
+
+    def resolve(self, rendered: bytes, tally: RuleTally, deferred: _Deferred) -> bytes:
+        """`rendered` with the chunk's duplicates marked failed; `tally` is adjusted to match."""
+        lines: Optional[List[bytes]] = None
+        for i, collected in deferred:
+            for name, keys in collected:
+                duplicates = self.index.resolve(name, keys)
+                if duplicates:
+                    if lines is None:
+                        lines = rendered.split(b"\n")
+                    lines[i] = self._mark(lines[i], name, duplicates, tally)
+        return b"\n".join(lines) if lines is not None else rendered
+
+    def _mark(self, line: bytes, name: str, duplicates: List[str], tally: RuleTally) -> bytes:
+        if self._rules is None:
+            rules = RulesEngine.load(self.rules_path).rules
+            self._rules = {rule.name: (position, rule) for position, rule in enumerate(rules)}
+        rules = self._rules
+        rule: UniqueInBatchRule = rules[name][1]
+        failure = rule.failure(duplicates)
+        key = "errors" if failure.severity == RuleSeverity.ERROR else "warnings"
+
+        record = json.loads(line)
+        record["passed"] = [item for item in record["passed"] if item["rule"] != name]
+        # Failures are listed in plan order
+        record[key] = sorted([*record[key], failure_to_dict(failure)], key=lambda item: rules[item["rule"]][0])
+        was_valid, record["valid"] = record["valid"], not record["errors"]
+
+        counts = tally.rules[name]
+        counts["passed"] -= 1
+        counts["failed"] += 1
+        if was_valid and not record["valid"]:
+            tally.valid -= 1
+            tally.invalid += 1
+        return json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def _iter_chunks(inputs: Sequence[str], chunk_size: int) -> Iterator[List[_Line]]:
+    chunk: List[_Line] = []
+    for source in inputs:
+        stream: IO[bytes] = sys.stdin.buffer if source == "-" else open(source, "rb")
+        try:
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                chunk.append((source, line_number, line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+    if chunk:
+        yield chunk
+
+
+def run_validate(
+    inputs: Sequence[str],
+    rules_path: str,
+    output: IO[bytes],
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columnar: bool = False,
+    backend: str = "interpreted",
+    bloom_capacity: Optional[int] = None,
+    bloom_error_rate: float = 0.001,
+) -> RuleTally:
+    """Validate every input line, writing results to `output` in input order."""
+    tally = RuleTally()
+    chunks = _iter_chunks(inputs, chunk_size)
+    # Batch-scoped rules' index for the whole run
+    index = BatchScope(bloom_capacity, bloom_error_rate)
+
+    if workers <= 1:
+        _init_worker(rules_path, backend, index)
+        for chunk in chunks:
+            rendered, chunk_tally, _ = _validate_chunk(chunk, columnar)
+            output.write(rendered)
+            tally.merge(chunk_tally)
+        return tally
+
+    resolver = _DuplicateResolver(rules_path, index)
+
+    def write(result: Tuple[bytes, RuleTally, _Deferred]) -> None:
+        rendered, chunk_tally, deferred = result
+        if deferred:
+            rendered = resolver.resolve(rendered, chunk_tally, deferred)
+        output.write(rendered)
+        tally.merge(chunk_tally)
+
+    # Keep a bounded number of chunks in flight so memory stays flat while
+    # results are still written (and duplicates resolved) in order.
+    max_in_flight = workers * 2
+    pending: Deque["Future[Tuple[bytes, RuleTally, _Deferred]]"] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(rules_path, backend, BatchScope(salt=index.salt, deferred=True)),
+    ) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(_validate_chunk, chunk, columnar))
+            if len(pending) >= max_in_flight:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    return tally
+
+
+def _cmd_validate(args: argparse.Namespace) -> int:
+    output: IO[bytes] = (
+        sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    )
+    started = time.perf_counter()
+    try:
+        tally = run_validate(
+            inputs=args.inputs,
+            rules_path=str(args.rules),
+            output=output,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            columnar=args.columnar,
+            backend=args.backend,
+            bloom_capacity=args.bloom_capacity,
+            bloom_error_rate=args.bloom_error_rate,
+        )
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+        else:
+            output.flush()
+    elapsed = time.perf_counter() - started
+
+    report = {
+        **tally.to_dict(),
+        "workers": args.workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(tally.records / elapsed, 1) if elapsed else None,
+    }
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(
+        f"validated {tally.records} records ({tally.invalid} invalid) "
+        f"in {elapsed:.2f}s with {args.workers} worker(s): "
+        f"{report['records_per_second']} records/s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _cmd_snapshot(args: argparse.Namespace) -> int:
+    output = args.output or snapshot_path_for(args.rules)
+    started = time.perf_counter()
+    engine = RulesEngine.from_yaml(args.rules)
+    engine.write_snapshot(output)
+    print(
+        f"wrote {output} (source sha256 {engine.version}) "
+        f"in {time.perf_counter() - started:.3f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _cmd_codegen(args: argparse.Namespace) -> int:
+    engine = RulesEngine.from_yaml(args.rules, backend="codegen")
+    sys.stdout.write(engine.generated_source or "")
+    return 0
+
+
+def _cmd_analyze(args: argparse.Namespace) -> int:
+    engine = RulesEngine.from_yaml(args.rules)
+    report = engine.analysis.report()
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    for finding in report["findings"]:
+        print(f"{finding['kind']}: {finding['message']}", file=sys.stderr)
+    return 1 if args.strict and report["findings"] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.rules")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="Validate JSONL application archives offline")
+    validate.add_argument("inputs", nargs="+", help="JSONL files to validate ('-' for stdin)")
+    validate.add_argument("--rules", default=DEFAULT_RULES_PATH, help="Rules YAML file")
+    validate.add_argument("--output", "-o", default="-", help="Result JSONL file ('-' for stdout)")
+    validate.add_argument("--report", help="Write the aggregate per-rule report (JSON) here")
+    validate.add_argument(
+        "--workers", "-j", type=int, default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count; 1 runs in-process)",
+    )
+    validate.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Lines per work unit")
+    validate.add_argument("--columnar", action="store_true", help="Use columnar (NumPy) evaluation per chunk")
+    validate.add_argument("--backend", choices=BACKENDS, default="interpreted", help="Row-by-row engine backend")
+    validate.add_argument(
+        "--bloom-capacity", type=int,
+        help="Prefilter unique_in_batch lookups with a Bloom filter sized for this many values",
+    )
+    validate.add_argument(
+        "--bloom-error-rate", type=float, default=0.001,
+        help="False-positive rate of the Bloom prefilter at capacity (default: 0.001)",
+    )
+    validate.set_defaults(func=_cmd_validate)
+
+    snapshot = commands.add_parser("snapshot", help="Validate a rules file and write its snapshot")
+    snapshot.add_argument("rules", nargs="?", default=DEFAULT_RULES_PATH, help="Rules YAML file")
+    snapshot.add_argument("--output", "-o", help="Snapshot path (default: <rules>.snapshot.json)")
+    snapshot.set_defaults(func=_cmd_snapshot)
+
+    codegen = commands.add_parser("codegen", help="Print the code the codegen backend generates for a rules file")
+    codegen.add_argument("rules", nargs="?", default=DEFAULT_RULES_PATH, help="Rules YAML file")
+    codegen.set_defaults(func=_cmd_codegen)
+
+    analyze = commands.add_parser("analyze", help="Report findings and optimizations for a rules file (JSON)")
+    analyze.add_argument("rules", nargs="?", default=DEFAULT_RULES_PATH, help="Rules YAML file")
+    analyze.add_argument("--strict", action="store_true", help="Exit with status 1 if there are findings")
+    analyze.set_defaults(func=_cmd_analyze)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
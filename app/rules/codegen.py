@@ -0,0 +1,547 @@
+"""
+Code-generated evaluation (the engine's "codegen" backend).
+
+The rule set is translated into the source of one Python module holding a
+specialized function per evaluation mode, compiled once when the engine is
+built. Compared with the interpreted plan, the generated code:
+
+* resolves every distinct path once per application, sharing the lookup of
+  common prefixes (`studentInfo` for `studentInfo.ssn` and
+  `studentInfo.age`), with the nested dict walks written out inline;
+* evaluates each distinct `when` condition once, into a local flag;
+* inlines each rule's check (comparison operators, thresholds, membership
+  tests) instead of calling its evaluator;
+* appends results straight to the errors, warnings or successes list, since
+  every rule's severity is known when the code is generated.
+
+Results are identical to the interpreted engine (tests/unit/app/rules/
+test_codegen.py checks this on randomized inputs). Rule types the generator
+doesn't know are evaluated through their compiled evaluator and check. The
+source is kept on `GeneratedValidator.source` (and in `linecache`, so
+tracebacks show the generated lines); print it with
+`python -m app.rules codegen`.
+"""
+import linecache
+import math
+import re
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.rules.engine import _CompiledRule, _CompiledTransform, _TransformGraph, _View
+from app.rules.helpers import split_path
+from app.rules.models import (
+    Details,
+    DetailsLayout,
+    EvaluationMode,
+    FieldComparisonRule,
+    PresenceRule,
+    RequiresRule,
+    RuleResult,
+    RuleSeverity,
+    StringMatchRule,
+    ValidationSummary,
+    ValueComparisonRule,
+    ValueInSetRule,
+    field_comparison_layouts,
+    missing_field_result,
+    value_comparison_layouts,
+    value_in_set_layout,
+)
+
+
+# Inlined forms of helpers.COMPARISON_OPERATORS; unknown operators never pass
+_OPERATORS = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">=", "eq": "==", "neq": "!="}
+
+_FUNCTION_NAMES = {
+    EvaluationMode.FULL: "validate_full",
+    EvaluationMode.ERRORS_ONLY: "validate_errors_only",
+    EvaluationMode.FAIL_FAST: "validate_fail_fast",
+}
+
+_filenames = count()
+
+
+class GeneratedValidator:
+    """
+    The compiled functions for one rule set, callable like
+    `RulesEngine.validate`. `source` is the generated module's source.
+    """
+    __slots__ = ("source", "filename", "functions")
+
+    def __init__(self, source: str, filename: str, functions: Dict[EvaluationMode, Callable[..., ValidationSummary]]):
+        self.source = source
+        self.filename = filename
+        self.functions = functions
+
+    def __call__(
+        self,
+        data: Dict[str, Any],
+        mode: EvaluationMode = EvaluationMode.FULL,
+        today: Any = None,
+        owned: bool = False,
+    ) -> ValidationSummary:
+        return self.functions[mode](data, today, owned)
+
+
+def generate(
+    plan: List[_CompiledRule],
+    transforms: List[_CompiledTransform],
+    graph: _TransformGraph,
+    label: str = "rules",
+    fail_fast_order: Optional[List[int]] = None,
+) -> GeneratedValidator:
+    """
+    Generate, compile and load the evaluation functions for `plan`. The
+    FAIL_FAST function visits the plan positions in `fail_fast_order`
+    (default: plan order).
+    """
+    source, namespace = _ModuleWriter(plan, transforms, graph, fail_fast_order).write()
+    filename = f"<codegen {label} #{next(_filenames)}>"
+    code = compile(source, filename, "exec")
+    # Keep the source reachable by tracebacks and debuggers
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    exec(code, namespace)
+    return GeneratedValidator(
+        source,
+        filename,
+        {mode: namespace[name] for mode, name in _FUNCTION_NAMES.items()},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Source generation
+# ---------------------------------------------------------------------------
+
+class _Lines:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.depth = 0
+
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.depth + line)
+
+    def block(self, header: str) -> "_Lines":
+        self.emit(header)
+        return self
+
+    def __enter__(self) -> None:
+        self.depth += 1
+
+    def __exit__(self, *exc: Any) -> None:
+        self.depth -= 1
+
+
+class _Lookups:
+    """
+    Local variables holding path values. Each prefix is looked up once, so
+    `a.b` and `a.c` share the lookup of `a`; a missing key or a non-dict
+    along the way gives None, like helpers.get_by_parts.
+    """
+
+    def __init__(self, out: _Lines, prefix: str):
+        self.out = out
+        self.prefix = prefix
+        self.names: Dict[Tuple[str, ...], str] = {}
+
+    def __call__(self, parts: Tuple[str, ...]) -> str:
+        if not parts:
+            return "None"
+        name = self.names.get(parts)
+        if name is not None:
+            return name
+        name = self.names[parts] = f"{self.prefix}{len(self.names)}"
+        key = repr(parts[-1])
+        if len(parts) == 1:
+            self.out.emit(f"{name} = data.get({key})")
+        else:
+            parent = self(parts[:-1])
+            self.out.emit(f"{name} = {parent}.get({key}) if isinstance({parent}, dict) else None")
+        return name
+
+
+class _ModuleWriter:
+    def __init__(
+        self,
+        plan: List[_CompiledRule],
+        transforms: List[_CompiledTransform],
+        graph: _TransformGraph,
+        fail_fast_order: Optional[List[int]] = None,
+    ):
+        self.plan = plan
+        self.transforms = transforms
+        self.graph = graph
+        self.fail_fast_order = fail_fast_order if fail_fast_order is not None else list(range(len(plan)))
+        # Position -> batch-scoped positions after it in FAIL_FAST order,
+        # still checked when evaluation stops there (as the interpreter does)
+        self.batch_after: Dict[int, List[int]] = {}
+        pending: List[int] = []
+        for position in reversed(self.fail_fast_order):
+            if pending:
+                self.batch_after[position] = pending
+            if plan[position].rule.batch_scoped:
+                pending = [position, *pending]
+        self.namespace: Dict[str, Any] = {
+            "R": RuleResult,
+            "D": Details,
+            "Summary": ValidationSummary,
+            "View": _View,
+            "TRANSFORMS": transforms,
+            "ERROR": RuleSeverity.ERROR,
+            "WARNING": RuleSeverity.WARNING,
+        }
+        # (condition parts, expected value) -> flag variable, in plan order
+        self.flags: Dict[Tuple[Tuple[str, ...], int], str] = {}
+        self.flag_of: List[Optional[str]] = []
+        expected: Dict[Tuple[Tuple[str, ...], int], Any] = {}
+        for compiled in plan:
+            if compiled.condition_parts is None:
+                self.flag_of.append(None)
+                continue
+            key = (compiled.condition_parts, compiled.condition_group)
+            if key not in self.flags:
+                self.flags[key] = f"c{len(self.flags)}"
+                expected[key] = compiled.condition_equals
+            self.flag_of.append(self.flags[key])
+        self.expected = expected
+
+    def constant(self, name: str, value: Any) -> str:
+        """A global of the generated module; the first value given for `name` is kept."""
+        self.namespace.setdefault(name, value)
+        return name
+
+    def write(self) -> Tuple[str, Dict[str, Any]]:
+        out = _Lines()
+        out.emit('"""Generated by app.rules.codegen; do not edit."""')
+        for mode, name in _FUNCTION_NAMES.items():
+            out.emit("")
+            out.emit("")
+            with out.block(f"def {name}(data, today=None, owned=False):"):
+                self.function(out, mode)
+        return "\n".join(out.lines) + "\n", self.namespace
+
+    # -- one function per mode ------------------------------------------------
+
+    def function(self, out: _Lines, mode: EvaluationMode) -> None:
+        full = mode is EvaluationMode.FULL
+        out.emit("if not isinstance(data, dict):")
+        with out:
+            out.emit("data = {}")
+        out.emit("errors = []")
+        out.emit("warnings = []")
+        out.emit("error = errors.append")
+        out.emit("warning = warnings.append")
+        if full:
+            out.emit("successes = []")
+            out.emit("success = successes.append")
+
+        graph = self.graph
+        if graph.live:
+            out.emit("view = View(data, TRANSFORMS, today, owned)")
+        if graph.condition:
+            out.emit(f"view.run({graph.condition!r})")
+            out.emit("data = view.data")
+
+        # Conditions, each resolved once
+        condition_values = _Lookups(out, "w")
+        for key, flag in self.flags.items():
+            value = condition_values(key[0])
+            expected = self.constant(f"EXPECTED_{flag}", self.expected[key])
+            out.emit(f"{flag} = {value} == {expected}")
+
+        # Transforms the rules read, each guarded by the conditions of the rules needing it
+        later = [i for i in graph.live if i not in graph.condition]
+        for i in later:
+            guards = {flag for needs, flag in zip(graph.rules, self.flag_of) if i in needs}
+            if None in guards or not guards:
+                out.emit(f"view.run(({i},))")
+            else:
+                with out.block(f"if {' or '.join(sorted(guards))}:"):
+                    out.emit(f"view.run(({i},))")
+        if later:
+            out.emit("data = view.data")
+
+        # Every path the rules read, each resolved once
+        values = _Lookups(out, "v")
+        for compiled in self.plan:
+            if _inlined(compiled.rule):
+                for path in compiled.rule.read_fields():
+                    values(split_path(path))
+
+        positions = self.fail_fast_order if mode is EvaluationMode.FAIL_FAST else range(len(self.plan))
+        for position in positions:
+            compiled, flag = self.plan[position], self.flag_of[position]
+            rule = compiled.rule
+            out.emit(f"# {position}: {rule.name} ({type(rule).__name__})")
+            rule_out = _RuleWriter(self, out, position, compiled, values, mode)
+            if flag is None:
+                rule_out.write()
+                continue
+            with out.block(f"if {flag}:"):
+                rule_out.write()
+            if full:
+                with out.block("else:"):
+                    out.emit(f"success({self.constant(f'SKIPPED_{position}', compiled.skipped)})")
+
+        successes = "successes" if full else "[]"
+        out.emit(f"return Summary(not errors, errors, warnings, {successes})")
+
+
+def _inlined(rule: Any) -> bool:
+    return type(rule) in _RULE_WRITERS
+
+
+class _RuleWriter:
+    """Emits the evaluation of one rule (inside its `when` guard)."""
+
+    def __init__(
+        self,
+        module: _ModuleWriter,
+        out: _Lines,
+        position: int,
+        compiled: _CompiledRule,
+        values: _Lookups,
+        mode: EvaluationMode,
+    ):
+        self.module = module
+        self.out = out
+        self.position = position
+        self.compiled = compiled
+        self.rule = compiled.rule
+        self.values = values
+        self.full = mode is EvaluationMode.FULL
+        self.fail_fast = mode is EvaluationMode.FAIL_FAST
+
+    def write(self) -> None:
+        writer = _RULE_WRITERS.get(type(self.rule))
+        if writer is None:
+            self.generic()
+        else:
+            writer(self)
+
+    # -- helpers ---------------------------------------------------------------
+
+    def constant(self, kind: str, value: Any) -> str:
+        return self.module.constant(f"{kind}_{self.position}", value)
+
+    def value(self, path: str) -> str:
+        return self.values(split_path(path))
+
+    def layout(self, layout: DetailsLayout, suffix: str = "") -> str:
+        return self.constant(f"LAYOUT{suffix}", layout)
+
+    def result(self, passed: bool, details: str) -> str:
+        name = self.constant("NAME", self.rule.name)
+        severity = self.constant("SEVERITY", self.rule.severity)
+        message = self.constant("MESSAGE", self.rule.message) if not passed else "None"
+        return f"R({name}, {passed}, {severity}, {message}, {details})"
+
+    def success(self, result: str) -> None:
+        """Report a pass (FULL mode only; otherwise nothing to do)."""
+        self.out.emit(f"success({result})" if self.full else "pass")
+
+    def stop(self) -> None:
+        """FAIL_FAST: record the batch keys of the rules not reached, then return."""
+        module, out = self.module, self.out
+        for position in module.batch_after.get(self.position, ()):
+            check = module.constant(f"CHECK_{position}", module.plan[position].check)
+            flag = module.flag_of[position]
+            if flag is None:
+                out.emit(f"{check}(data)")
+            else:
+                with out.block(f"if {flag}:"):
+                    out.emit(f"{check}(data)")
+        out.emit("return Summary(False, errors, warnings, [])")
+
+    def failure(self, result: str) -> None:
+        if self.rule.severity == RuleSeverity.ERROR:
+            self.out.emit(f"error({result})")
+            if self.fail_fast:
+                self.stop()
+        elif self.rule.severity == RuleSeverity.WARNING:
+            self.out.emit(f"warning({result})")
+        else:
+            self.out.emit("pass")
+
+    def decide(self, passed: str, on_pass: str, on_fail: str) -> None:
+        """`if passed` with both outcomes, or just the failure outside FULL mode."""
+        out = self.out
+        if self.full:
+            with out.block(f"if {passed}:"):
+                self.success(on_pass)
+            with out.block("else:"):
+                self.failure(on_fail)
+        else:
+            with out.block(f"if not ({passed}):"):
+                self.failure(on_fail)
+
+    # -- rule types --------------------------------------------------------------
+
+    def presence(self) -> None:
+        rule: PresenceRule = self.rule
+        value = self.value(rule.field)
+        layout = self.layout(DetailsLayout(("field", "value"), {"field": rule.field}))
+        details = f"D({layout}, ({value},))"
+        self.decide(
+            f"{value} is not None and {value} != ''",
+            self.result(True, details),
+            self.result(False, details),
+        )
+
+    def string_match(self) -> None:
+        rule: StringMatchRule = self.rule
+        value = self.value(rule.field)
+        fullmatch = self.constant("FULLMATCH", re.compile(rule.pattern).fullmatch)
+        layout = self.layout(DetailsLayout(
+            ("field", "value", "pattern"), {"field": rule.field, "pattern": rule.pattern},
+        ))
+        details = f"D({layout}, ({value},))"
+        out = self.out
+        # "if present" semantics: a missing value passes
+        if self.full:
+            missing = self.constant("MISSING", missing_field_result(rule.name, rule.field, rule.severity))
+            with out.block(f"if {value} is None:"):
+                out.emit(f"success({missing})")
+            with out.block(f"elif {fullmatch}(str({value})) is not None:"):
+                self.success(self.result(True, details))
+            with out.block("else:"):
+                self.failure(self.result(False, details))
+        else:
+            with out.block(f"if {value} is not None and {fullmatch}(str({value})) is None:"):
+                self.failure(self.result(False, details))
+
+    def value_comparison(self) -> None:
+        rule: ValueComparisonRule = self.rule
+        raw = self.value(rule.field)
+        try:
+            threshold: Optional[float] = float(rule.value)
+        except (TypeError, ValueError):
+            # A non-numeric threshold fails every present value as non_numeric
+            threshold = None
+        non_numeric, compared = value_comparison_layouts(rule, threshold)
+        non_numeric_name = self.layout(non_numeric, "_NON_NUMERIC")
+        compared_name = self.layout(compared)
+        out = self.out
+
+        # Missing field: treat as pass; separate rules handle "required"
+        if self.full:
+            missing = self.constant("MISSING", missing_field_result(rule.name, rule.field, rule.severity))
+            with out.block(f"if {raw} is None:"):
+                out.emit(f"success({missing})")
+            present = "else:"
+        else:
+            present = f"if {raw} is not None:"
+        with out.block(present):
+            with out.block("try:"):
+                out.emit(f"f = float({raw})")
+            with out.block("except (TypeError, ValueError):"):
+                out.emit("f = None")
+            failed_non_numeric = self.result(False, f"D({non_numeric_name}, ({raw},))")
+            if threshold is None:
+                self.failure(failed_non_numeric)
+                return
+            with out.block("if f is None:"):
+                self.failure(failed_non_numeric)
+            with out.block("else:"):
+                self.decide(
+                    self.comparison("f", rule.operator, self.number(threshold)),
+                    self.result(True, f"D({compared_name}, (f,))"),
+                    self.result(False, f"D({compared_name}, (f,))"),
+                )
+
+    def field_comparison(self) -> None:
+        rule: FieldComparisonRule = self.rule
+        left, right = self.value(rule.left_field), self.value(rule.right_field)
+        non_numeric, compared = field_comparison_layouts(rule)
+        non_numeric_name = self.layout(non_numeric, "_NON_NUMERIC")
+        compared_name = self.layout(compared)
+        out = self.out
+
+        with out.block("try:"):
+            out.emit(f"left = float({left})")
+            out.emit(f"right = float({right})")
+        with out.block("except (TypeError, ValueError):"):
+            self.failure(self.result(False, f"D({non_numeric_name}, ({left}, {right}))"))
+        with out.block("else:"):
+            self.decide(
+                self.comparison("left", rule.operator, "right"),
+                self.result(True, f"D({compared_name}, (left, right))"),
+                self.result(False, f"D({compared_name}, (left, right))"),
+            )
+
+    def value_in_set(self) -> None:
+        rule: ValueInSetRule = self.rule
+        value = self.value(rule.field)
+        allowed_values = self.constant("ALLOWED_VALUES", rule.allowed_values)
+        layout = self.layout(value_in_set_layout(rule))
+        details = f"D({layout}, ({value},))"
+        out = self.out
+        try:
+            allowed_set = self.constant("ALLOWED_SET", frozenset(rule.allowed_values))
+        except TypeError:
+            # Unhashable members (e.g. nested lists) can only be scanned
+            out.emit(f"found = {value} in {allowed_values}")
+        else:
+            with out.block("try:"):
+                out.emit(f"found = {value} in {allowed_set}")
+            with out.block("except TypeError:"):
+                # Unhashable value (dict/list): fall back to the list scan
+                out.emit(f"found = {value} in {allowed_values}")
+        self.decide("found", self.result(True, details), self.result(False, details))
+
+    def requires(self) -> None:
+        rule: RequiresRule = self.rule
+        out = self.out
+        out.emit("missing = []")
+        for path in rule.required_fields:
+            value = self.value(path)
+            with out.block(f"if {value} is None or {value} == '':"):
+                out.emit(f"missing.append({path!r})")
+        satisfied = self.constant("SATISFIED", RuleResult(name=rule.name, passed=True, severity=rule.severity))
+        layout = self.layout(DetailsLayout(("missing_fields",)))
+        self.decide("not missing", satisfied, self.result(False, f"D({layout}, (missing,))"))
+
+    def generic(self) -> None:
+        """Any other Rule: call its compiled evaluator (and check), as the interpreter does."""
+        evaluate = self.constant("EVALUATE", self.compiled.evaluate)
+        out = self.out
+        if self.full:
+            out.emit(f"result = {evaluate}(data)")
+            with out.block("if result.passed:"):
+                out.emit("success(result)")
+            self.dispatch("elif")
+        else:
+            check = self.constant("CHECK", self.compiled.check)
+            with out.block(f"if not {check}(data):"):
+                out.emit(f"result = {evaluate}(data)")
+                self.dispatch("if")
+
+    def dispatch(self, keyword: str) -> None:
+        """Report a failed `result` by its severity, known only at run time."""
+        out = self.out
+        with out.block(f"{keyword} result.severity == ERROR:"):
+            out.emit("error(result)")
+            if self.fail_fast:
+                self.stop()
+        with out.block("elif result.severity == WARNING:"):
+            out.emit("warning(result)")
+
+    # -- expressions ---------------------------------------------------------------
+
+    def number(self, value: float) -> str:
+        # repr() of a finite float is a float literal; inf and nan are not
+        return repr(value) if math.isfinite(value) else self.constant("THRESHOLD", value)
+
+    @staticmethod
+    def comparison(left: str, operator: str, right: str) -> str:
+        symbol = _OPERATORS.get(operator)
+        return f"{left} {symbol} {right}" if symbol else "False"
+
+
+_RULE_WRITERS: Dict[type, Callable[[_RuleWriter], None]] = {
+    PresenceRule: _RuleWriter.presence,
+    StringMatchRule: _RuleWriter.string_match,
+    ValueComparisonRule: _RuleWriter.value_comparison,
+    FieldComparisonRule: _RuleWriter.field_comparison,
+    ValueInSetRule: _RuleWriter.value_in_set,
+    RequiresRule: _RuleWriter.requires,
+}
@@ -0,0 +1,339 @@
+"""
+Columnar evaluation for bulk validation.
+
+Every field path the rule set reads is pulled out of the N records once,
+dictionary-encoded (each distinct value is converted/compared only once),
+and the numeric comparisons, field-vs-field comparisons, set membership
+checks and `when` conditions run as NumPy array operations. Outcomes are
+then scattered back into per-record ValidationSummary objects in rule order,
+so results are identical to the row-by-row path.
+
+Requires the optional `columnar` extra (numpy).
+"""
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "Columnar evaluation requires numpy; install the 'columnar' extra."
+    ) from exc
+
+from app.rules import helpers
+from app.rules.instrumentation import FAILED, PASSED, SKIPPED
+from app.rules.models import (
+    Details,
+    EvaluationMode,
+    FieldComparisonRule,
+    RuleResult,
+    RuleSeverity,
+    ValidationSummary,
+    ValueComparisonRule,
+    ValueInSetRule,
+    field_comparison_layouts,
+    missing_field_result,
+    value_comparison_layouts,
+    value_in_set_layout,
+)
+
+if TYPE_CHECKING:
+    from app.rules.engine import _CompiledRule
+
+
+_UFUNCS: Dict[str, Callable[..., Any]] = {
+    "lt": np.less,
+    "lte": np.less_equal,
+    "gt": np.greater,
+    "gte": np.greater_equal,
+    "eq": np.equal,
+    "neq": np.not_equal,
+}
+
+
+# ---------------------------------------------------------------------------
+# Columns
+# ---------------------------------------------------------------------------
+
+class _Column:
+    """One field path extracted from every record, dictionary-encoded."""
+    __slots__ = ("raw", "codes", "uniques", "_floats", "_missing")
+
+    def __init__(self, raw: List[Any]):
+        self.raw = raw
+        index: Dict[Tuple[type, Any], int] = {}
+        uniques: List[Any] = []
+        codes: List[int] = []
+        for value in raw:
+            key = (type(value), value)
+            try:
+                code = index.get(key)
+                if code is None:
+                    code = index[key] = len(uniques)
+                    uniques.append(value)
+            except TypeError:
+                # Unhashable (dict/list) values are never shared
+                code = len(uniques)
+                uniques.append(value)
+            codes.append(code)
+        self.uniques = uniques
+        self.codes = np.asarray(codes, dtype=np.intp)
+        self._floats: Optional[Tuple[np.ndarray, np.ndarray, List[float]]] = None
+        self._missing: Optional[np.ndarray] = None
+
+    def map_uniques(self, func: Callable[[Any], bool]) -> np.ndarray:
+        """Evaluate a predicate once per distinct value, broadcast to N rows."""
+        return np.fromiter(
+            (func(u) for u in self.uniques), dtype=bool, count=len(self.uniques)
+        )[self.codes]
+
+    def missing(self) -> np.ndarray:
+        if self._missing is None:
+            self._missing = self.map_uniques(lambda u: u is None)
+        return self._missing
+
+    def floats(self) -> Tuple[np.ndarray, np.ndarray, List[float]]:
+        """`(values, numeric_mask, values_as_python_floats)`, per row."""
+        if self._floats is None:
+            converted = np.empty(len(self.uniques), dtype=np.float64)
+            numeric = np.empty(len(self.uniques), dtype=bool)
+            for i, u in enumerate(self.uniques):
+                try:
+                    converted[i] = float(u)
+                    numeric[i] = True
+                except (TypeError, ValueError):
+                    converted[i] = np.nan
+                    numeric[i] = False
+            values = converted[self.codes]
+            self._floats = (values, numeric[self.codes], values.tolist())
+        return self._floats
+
+
+class _Columns:
+    """Lazily extracted columns, keyed by split path."""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._records = records
+        self._raw: Dict[Tuple[str, ...], List[Any]] = {}
+        self._columns: Dict[Tuple[str, ...], _Column] = {}
+
+    def _extract(self, parts: Tuple[str, ...]) -> List[Any]:
+        # Walk one path level at a time across all records; shared prefixes
+        # (e.g. "income" for income.studentIncome/parentIncome) are reused.
+        if not parts:
+            return [None] * len(self._records)
+        raw = self._raw.get(parts)
+        if raw is None:
+            parent = self._records if len(parts) == 1 else self._extract(parts[:-1])
+            part = parts[-1]
+            raw = [
+                v[part] if isinstance(v, dict) and part in v else None
+                for v in parent
+            ]
+            self._raw[parts] = raw
+        return raw
+
+    def __getitem__(self, parts: Tuple[str, ...]) -> _Column:
+        column = self._columns.get(parts)
+        if column is None:
+            column = _Column(self._extract(parts))
+            self._columns[parts] = column
+        return column
+
+
+# ---------------------------------------------------------------------------
+# Per-rule vectorized evaluation
+# ---------------------------------------------------------------------------
+
+def _compare(operator: str, left: np.ndarray, right: Any) -> np.ndarray:
+    ufunc = _UFUNCS.get(operator)
+    if ufunc is None:
+        # Unknown operators never pass
+        return np.zeros(len(left), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        return ufunc(left, right)
+
+
+_Outcomes = List[Optional[RuleResult]]
+
+
+def _value_comparison(rule: ValueComparisonRule, columns: _Columns, rows: List[int], out: _Outcomes) -> None:
+    column = columns[helpers.split_path(rule.field)]
+    missing = column.missing()
+    values, numeric, as_floats = column.floats()
+    try:
+        threshold: Optional[float] = float(rule.value)
+    except (TypeError, ValueError):
+        threshold = None
+    passed = (
+        _compare(rule.operator, values, threshold)
+        if threshold is not None
+        else np.zeros(len(values), dtype=bool)
+    )
+
+    name, severity, message = rule.name, rule.severity, rule.message
+    missing_result = missing_field_result(name, rule.field, severity)
+    non_numeric_layout, compared_layout = value_comparison_layouts(rule, threshold)
+    missing_l, numeric_l, passed_l = missing.tolist(), numeric.tolist(), passed.tolist()
+    for i in rows:
+        if missing_l[i]:
+            out[i] = missing_result
+        elif not numeric_l[i] or threshold is None:
+            out[i] = RuleResult(
+                name=name,
+                passed=False,
+                severity=severity,
+                message=message,
+                details=Details(non_numeric_layout, (column.raw[i],)),
+            )
+        else:
+            ok = passed_l[i]
+            out[i] = RuleResult(
+                name=name,
+                passed=ok,
+                severity=severity,
+                message=None if ok else message,
+                details=Details(compared_layout, (as_floats[i],)),
+            )
+
+
+def _field_comparison(rule: FieldComparisonRule, columns: _Columns, rows: List[int], out: _Outcomes) -> None:
+    left = columns[helpers.split_path(rule.left_field)]
+    right = columns[helpers.split_path(rule.right_field)]
+    left_values, left_numeric, left_floats = left.floats()
+    right_values, right_numeric, right_floats = right.floats()
+    numeric = left_numeric & right_numeric
+    passed = _compare(rule.operator, left_values, right_values)
+
+    name, severity, message = rule.name, rule.severity, rule.message
+    non_numeric_layout, compared_layout = field_comparison_layouts(rule)
+    numeric_l, passed_l = numeric.tolist(), passed.tolist()
+    for i in rows:
+        if not numeric_l[i]:
+            out[i] = RuleResult(
+                name=name,
+                passed=False,
+                severity=severity,
+                message=message,
+                details=Details(non_numeric_layout, (left.raw[i], right.raw[i])),
+            )
+        else:
+            ok = passed_l[i]
+            out[i] = RuleResult(
+                name=name,
+                passed=ok,
+                severity=severity,
+                message=None if ok else message,
+                details=Details(compared_layout, (left_floats[i], right_floats[i])),
+            )
+
+
+def _value_in_set(rule: ValueInSetRule, columns: _Columns, rows: List[int], out: _Outcomes) -> None:
+    column = columns[helpers.split_path(rule.field)]
+    allowed_values = rule.allowed_values
+    passed = column.map_uniques(lambda u: u in allowed_values).tolist()
+
+    name, severity, message = rule.name, rule.severity, rule.message
+    layout = value_in_set_layout(rule)
+    for i in rows:
+        ok = passed[i]
+        out[i] = RuleResult(
+            name=name,
+            passed=ok,
+            severity=severity,
+            message=None if ok else message,
+            details=Details(layout, (column.raw[i],)),
+        )
+
+
+_VECTORIZED = {
+    ValueComparisonRule: _value_comparison,
+    FieldComparisonRule: _field_comparison,
+    ValueInSetRule: _value_in_set,
+}
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def validate_columnar(
+    plan: List["_CompiledRule"],
+    records: List[Dict[str, Any]],
+    mode: EvaluationMode = EvaluationMode.FULL,
+    counted: Optional[List[List[Tuple[str, int]]]] = None,
+) -> List[ValidationSummary]:
+    """
+    Evaluate `plan` over already-transformed `records`, column by column.
+    Rule types without a vectorized form fall back to their compiled
+    row-wise evaluator, only for the rows whose condition is met.
+
+    Every rule is still evaluated for every row; `mode` only filters what is
+    reported, matching RulesEngine.validate in that mode. With `counted`
+    (one list per record), appends each rule's (name, PASSED/FAILED/SKIPPED)
+    as RulesEngine.validate would record it in that mode: in FAIL_FAST,
+    only batch-scoped rules are counted after the stop.
+    """
+    n = len(records)
+    columns = _Columns(records)
+    all_rows = list(range(n))
+    errors: List[List[RuleResult]] = [[] for _ in all_rows]
+    warnings: List[List[RuleResult]] = [[] for _ in all_rows]
+    successes: List[List[RuleResult]] = [[] for _ in all_rows]
+    report_successes = mode is EvaluationMode.FULL
+    fail_fast = mode is EvaluationMode.FAIL_FAST
+    stopped = [False] * n
+    # condition group -> rows whose condition is met, shared by the group's rules
+    condition_rows: Dict[int, List[int]] = {}
+
+    for compiled in plan:
+        rule = compiled.rule
+        rows = all_rows
+        if compiled.condition_parts is not None:
+            group = compiled.condition_group
+            met_rows = condition_rows.get(group) if group is not None else None
+            if met_rows is None:
+                equals = compiled.condition_equals
+                met = columns[compiled.condition_parts].map_uniques(lambda u: u == equals)
+                met_rows = np.flatnonzero(met).tolist()
+                if group is not None:
+                    condition_rows[group] = met_rows
+            rows = met_rows
+
+        outcomes: _Outcomes = [None] * n
+        vectorized = _VECTORIZED.get(type(rule))
+        if vectorized is not None:
+            vectorized(rule, columns, rows, outcomes)
+        else:
+            evaluate = compiled.evaluate
+            for i in rows:
+                outcomes[i] = evaluate(records[i])
+
+        if counted is not None:
+            name = rule.name
+            for i, result in enumerate(outcomes):
+                if not stopped[i] or rule.batch_scoped:
+                    counted[i].append((name, SKIPPED if result is None else PASSED if result.passed else FAILED))
+
+        # Scatter rule-major; each record still receives results in rule order
+        for i, result in enumerate(outcomes):
+            if stopped[i] or (not report_successes and (result is None or result.passed)):
+                continue
+            if result is None:
+                successes[i].append(compiled.skipped)
+            elif result.passed:
+                successes[i].append(result)
+            elif result.severity == RuleSeverity.ERROR:
+                errors[i].append(result)
+                stopped[i] = fail_fast
+            elif result.severity == RuleSeverity.WARNING:
+                warnings[i].append(result)
+
+    return [
+        ValidationSummary(
+            valid=len(errors[i]) == 0,
+            errors=errors[i],
+            warnings=warnings[i],
+            successes=successes[i],
+        )
+        for i in all_rows
+    ]
@@ -1,14 +1,33 @@
+import copy
+import hashlib
+import logging
+import time
 import yaml
+from datetime import date
+from pathlib import Path
 from typing import (
     Any,
+    Callable,
     Dict,
+    Iterable,
     List,
     Optional,
+    Set,
+    Tuple,
+    Union,
 )
 
-from app.rules import helpers
+from app.rules import helpers, snapshot
+from app.rules.analysis import RuleSetAnalysis, analyze
+from app.rules.batch import BatchScope
+from app.rules.instrumentation import FAILED, PASSED, SKIPPED, EngineMetrics
+from app.rules.projection import ModelProjection
 from app.rules.models import (
+    CONDITION_NOT_MET,
+    Check,
     Condition,
+    EvaluationMode,
+    Evaluator,
     FieldComparisonRule,
     PresenceRule,
     RequiresRule,
@@ -17,12 +36,22 @@ from app.rules.models import (
     RuleSeverity,
     StringMatchRule,
     TransformRule,
+    UniqueInBatchRule,
     ValidationSummary,
     ValueComparisonRule,
     ValueInSetRule,
 )
 
 
+logger = logging.getLogger(__name__)
+
+# libyaml's C loader when available; pure Python otherwise
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Derived values that can't share mutable state with the application
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
 # ---------------------------------------------------------------------------
 # Rule factory (discriminated by "type")
 # ---------------------------------------------------------------------------
@@ -102,71 +131,671 @@ def rule_from_dict(raw: Dict[str, Any]) -> Rule | TransformRule:
             message=message,
             when=when,
         )
+    elif rtype == "unique_in_batch":
+        return UniqueInBatchRule(
+            name=raw["name"],
+            fields=raw["fields"],
+            severity=severity,
+            message=message,
+            when=when,
+        )
 
     raise ValueError(f"Unsupported rule type: {rtype}")
 
 
+# ---------------------------------------------------------------------------
+# Execution plan (built once per engine)
+# ---------------------------------------------------------------------------
+
+def _overlaps(a: Tuple[str, ...], b: Tuple[str, ...]) -> bool:
+    """True if one path is the other or lies under it."""
+    n = min(len(a), len(b))
+    return a[:n] == b[:n]
+
+
+class _CompiledRule:
+    __slots__ = (
+        "rule", "evaluate", "check", "skipped",
+        "condition_parts", "condition_equals", "condition_group", "shared_group",
+    )
+
+    def __init__(self, rule: Rule):
+        self.rule = rule
+        self.evaluate: Evaluator = rule.compile()
+        self.check: Check = rule.compile_check()
+        # Results are immutable, so every unmet condition shares this one
+        self.skipped = RuleResult(
+            name=rule.name,
+            passed=True,
+            severity=rule.severity,
+            message=None,
+            details=CONDITION_NOT_MET,
+        )
+        self.condition_parts: Optional[Tuple[str, ...]] = None
+        self.condition_equals: Any = None
+        # Rules sharing (condition field, expected value) share a group id
+        self.condition_group: Optional[int] = None
+        if rule.when:
+            self.condition_parts = helpers.split_path(rule.when.field)
+            self.condition_equals = rule.when.equals
+        # Rules with identical checks share a group id (see _SharedOutcomes)
+        self.shared_group: Optional[int] = None
+
+    def renamed(self, result: RuleResult) -> RuleResult:
+        """`result` of an identical check, under this rule's name, severity and message."""
+        rule = self.rule
+        message = None if result.passed else getattr(rule, "message", None)
+        return RuleResult(rule.name, result.passed, rule.severity, message, result.details)
+
+
+class _SharedOutcomes:
+    """
+    One evaluation's outcomes of the checks several rules share, by group
+    (see RuleSetAnalysis.shared_checks). Whichever rule of a group runs
+    first computes the outcome; the others reuse it under their own name,
+    severity and message. Made for each evaluation and dropped with it, so
+    nothing is kept past the call or seen by another evaluation.
+    """
+    __slots__ = ("passed", "results")
+
+    def __init__(self, groups: int):
+        self.passed: List[Optional[bool]] = [None] * groups
+        self.results: List[Optional[RuleResult]] = [None] * groups
+
+    def check(self, compiled: _CompiledRule, data: Dict[str, Any]) -> bool:
+        group = compiled.shared_group
+        passed = self.passed[group]
+        if passed is None:
+            result = self.results[group]
+            passed = self.passed[group] = compiled.check(data) if result is None else result.passed
+        return passed
+
+    def evaluate(self, compiled: _CompiledRule, data: Dict[str, Any]) -> RuleResult:
+        group = compiled.shared_group
+        result = self.results[group]
+        if result is None:
+            result = self.results[group] = compiled.evaluate(data)
+            return result
+        return compiled.renamed(result)
+
+
+class _CompiledTransform:
+    __slots__ = ("name", "func", "takes_today", "field_parts", "output_parts")
+
+    def __init__(self, func: Callable[..., Any], transform: TransformRule):
+        self.name = transform.name
+        self.func = func
+        # Date-dependent transforms get the evaluation's date snapshot
+        self.takes_today = transform.transform in helpers.DATE_DEPENDENT_TRANSFORMS
+        self.field_parts = helpers.split_path(transform.field)
+        self.output_parts = helpers.split_path(transform.output_field)
+
+
+class _TransformGraph:
+    """
+    Which transforms each read needs, so derived fields are computed lazily.
+
+    Transform i depends on an earlier transform j whenever running them out
+    of list order could change a result: j writes what i reads, both write
+    the same place, or i overwrites what j reads. Running the union of any
+    dependency closures in list order then yields, on every path a rule
+    reads, the same values as running every transform eagerly. Transforms
+    nothing reads never run.
+    """
+    __slots__ = ("condition", "rules", "live")
+
+    def __init__(
+        self,
+        transforms: List[_CompiledTransform],
+        condition_paths: Iterable[Tuple[str, ...]],
+        rule_paths: List[List[Tuple[str, ...]]],
+    ):
+        closures: List[Set[int]] = []
+        for i, t in enumerate(transforms):
+            closure = {i}
+            for j in range(i):
+                earlier = transforms[j]
+                if (
+                    _overlaps(earlier.output_parts, t.field_parts)
+                    or _overlaps(earlier.output_parts, t.output_parts)
+                    or _overlaps(earlier.field_parts, t.output_parts)
+                ):
+                    closure |= closures[j]
+            closures.append(closure)
+
+        def needed(paths: Iterable[Tuple[str, ...]]) -> Tuple[int, ...]:
+            found: Set[int] = set()
+            for parts in paths:
+                for i, t in enumerate(transforms):
+                    if _overlaps(t.output_parts, parts):
+                        found |= closures[i]
+            return tuple(sorted(found))
+
+        # Transforms behind `when` fields run before conditions are resolved
+        self.condition = needed(condition_paths)
+        # Per plan position: transforms the rule's check reads
+        self.rules = [needed(paths) for paths in rule_paths]
+        self.live = needed(p for paths in [*rule_paths, list(condition_paths)] for p in paths)
+
+
+class _View:
+    """
+    One evaluation's read view of an application: derived fields are
+    written into copy-on-write copies of the dicts along their path, so the
+    caller's payload is never modified. An `owned` source (one built for
+    this evaluation alone, e.g. a model projection) is written into
+    directly, until a transform derives a container: that may hold dicts of
+    the source, so writes are copy-on-write from then on. Each transform
+    runs at most once.
+    """
+    __slots__ = ("data", "_source", "_transforms", "_done", "_copied", "_today", "_owned")
+
+    def __init__(
+        self,
+        source: Dict[str, Any],
+        transforms: List[_CompiledTransform],
+        today: Optional[date] = None,
+        owned: bool = False,
+    ):
+        self.data = source
+        self._source = source
+        self._transforms = transforms
+        self._done = bytearray(len(transforms))
+        self._copied: Set[int] = set()
+        self._today = today
+        self._owned = owned
+
+    def run(self, indexes: Iterable[int]) -> None:
+        """Compute the given transforms (in list order) unless already done."""
+        done = self._done
+        for i in indexes:
+            if done[i]:
+                continue
+            done[i] = 1
+            t = self._transforms[i]
+            value = helpers.get_by_parts(self.data, t.field_parts)
+            if t.takes_today:
+                if self._today is None:
+                    self._today = date.today()
+                derived = t.func(value, self._today)
+            else:
+                derived = t.func(value)
+            self._set(t.output_parts, derived)
+
+    def _set(self, parts: Tuple[str, ...], value: Any) -> None:
+        # Same effect as helpers.set_by_parts, on copies of the source dicts
+        if not parts:
+            return
+        if self._owned:
+            if type(value) in _SCALARS:
+                helpers.set_by_parts(self.data, parts, value)
+                return
+            self._owned = False
+            self._source = self.data
+        copied = self._copied
+        if self.data is self._source:
+            self.data = dict(self._source)
+            copied.add(id(self.data))
+        current = self.data
+        for p in parts[:-1]:
+            child = current.get(p)
+            if not isinstance(child, dict):
+                child = current[p] = {}
+                copied.add(id(child))
+            elif id(child) not in copied:
+                child = current[p] = dict(child)
+                copied.add(id(child))
+            current = child
+        current[parts[-1]] = value
+
+
+class _ConditionIndex:
+    """
+    Plan positions grouped by `when` condition.
+
+    Every distinct condition field is resolved once per application, and its
+    value is looked up in a dict of expected values to find every rule whose
+    condition is met. Dict lookup matches on `==` like the per-rule check;
+    expected values that aren't hashable (lists, mappings) are compared
+    directly.
+    """
+    __slots__ = ("fields", "template")
+
+    def __init__(self, plan: List[_CompiledRule]):
+        # condition parts -> (expected value -> plan positions, unhashable (expected, positions))
+        by_field: Dict[Tuple[str, ...], Tuple[Dict[Any, List[int]], List[Tuple[Any, List[int]]]]] = {}
+        groups: Dict[Tuple[Tuple[str, ...], int], int] = {}
+        # 1 for unconditional rules; conditional ones start unmet
+        self.template = bytearray(len(plan))
+
+        for i, compiled in enumerate(plan):
+            parts = compiled.condition_parts
+            if parts is None:
+                self.template[i] = 1
+                continue
+            hashed, unhashable = by_field.setdefault(parts, ({}, []))
+            equals = compiled.condition_equals
+            try:
+                positions = hashed.setdefault(equals, [])
+            except TypeError:
+                positions = []
+                unhashable.append((equals, positions))
+            positions.append(i)
+            compiled.condition_group = groups.setdefault((parts, id(positions)), len(groups))
+
+        self.fields = [(parts, hashed, unhashable) for parts, (hashed, unhashable) in by_field.items()]
+
+    def met(self, data: Dict[str, Any]) -> bytearray:
+        """Per plan position: 1 if the rule's condition holds (or it has none)."""
+        met = bytearray(self.template)
+        get_by_parts = helpers.get_by_parts
+        for parts, hashed, unhashable in self.fields:
+            value = get_by_parts(data, parts)
+            try:
+                positions = hashed.get(value)
+            except TypeError:
+                positions = None  # unhashable values never equal a hashable expected value
+            if positions:
+                for i in positions:
+                    met[i] = 1
+            for equals, positions in unhashable:
+                if value == equals:
+                    for i in positions:
+                        met[i] = 1
+        return met
+
+
+class _DependencyIndex:
+    """
+    Which items (plan positions) read which paths. A change at path P
+    touches every item that reads P, a path under P (P was replaced
+    wholesale) or a path above P (the item reads the enclosing object).
+    """
+    __slots__ = ("_at", "_under")
+
+    def __init__(self, inputs: List[Iterable[Tuple[str, ...]]]):
+        self._at: Dict[Tuple[str, ...], Set[int]] = {}
+        self._under: Dict[Tuple[str, ...], Set[int]] = {}
+        for i, paths in enumerate(inputs):
+            for parts in paths:
+                self._at.setdefault(parts, set()).add(i)
+                for depth in range(1, len(parts) + 1):
+                    self._under.setdefault(parts[:depth], set()).add(i)
+
+    def touched(self, changed: Iterable[Tuple[str, ...]]) -> Set[int]:
+        found: Set[int] = set()
+        for parts in changed:
+            found |= self._under.get(parts, set())
+            for depth in range(1, len(parts)):
+                found |= self._at.get(parts[:depth], set())
+        return found
+
+
+class ValidationState:
+    """
+    An application plus one result per rule, in plan order: what
+    `RulesEngine.validate_delta` needs to re-evaluate only what changed.
+    Treat as immutable; deltas return a new state.
+    """
+    __slots__ = ("data", "results", "day", "_plan")
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        results: List[RuleResult],
+        day: Optional[date],
+        plan: List[_CompiledRule],
+    ):
+        self.data = data
+        self.results = results
+        # date.today() at evaluation, for date-dependent transforms
+        self.day = day
+        self._plan = plan
+
+    def summary(self) -> ValidationSummary:
+        errors: List[RuleResult] = []
+        warnings: List[RuleResult] = []
+        successes: List[RuleResult] = []
+        for result in self.results:
+            if result.passed:
+                successes.append(result)
+            elif result.severity == RuleSeverity.ERROR:
+                errors.append(result)
+            elif result.severity == RuleSeverity.WARNING:
+                warnings.append(result)
+        return ValidationSummary(
+            valid=len(errors) == 0,
+            errors=errors,
+            warnings=warnings,
+            successes=successes,
+        )
+
+
 # ---------------------------------------------------------------------------
 # Rules Engine
 # ---------------------------------------------------------------------------
 
+# "interpreted" walks the compiled plan; "codegen" runs Python generated for
+# the rule set (see app.rules.codegen). Results are identical.
+BACKENDS = ("interpreted", "codegen")
+
+
 class RulesEngine:
-    def __init__(self, rules: List[Rule], transforms: List[TransformRule]):
+    def __init__(
+        self,
+        rules: List[Rule],
+        transforms: List[TransformRule],
+        metrics: Optional[EngineMetrics] = None,
+        version: Optional[str] = None,
+        backend: str = "interpreted",
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown engine backend {backend!r}; expected one of {BACKENDS}")
         self._rules = rules
         self._transforms = transforms
+        self._metrics = metrics
+        # Content checksum of the rule set this engine was built from
+        self.version = version
+        self.backend = backend
+        self._compile()
+        # Uninstrumented entry point: the generated functions or the interpreter
+        self._validate_plain: Callable[..., ValidationSummary] = self.validate
+        if self._generated is not None:
+            self.validate = self._validate_plain = self._generated  # type: ignore[method-assign]
+        if metrics is not None:
+            # Swap in the instrumented entry point; without metrics,
+            # validate() stays the plain, uninstrumented method.
+            self.validate = self._validate_instrumented  # type: ignore[method-assign]
 
     @classmethod
-    def from_yaml(cls, path: str) -> "RulesEngine":
-        with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+    def from_yaml(
+        cls,
+        path: str,
+        metrics: Optional[EngineMetrics] = None,
+        backend: str = "interpreted",
+    ) -> "RulesEngine":
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = yaml.load(raw, Loader=_YAMLLoader) or {}
+        return cls._from_raw_rules(
+            data.get("rules", []),
+            metrics=metrics,
+            version=hashlib.sha256(raw).hexdigest(),
+            backend=backend,
+        )
 
+    @classmethod
+    def from_snapshot(
+        cls,
+        path: str,
+        metrics: Optional[EngineMetrics] = None,
+        backend: str = "interpreted",
+    ) -> "RulesEngine":
+        """Load a snapshot written by `write_snapshot` (no YAML parsing)."""
+        data = snapshot.read_snapshot(path)
+        if data is None:
+            raise ValueError(f"Not a valid rules snapshot: {path}")
+        return cls._from_raw_rules(
+            data["rules"], metrics=metrics, version=data["source_sha256"], backend=backend
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        metrics: Optional[EngineMetrics] = None,
+        snapshot_path: Optional[Union[str, Path]] = None,
+        backend: str = "interpreted",
+    ) -> "RulesEngine":
+        """
+        Load the rules at `path`, preferring its pre-built snapshot
+        (`rules.snapshot.json` by default) when the snapshot's content hash
+        matches the YAML; otherwise fall back to parsing the YAML.
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()
+
+        snapshot_path = snapshot_path or snapshot.snapshot_path_for(path)
+        data = snapshot.read_snapshot(snapshot_path, expected_sha256=version)
+        if data is not None:
+            try:
+                return cls._from_raw_rules(data["rules"], metrics=metrics, version=version, backend=backend)
+            except Exception:
+                # The YAML is the source of truth; a bad snapshot mustn't stop startup
+                logger.warning("Rules snapshot %s doesn't build; loading %s", snapshot_path, path, exc_info=True)
+        elif Path(snapshot_path).exists():
+            logger.info("Rules snapshot %s is stale or invalid; loading %s", snapshot_path, path)
+        parsed = yaml.load(raw, Loader=_YAMLLoader) or {}
+        return cls._from_raw_rules(parsed.get("rules", []), metrics=metrics, version=version, backend=backend)
+
+    @classmethod
+    def _from_raw_rules(
+        cls,
+        raw_rules: List[Dict[str, Any]],
+        metrics: Optional[EngineMetrics],
+        version: Optional[str],
+        backend: str = "interpreted",
+    ) -> "RulesEngine":
         rules: List[Rule] = []
         transforms: List[TransformRule] = []
 
-        for raw_rule in data.get("rules", []):
+        for raw_rule in raw_rules:
             rule = rule_from_dict(raw_rule)
             if isinstance(rule, TransformRule):
                 transforms.append(rule)
             else:
                 rules.append(rule)
 
-        return cls(rules=rules, transforms=transforms)
+        return cls(rules=rules, transforms=transforms, metrics=metrics, version=version, backend=backend)
 
-    # Main entry point
-    def validate(self, data: Dict[str, Any]) -> ValidationSummary:
-        # 1. Apply all transforms (mutate data)
-        self._apply_transforms(data)
+    def write_snapshot(self, path: Union[str, Path]) -> None:
+        """Persist this engine's (validated) rules as a snapshot."""
+        if self.version is None:
+            raise ValueError("Only engines loaded from a rules file can be snapshotted")
+        # Transforms first: they run before rules regardless of file order
+        data = snapshot.build_snapshot([*self._transforms, *self._rules], self.version)
+        snapshot.write_snapshot(data, path)
 
-        # 2. Apply real validation rules
-        results: List[RuleResult] = []
-        for rule in self._rules:
-            # Skip if condition not met
-            if rule.when and not self._condition_met(rule.when, data):
-                results.append(
-                    RuleResult(
-                        name=rule.name,
-                        passed=True,
-                        severity=rule.severity,
-                        message=None,
-                        details={"reason": "condition_not_met"},
-                    )
-                )
+    @property
+    def rules(self) -> List[Rule]:
+        """The validation rules, in evaluation order (read-only by convention)."""
+        return self._rules
+
+    @property
+    def transforms(self) -> List[TransformRule]:
+        """The transforms, as declared (read-only by convention)."""
+        return self._transforms
+
+    @property
+    def generated_source(self) -> Optional[str]:
+        """The generated evaluation code (codegen backend only), for auditing."""
+        return self._generated.source if self._generated is not None else None
+
+    def _compile(self) -> None:
+        """
+        Build the execution plan: every rule becomes a prebuilt evaluator and
+        every transform is resolved against the registry, so `validate` only
+        does per-application work.
+        """
+        self._plan: List[_CompiledRule] = [_CompiledRule(rule) for rule in self._rules]
+        self._conditions = _ConditionIndex(self._plan)
+        self._rule_dependencies = _DependencyIndex([
+            [helpers.split_path(path) for path in compiled.rule.input_fields()]
+            for compiled in self._plan
+        ])
+        self._compiled_transforms: List[_CompiledTransform] = []
+        known: List[TransformRule] = []
+        for t in self._transforms:
+            func = helpers.TRANSFORM_REGISTRY.get(t.transform)
+            if func is None:
                 continue
+            known.append(t)
+            self._compiled_transforms.append(_CompiledTransform(func, t))
+        condition_paths = {compiled.condition_parts for compiled in self._plan if compiled.condition_parts is not None}
+        rule_paths = [[helpers.split_path(path) for path in compiled.rule.read_fields()] for compiled in self._plan]
+        self._transform_graph = _TransformGraph(self._compiled_transforms, condition_paths, rule_paths)
 
-            results.append(rule.apply(data))
+        # Static analysis (app.rules.analysis): drop dead transforms, share
+        # identical checks, order FAIL_FAST evaluation by cost
+        self.analysis: RuleSetAnalysis = analyze(
+            self._rules, self._transforms, [known[i] for i in self._transform_graph.live]
+        )
+        if self.analysis.dead_transforms:
+            # They never ran; this keeps them out of metrics and generated code
+            self._compiled_transforms = [self._compiled_transforms[i] for i in self._transform_graph.live]
+            self._transform_graph = _TransformGraph(self._compiled_transforms, condition_paths, rule_paths)
+        for group, positions in enumerate(self.analysis.shared_checks):
+            for i in positions:
+                self._plan[i].shared_group = group
+        self._shared_groups = len(self.analysis.shared_checks)
+        # (plan position, rule, transforms it reads) in evaluation order
+        self._failure_steps = [
+            (i, compiled, needs) for i, (compiled, needs) in enumerate(zip(self._plan, self._transform_graph.rules))
+        ]
+        self._fail_fast_steps = [self._failure_steps[i] for i in self.analysis.fail_fast_order]
+        self._fail_fast_plan = [self._plan[i] for i in self.analysis.fail_fast_order]
+        # Position -> batch-scoped steps after it in FAIL_FAST order. They
+        # still run when evaluation stops there, so every application is
+        # indexed whatever other rules it fails (see app.rules.batch).
+        self._batch_after: Dict[int, List[Tuple[int, _CompiledRule, Tuple[int, ...]]]] = {}
+        pending: List[Tuple[int, _CompiledRule, Tuple[int, ...]]] = []
+        for step in reversed(self._fail_fast_steps):
+            if pending:
+                self._batch_after[step[0]] = pending
+            if step[1].rule.batch_scoped:
+                pending = [step, *pending]
+
+        # Everything an evaluation reads: rule and `when` fields, transform inputs
+        self._projection = ModelProjection([
+            *(helpers.split_path(path) for rule in self._rules for path in rule.input_fields()),
+            *(self._compiled_transforms[i].field_parts for i in self._transform_graph.live),
+        ])
+        # Results depend on other applications of a batch (see app.rules.batch)
+        self.batch_scoped = any(rule.batch_scoped for rule in self._rules)
+        # Results depend on date.today(), not only on the application
+        self.date_dependent = any(
+            self._compiled_transforms[i].takes_today for i in self._transform_graph.live
+        )
+
+        self._generated = None
+        if self.backend == "codegen":
+            from app.rules.codegen import generate
+
+            self._generated = generate(
+                self._plan,
+                self._compiled_transforms,
+                self._transform_graph,
+                label=self.version[:12] if self.version else "rules",
+                fail_fast_order=self.analysis.fail_fast_order,
+            )
+
+        if self._metrics is not None:
+            # Parallel plan used for sampled validations: same evaluators,
+            # wrapped so each call records its latency.
+            self._timed_plan: List[_CompiledRule] = []
+            for compiled in self._plan:
+                timed = copy.copy(compiled)
+                timed.evaluate = self._metrics.timed_rule(compiled.rule.name, compiled.evaluate)
+                self._timed_plan.append(timed)
+            self._timed_transforms: List[_CompiledTransform] = []
+            for compiled_transform in self._compiled_transforms:
+                timed_transform = copy.copy(compiled_transform)
+                timed_transform.func = self._metrics.timed_transform(
+                    compiled_transform.name, compiled_transform.func
+                )
+                self._timed_transforms.append(timed_transform)
+
+    # Main entry point
+    def validate(
+        self,
+        data: Dict[str, Any],
+        mode: EvaluationMode = EvaluationMode.FULL,
+        today: Optional[date] = None,
+        owned: bool = False,
+    ) -> ValidationSummary:
+        """
+        Validate one application. `data` is not modified: derived fields are
+        computed lazily, as rules read them, into a copy-on-write view.
+        Date-dependent transforms use `today` (default: the current date).
+        Pass `owned=True` when `data` belongs to this call alone (freshly
+        parsed JSON, a `project`ion) to have derived fields written into it
+        instead of into copies.
 
+        In ERRORS_ONLY and FAIL_FAST modes `successes` is empty; FAIL_FAST
+        evaluates the cheapest rules first and stops at the first
+        ERROR-severity failure, so later errors and warnings are not
+        reported.
+        """
+        view = _View(data, self._compiled_transforms, today, owned)
+        if mode is EvaluationMode.FULL:
+            return self._evaluate(view, self._plan)
+        if mode is EvaluationMode.FAIL_FAST:
+            return self._evaluate_failures(view, self._fail_fast_steps, True)
+        return self._evaluate_failures(view, self._failure_steps, False)
+
+    def _validate_instrumented(
+        self,
+        data: Dict[str, Any],
+        mode: EvaluationMode = EvaluationMode.FULL,
+        today: Optional[date] = None,
+        owned: bool = False,
+    ) -> ValidationSummary:
+        metrics = self._metrics
+        assert metrics is not None
+        sampled = metrics.should_sample()
+        start = time.perf_counter_ns() if sampled else 0
+        if mode is not EvaluationMode.FULL:
+            # The summary only lists failures, so outcomes are recorded as the
+            # rules run; this is the interpreter's path, whatever the backend.
+            # Per-rule latencies describe full evaluations only.
+            outcomes: List[Tuple[str, int]] = []
+            view = _View(data, self._compiled_transforms, today, owned)
+            if mode is EvaluationMode.FAIL_FAST:
+                summary = self._evaluate_failures(view, self._fail_fast_steps, True, outcomes)
+            else:
+                summary = self._evaluate_failures(view, self._failure_steps, False, outcomes)
+            metrics.record_outcomes(outcomes)
+        else:
+            if sampled:
+                # Sampled full evaluations go through the interpreter's timed plan
+                view = _View(data, self._timed_transforms, today, owned)
+                summary = self._evaluate(view, self._timed_plan)
+            else:
+                summary = self._validate_plain(data, mode, today, owned)
+            metrics.record_summary(summary)
+        if sampled:
+            metrics.observe_request(time.perf_counter_ns() - start)
+        return summary
+
+    def _evaluate(self, view: _View, plan: List[_CompiledRule]) -> ValidationSummary:
         errors: List[RuleResult] = []
         warnings: List[RuleResult] = []
         successes: list[RuleResult] = []
 
-        for result in results:
+        graph = self._transform_graph
+        if graph.condition:
+            view.run(graph.condition)
+        shared = _SharedOutcomes(self._shared_groups) if self._shared_groups else None
+        # Resolve every condition field once, then walk the plan in order
+        for compiled, met, needs in zip(plan, self._conditions.met(view.data), graph.rules):
+            # Skip if condition not met
+            if not met:
+                successes.append(compiled.skipped)
+                continue
+
+            if needs:
+                view.run(needs)
+            if compiled.shared_group is None:
+                result = compiled.evaluate(view.data)
+            else:
+                result = shared.evaluate(compiled, view.data)  # type: ignore[union-attr]
             if result.passed:
                 successes.append(result)
-            else:
-                if result.severity == RuleSeverity.ERROR:
-                    errors.append(result)
-                elif result.severity == RuleSeverity.WARNING:
-                    warnings.append(result)
+            elif result.severity == RuleSeverity.ERROR:
+                errors.append(result)
+            elif result.severity == RuleSeverity.WARNING:
+                warnings.append(result)
 
         return ValidationSummary(
             valid=len(errors) == 0,
@@ -175,17 +804,230 @@ class RulesEngine:
             successes=successes,
         )
 
-    # Internal helpers
+    def _evaluate_failures(
+        self,
+        view: _View,
+        steps: List[Tuple[int, _CompiledRule, Tuple[int, ...]]],
+        fail_fast: bool,
+        outcomes: Optional[List[Tuple[str, int]]] = None,
+    ) -> ValidationSummary:
+        """
+        Run each rule's pass/fail check and only build a RuleResult (with its
+        details) for rules that fail; skipped and passing rules cost nothing.
+        With `outcomes`, appends (rule name, PASSED/FAILED/SKIPPED) for every
+        rule that was reached, for the metrics.
+        """
+        errors: List[RuleResult] = []
+        warnings: List[RuleResult] = []
+        record = outcomes.append if outcomes is not None else None
 
-    def _apply_transforms(self, data: Dict[str, Any]) -> None:
-        for t in self._transforms:
-            func = helpers.TRANSFORM_REGISTRY.get(t.transform)
-            if func is None:
+        graph = self._transform_graph
+        if graph.condition:
+            view.run(graph.condition)
+        met = self._conditions.met(view.data)
+        shared = _SharedOutcomes(self._shared_groups) if self._shared_groups else None
+        for i, compiled, needs in steps:
+            if not met[i]:
+                if record is not None:
+                    record((compiled.rule.name, SKIPPED))
+                continue
+            if needs:
+                view.run(needs)
+            if compiled.shared_group is None:
+                passed = compiled.check(view.data)
+            else:
+                passed = shared.check(compiled, view.data)  # type: ignore[union-attr]
+            if passed:
+                if record is not None:
+                    record((compiled.rule.name, PASSED))
+                continue
+
+            if compiled.shared_group is None:
+                result = compiled.evaluate(view.data)
+            else:
+                result = shared.evaluate(compiled, view.data)  # type: ignore[union-attr]
+            if record is not None:
+                record((compiled.rule.name, FAILED))
+            if result.severity == RuleSeverity.ERROR:
+                errors.append(result)
+                if fail_fast:
+                    for j, batch, batch_needs in self._batch_after.get(i, ()):
+                        if not met[j]:
+                            outcome = SKIPPED
+                        else:
+                            if batch_needs:
+                                view.run(batch_needs)
+                            outcome = PASSED if batch.check(view.data) else FAILED
+                        if record is not None:
+                            record((batch.rule.name, outcome))
+                    break
+            elif result.severity == RuleSeverity.WARNING:
+                warnings.append(result)
+
+        return ValidationSummary(
+            valid=len(errors) == 0,
+            errors=errors,
+            warnings=warnings,
+            successes=[],
+        )
+
+    def validate_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        columnar: bool = False,
+        mode: EvaluationMode = EvaluationMode.FULL,
+        owned: bool = False,
+        scope: Optional[BatchScope] = None,
+    ) -> List[ValidationSummary]:
+        """
+        Validate a batch in order, reusing the compiled plan for every record.
+        Date-dependent transforms see one date snapshot for the whole batch.
+        `owned` is as for `validate`, for every record. Batch-scoped rules
+        compare each record with the earlier ones in `scope`, by default a
+        new scope holding just this batch.
+
+        With `columnar=True` the rules are evaluated field-by-field across the
+        whole batch with NumPy (see app.rules.columnar); results are identical
+        to the row-by-row path. Requires the optional `columnar` extra.
+        """
+        if self.batch_scoped:
+            with (scope or BatchScope()).active() as active:
+                return self._validate_many(records, columnar, mode, owned, active)
+        return self._validate_many(records, columnar, mode, owned, None)
+
+    def _validate_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        columnar: bool,
+        mode: EvaluationMode,
+        owned: bool,
+        scope: Optional[BatchScope],
+    ) -> List[ValidationSummary]:
+        today = self._today()
+        if columnar:
+            from app.rules.columnar import validate_columnar
+
+            # Columns need every live derived field of every record
+            views = []
+            for data in records:
+                view = _View(data, self._compiled_transforms, today, owned)
+                view.run(self._transform_graph.live)
+                views.append(view.data)
+            plan = self._fail_fast_plan if mode is EvaluationMode.FAIL_FAST else self._plan
+            metrics = self._metrics
+            if metrics is None:
+                return validate_columnar(plan, views, mode)
+            if mode is EvaluationMode.FULL:
+                summaries = validate_columnar(plan, views, mode)
+                for summary in summaries:
+                    metrics.record_summary(summary)
+                return summaries
+            counted: List[List[Tuple[str, int]]] = [[] for _ in views]
+            summaries = validate_columnar(plan, views, mode, counted)
+            for outcomes in counted:
+                metrics.record_outcomes(outcomes)
+            return summaries
+
+        validate = self.validate
+        if scope is None:
+            return [validate(data, mode, today, owned) for data in records]
+        summaries = []
+        for data in records:
+            scope.next_record()
+            summaries.append(validate(data, mode, today, owned))
+        return summaries
+
+    # Validated models
+
+    def project(self, model: Any) -> Dict[str, Any]:
+        """
+        The paths of a pydantic model that this rule set reads, as a nested
+        dict holding what `model.model_dump()` holds on those paths. Cheaper
+        than dumping the whole model, and gives the same results; the dict
+        is new, so it can be validated with `owned=True`.
+        """
+        return self._projection(model)
+
+    def validate_model(
+        self,
+        model: Any,
+        mode: EvaluationMode = EvaluationMode.FULL,
+        today: Optional[date] = None,
+    ) -> ValidationSummary:
+        """`validate(model.model_dump(), ...)` without dumping the model."""
+        return self.validate(self._projection(model), mode, today, owned=True)
+
+    # Incremental re-validation
+
+    def validate_state(self, data: Dict[str, Any]) -> ValidationState:
+        """
+        Full validation that keeps what `validate_delta` needs; `data` is
+        kept as the state's application and must not be modified afterwards.
+        Metrics are not recorded on this path.
+        """
+        today = self._today()
+        results = self._results_at(data, today, range(len(self._plan)), [None] * len(self._plan))
+        return ValidationState(data, results, today, self._plan)
+
+    def validate_delta(self, state: ValidationState, changes: Dict[str, Any]) -> ValidationState:
+        """
+        Apply `changes` (dotted path -> new value) to a prior state and
+        re-evaluate only the rules whose inputs (including `when` fields)
+        touch a changed path, directly or through the transforms deriving
+        them. Returns a new state; `state` is left as it was.
+
+        States from another rule set are fully re-evaluated, as are rules
+        reading date-dependent transforms once the day has changed.
+        """
+        data = copy.deepcopy(state.data)
+        changed: List[Tuple[str, ...]] = []
+        for path, value in changes.items():
+            parts = helpers.split_path(path)
+            # Copied so the state never shares the caller's objects
+            helpers.set_by_parts(data, parts, copy.deepcopy(value))
+            changed.append(parts)
+
+        if state._plan is not self._plan:
+            return self.validate_state(data)
+
+        today = self._today()
+        for t in self._compiled_transforms:
+            if (today != state.day and t.takes_today) or any(
+                _overlaps(parts, t.field_parts) or _overlaps(parts, t.output_parts)
+                for parts in changed
+            ):
+                # Later transforms and rules see the derived field as changed
+                changed.append(t.output_parts)
+
+        positions = sorted(self._rule_dependencies.touched(changed))
+        results = self._results_at(data, today, positions, list(state.results))
+        return ValidationState(data, results, today, self._plan)
+
+    def _results_at(
+        self,
+        data: Dict[str, Any],
+        today: Optional[date],
+        positions: Iterable[int],
+        results: List[Any],
+    ) -> List[RuleResult]:
+        """Evaluate the plan positions in `positions` into `results` (full mode)."""
+        view = _View(data, self._compiled_transforms, today)
+        graph = self._transform_graph
+        view.run(graph.condition)
+        met = self._conditions.met(view.data)
+        shared = _SharedOutcomes(self._shared_groups) if self._shared_groups else None
+        plan = self._plan
+        for i in positions:
+            compiled = plan[i]
+            if not met[i]:
+                results[i] = compiled.skipped
                 continue
-            raw_value = helpers.get_by_path(data, t.field)
-            derived = func(raw_value)
-            helpers.set_by_path(data, t.output_field, derived)
+            view.run(graph.rules[i])
+            if compiled.shared_group is None:
+                results[i] = compiled.evaluate(view.data)
+            else:
+                results[i] = shared.evaluate(compiled, view.data)  # type: ignore[union-attr]
+        return results
 
-    @staticmethod
-    def _condition_met(cond: Condition, data: Dict[str, Any]) -> bool:
-        return helpers.get_by_path(data, cond.field) == cond.equals
+    def _today(self) -> Optional[date]:
+        return date.today() if self.date_dependent else None
@@ -1,11 +1,19 @@
 import datetime
-from typing import Any, Callable, Dict, Optional
+import operator
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
 # ---------------------------------------------------------------------------
 # Utility helpers
 # ---------------------------------------------------------------------------
 
+def split_path(path: str) -> Tuple[str, ...]:
+    """Pre-split a dotted path once so lookups don't re-split per call."""
+    if not path:
+        return ()
+    return tuple(path.split("."))
+
+
 def get_by_path(obj: Dict[str, Any], path: str) -> Any:
     """Safely navigate nested dicts using dotted paths."""
     if not path:
@@ -18,11 +26,29 @@ def get_by_path(obj: Dict[str, Any], path: str) -> Any:
     return current
 
 
+def get_by_parts(obj: Dict[str, Any], parts: Tuple[str, ...]) -> Any:
+    """Same as get_by_path, but over a path already split by split_path."""
+    if not parts:
+        return None
+    current: Any = obj
+    for part in parts:
+        if not isinstance(current, dict) or part not in current:
+            return None
+        current = current[part]
+    return current
+
+
 def set_by_path(obj: Dict[str, Any], path: str, value: Any) -> None:
     """Set nested property using dotted path, creating intermediate dicts."""
     if not path:
         return
-    parts = path.split(".")
+    set_by_parts(obj, tuple(path.split(".")), value)
+
+
+def set_by_parts(obj: Dict[str, Any], parts: Tuple[str, ...], value: Any) -> None:
+    """Same as set_by_path, but over a path already split by split_path."""
+    if not parts:
+        return
     current = obj
     for p in parts[:-1]:
         if p not in current or not isinstance(current[p], dict):
@@ -31,25 +57,57 @@ def set_by_path(obj: Dict[str, Any], path: str, value: Any) -> None:
     current[parts[-1]] = value
 
 
+# ---------------------------------------------------------------------------
+# Comparison operators (shared by value/field comparison rules)
+# ---------------------------------------------------------------------------
+
+def _never(left: Any, right: Any) -> bool:
+    """Unknown operators never pass (mirrors the historical op_map default)."""
+    return False
+
+
+COMPARISON_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "eq": operator.eq,
+    "neq": operator.ne,
+}
+
+
+def comparison_operator(name: str) -> Callable[[Any, Any], bool]:
+    """Resolve an operator name once, at compile time."""
+    return COMPARISON_OPERATORS.get(name, _never)
+
+
 # ---------------------------------------------------------------------------
 # Transform library (age, etc.)
 # ---------------------------------------------------------------------------
 
-def transform_age_years(value: Any) -> Optional[int]:
-    """Transform a date string (ISO format) into age in years."""
+def transform_age_years(value: Any, today: Optional[datetime.date] = None) -> Optional[int]:
+    """
+    Transform a date string (ISO format) into age in years, as of `today`
+    (default: the current date).
+    """
     if value is None:
         return None
     try:
         dob = datetime.date.fromisoformat(str(value))
     except ValueError:
         return None
-    today = datetime.date.today()
+    if today is None:
+        today = datetime.date.today()
     years = today.year - dob.year - (
         (today.month, today.day) < (dob.month, dob.day)
     )
     return years
 
 
-TRANSFORM_REGISTRY: Dict[str, Callable[[Any], Any]] = {
+TRANSFORM_REGISTRY: Dict[str, Callable[..., Any]] = {
     "age_years": transform_age_years,
 }
+
+# Transforms whose output depends on the current date, not just their input;
+# they take the evaluation's date as a second argument.
+DATE_DEPENDENT_TRANSFORMS = frozenset({"age_years"})
@@ -0,0 +1,290 @@
+"""
+Low-overhead engine instrumentation, rendered in Prometheus text format.
+
+Counters and histograms live in per-thread shards: each worker thread only
+ever writes its own shard, so the hot path takes no locks, and a scrape
+merges all shards. Latencies are only measured on every `sample_every`-th
+validation per thread; counts are recorded for every validation.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.rules.models import CONDITION_NOT_MET, ValidationSummary
+
+
+# Histogram bucket upper bounds, in nanoseconds
+RULE_BUCKETS_NS: Tuple[int, ...] = (
+    500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 1_000_000,
+)
+REQUEST_BUCKETS_NS: Tuple[int, ...] = (
+    10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 50_000_000,
+)
+
+
+# ---------------------------------------------------------------------------
+# Prometheus text helpers (shared by every /metrics contributor)
+# ---------------------------------------------------------------------------
+
+Labels = Dict[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def format_metric(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Iterable[Tuple[Labels, float]],
+) -> str:
+    """Render one counter/gauge family in Prometheus text exposition format."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Histogram
+# ---------------------------------------------------------------------------
+
+class Histogram:
+    """Fixed-bucket histogram over nanosecond observations."""
+    __slots__ = ("bounds", "counts", "total_ns", "count")
+
+    def __init__(self, bounds: Sequence[int]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.total_ns = 0
+        self.count = 0
+
+    def observe(self, value_ns: int) -> None:
+        self.counts[bisect_left(self.bounds, value_ns)] += 1
+        self.total_ns += value_ns
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.total_ns += other.total_ns
+        self.count += other.count
+
+
+def format_histogram(
+    name: str,
+    help_text: str,
+    series: Iterable[Tuple[Labels, Histogram]],
+) -> str:
+    """Render histograms (recorded in ns) as a `_seconds` family."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, hist in series:
+        cumulative = 0
+        for bound, count in zip((*hist.bounds, None), hist.counts):
+            cumulative += count
+            le = "+Inf" if bound is None else repr(bound / 1e9)
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {hist.total_ns / 1e9!r}")
+        lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Engine metrics
+# ---------------------------------------------------------------------------
+
+# Outcome indexes of _Shard.rule_counts
+PASSED, FAILED, SKIPPED = 0, 1, 2
+
+
+class _Shard:
+    """Metrics written by a single thread."""
+    __slots__ = (
+        "ticks", "validations", "rule_counts", "rule_latency",
+        "transform_latency", "request_latency",
+    )
+
+    def __init__(self) -> None:
+        self.ticks = 0
+        self.validations = 0
+        # rule name -> [passed, failed, skipped]
+        self.rule_counts: Dict[str, List[int]] = {}
+        self.rule_latency: Dict[str, Histogram] = {}
+        self.transform_latency: Dict[str, Histogram] = {}
+        self.request_latency = Histogram(REQUEST_BUCKETS_NS)
+
+
+class EngineMetrics:
+    """
+    Per-rule hit counts and sampled latencies for one or more RulesEngines.
+
+    Pass an instance to RulesEngine (or RulesEngine.from_yaml); engines built
+    without one run the uninstrumented path with no added cost.
+    """
+
+    def __init__(self, sample_every: int = 16):
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.sample_every = sample_every
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()  # only taken once per thread
+
+    def _shard(self) -> _Shard:
+        shard: Optional[_Shard] = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    # -- recording ---------------------------------------------------------
+
+    def should_sample(self) -> bool:
+        shard = self._shard()
+        shard.ticks += 1
+        return shard.ticks % self.sample_every == 0
+
+    def record_outcomes(self, outcomes: Iterable[Tuple[str, int]]) -> None:
+        """Count one validation from (rule name, PASSED/FAILED/SKIPPED) pairs."""
+        shard = self._shard()
+        shard.validations += 1
+        counts = shard.rule_counts
+        for name, outcome in outcomes:
+            c = counts.get(name)
+            if c is None:
+                c = counts[name] = [0, 0, 0]
+            c[outcome] += 1
+
+    def record_summary(self, summary: ValidationSummary) -> None:
+        """Count one FULL validation, whose summary lists every rule."""
+        shard = self._shard()
+        shard.validations += 1
+        counts = shard.rule_counts
+        for result in summary.successes:
+            c = counts.get(result.name)
+            if c is None:
+                c = counts[result.name] = [0, 0, 0]
+            c[2 if result.details == CONDITION_NOT_MET else 0] += 1
+        for results in (summary.errors, summary.warnings):
+            for result in results:
+                c = counts.get(result.name)
+                if c is None:
+                    c = counts[result.name] = [0, 0, 0]
+                c[1] += 1
+
+    def observe_request(self, elapsed_ns: int) -> None:
+        self._shard().request_latency.observe(elapsed_ns)
+
+    def _observe(self, table: str, name: str, bounds: Sequence[int], elapsed_ns: int) -> None:
+        histograms: Dict[str, Histogram] = getattr(self._shard(), table)
+        hist = histograms.get(name)
+        if hist is None:
+            hist = histograms[name] = Histogram(bounds)
+        hist.observe(elapsed_ns)
+
+    def timed_rule(self, name: str, evaluate: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Wrap a compiled evaluator so each call records its latency."""
+        perf_counter_ns = time.perf_counter_ns
+        observe = self._observe
+
+        def timed(data: Any) -> Any:
+            start = perf_counter_ns()
+            result = evaluate(data)
+            observe("rule_latency", name, RULE_BUCKETS_NS, perf_counter_ns() - start)
+            return result
+
+        return timed
+
+    def timed_transform(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a transform function so each call records its latency."""
+        perf_counter_ns = time.perf_counter_ns
+        observe = self._observe
+
+        def timed(*args: Any) -> Any:
+            start = perf_counter_ns()
+            derived = func(*args)
+            observe("transform_latency", name, RULE_BUCKETS_NS, perf_counter_ns() - start)
+            return derived
+
+        return timed
+
+    # -- exposition --------------------------------------------------------
+
+    def _merged(self) -> _Shard:
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged = _Shard()
+        for shard in shards:
+            merged.validations += shard.validations
+            for name, counts in list(shard.rule_counts.items()):
+                mine = merged.rule_counts.setdefault(name, [0, 0, 0])
+                for i, c in enumerate(counts):
+                    mine[i] += c
+            for table in ("rule_latency", "transform_latency"):
+                target: Dict[str, Histogram] = getattr(merged, table)
+                for name, hist in list(getattr(shard, table).items()):
+                    if name not in target:
+                        target[name] = Histogram(hist.bounds)
+                    target[name].merge(hist)
+            merged.request_latency.merge(shard.request_latency)
+        return merged
+
+    def render_prometheus(self) -> str:
+        merged = self._merged()
+        rules = sorted(merged.rule_counts.items())
+        outcomes = ("passed", "failed", "skipped")
+        return "".join([
+            format_metric(
+                "fafsa_validations_total",
+                "counter",
+                "Applications validated by the rules engine.",
+                [({}, merged.validations)],
+            ),
+            format_metric(
+                "fafsa_rule_evaluations_total",
+                "counter",
+                "Rule evaluations (rules whose when-condition was met).",
+                [({"rule": name}, c[0] + c[1]) for name, c in rules],
+            ),
+            format_metric(
+                "fafsa_rule_results_total",
+                "counter",
+                "Rule outcomes; skipped means condition_not_met.",
+                [
+                    ({"rule": name, "outcome": outcome}, c[i])
+                    for name, c in rules
+                    for i, outcome in enumerate(outcomes)
+                ],
+            ),
+            format_histogram(
+                "fafsa_rule_duration_seconds",
+                f"Rule evaluation latency (sampled 1 in {self.sample_every} validations).",
+                [({"rule": name}, h) for name, h in sorted(merged.rule_latency.items())],
+            ),
+            format_histogram(
+                "fafsa_transform_duration_seconds",
+                f"Transform latency (sampled 1 in {self.sample_every} validations).",
+                [({"transform": name}, h) for name, h in sorted(merged.transform_latency.items())],
+            ),
+            format_histogram(
+                "fafsa_validate_duration_seconds",
+                f"Whole-application validation latency (sampled 1 in {self.sample_every}).",
+                [({}, merged.request_latency)],
+            ),
+        ])
@@ -1,10 +1,12 @@
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from app.rules.helpers import get_by_path
+from app.rules.batch import active_scope
+from app.rules.helpers import comparison_operator, get_by_parts, split_path
 
 
 # ---------------------------------------------------------------------------
@@ -16,22 +18,109 @@ class RuleSeverity(str, Enum):
     WARNING = "warning"
 
 
-@dataclass
+class EvaluationMode(str, Enum):
+    FULL = "full"                # every rule, with a result for each success
+    ERRORS_ONLY = "errors_only"  # every rule, but only failures are reported
+    FAIL_FAST = "fail_fast"      # errors_only, stopping at the first ERROR failure
+
+
+@dataclass(frozen=True, slots=True)
 class Condition:
     field: str
     equals: Any
 
 
-@dataclass
+class DetailsLayout:
+    """
+    The shape of one kind of result `details` for one rule: its keys in order
+    and the values that are the same for every result (field names,
+    operators, patterns, allowed values). Built once when a rule is compiled
+    and shared by all its results, which only store their dynamic values.
+    """
+    __slots__ = ("keys", "static", "positions", "encoded")
+
+    def __init__(self, keys: Sequence[str], static: Optional[Dict[str, Any]] = None):
+        self.keys: Tuple[str, ...] = tuple(keys)
+        self.static: Dict[str, Any] = dict(static or {})
+        dynamic = [key for key in self.keys if key not in self.static]
+        # key -> index into Details.values, or -1 for static keys
+        self.positions: Dict[str, int] = {
+            key: dynamic.index(key) if key in dynamic else -1 for key in self.keys
+        }
+        # Cached JSON fragments, filled in by app.serializer on first use
+        self.encoded: Optional[Tuple[Tuple[str, Optional[str]], ...]] = None
+
+    def bind(self, *values: Any) -> "Details":
+        """Details with this layout and `values` for the dynamic keys, in key order."""
+        return Details(self, values)
+
+
+class Details(Mapping):
+    """
+    Read-only `details` mapping: a shared DetailsLayout plus this result's
+    dynamic values. Behaves like the equivalent dict (lookup, iteration,
+    equality); use `to_dict()` where a real dict is needed, e.g. for `json`.
+    """
+    __slots__ = ("layout", "values")
+
+    def __init__(self, layout: DetailsLayout, values: Tuple[Any, ...] = ()):
+        self.layout = layout
+        self.values = values
+
+    def __getitem__(self, key: str) -> Any:
+        i = self.layout.positions[key]
+        return self.layout.static[key] if i < 0 else self.values[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout.keys)
+
+    def __len__(self) -> int:
+        return len(self.layout.keys)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Details):
+            if other.layout is self.layout:
+                return self.values == other.values
+            if other.layout.keys != self.layout.keys:
+                return False
+        if isinstance(other, Mapping):
+            return len(other) == len(self.layout.keys) and self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        static, positions, values = self.layout.static, self.layout.positions, self.values
+        return {
+            key: static[key] if positions[key] < 0 else values[positions[key]]
+            for key in self.layout.keys
+        }
+
+
+def static_details(values: Dict[str, Any]) -> Details:
+    """Details with no dynamic values, to be shared by every result that uses it."""
+    return DetailsLayout(tuple(values), values).bind()
+
+
+# Shared by every result of a rule whose `when` condition was not met
+CONDITION_NOT_MET = static_details({"reason": "condition_not_met"})
+
+
+@dataclass(frozen=True, slots=True)
 class RuleResult:
     name: str
     passed: bool
     severity: RuleSeverity
     message: Optional[str] = None
-    details: Optional[Dict[str, Any]] = None
+    # A Details (shared layout + per-result values) from the built-in rules;
+    # any other mapping is accepted too.
+    details: Optional[Mapping] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValidationSummary:
     valid: bool
     errors: List[RuleResult]
@@ -39,6 +128,67 @@ class ValidationSummary:
     successes: List[RuleResult]
 
 
+# ---------------------------------------------------------------------------
+# Shared result parts (row-wise evaluators and columnar evaluation)
+# ---------------------------------------------------------------------------
+
+def missing_field_result(name: str, field: str, severity: RuleSeverity) -> RuleResult:
+    """The result of an "if present" rule whose field is missing."""
+    return RuleResult(
+        name=name,
+        passed=True,
+        severity=severity,
+        message=None,
+        details=static_details({"reason": "field_missing_treated_as_pass", "field": field}),
+    )
+
+
+def value_comparison_layouts(
+    rule: "ValueComparisonRule",
+    threshold: Optional[float],
+) -> Tuple[DetailsLayout, DetailsLayout]:
+    """(non_numeric, compared) layouts; dynamic values are (raw,) and (value,)."""
+    return (
+        DetailsLayout(("reason", "field", "value"), {"reason": "non_numeric", "field": rule.field}),
+        DetailsLayout(
+            ("field", "value", "operator", "threshold"),
+            {"field": rule.field, "operator": rule.operator, "threshold": threshold},
+        ),
+    )
+
+
+def field_comparison_layouts(rule: "FieldComparisonRule") -> Tuple[DetailsLayout, DetailsLayout]:
+    """(non_numeric, compared) layouts; dynamic values are (left, right)."""
+    return (
+        DetailsLayout(
+            ("reason", "left_field", "left_value", "right_field", "right_value"),
+            {"reason": "non_numeric", "left_field": rule.left_field, "right_field": rule.right_field},
+        ),
+        DetailsLayout(
+            ("left_field", "left_value", "operator", "right_field", "right_value"),
+            {"left_field": rule.left_field, "operator": rule.operator, "right_field": rule.right_field},
+        ),
+    )
+
+
+def value_in_set_layout(rule: "ValueInSetRule") -> DetailsLayout:
+    """Dynamic values are (value,); `allowed_values` is shared, never copied."""
+    return DetailsLayout(
+        ("field", "value", "allowed_values"),
+        {"field": rule.field, "allowed_values": rule.allowed_values},
+    )
+
+
+# A compiled rule: everything that can be worked out from the rule definition
+# alone (split paths, compiled regexes, lookup sets, operator functions) is
+# captured once, leaving only per-application work inside the closure.
+Evaluator = Callable[[Dict[str, Any]], RuleResult]
+
+# Pass/fail only: the same decision as the Evaluator, without building a
+# RuleResult. The engine uses it when successes aren't reported.
+Check = Callable[[Dict[str, Any]], bool]
+
+
 # ---------------------------------------------------------------------------
 # Base Rule interface
 # ---------------------------------------------------------------------------
@@ -47,11 +197,30 @@ class Rule(ABC):
     name: str
     severity: RuleSeverity
     when: Optional[Condition]
+    # True if results depend on other applications of the batch (see app.rules.batch)
+    batch_scoped = False
 
     @abstractmethod
-    def apply(self, data: Dict[str, Any]) -> RuleResult:
+    def compile(self) -> Evaluator:
         ...
 
+    def compile_check(self) -> Check:
+        evaluate = self.compile()
+        return lambda data: evaluate(data).passed
+
+    @abstractmethod
+    def read_fields(self) -> List[str]:
+        """Paths the rule's check reads (excluding its `when` field)."""
+
+    def input_fields(self) -> List[str]:
+        """Every path that can change this rule's result, `when` included."""
+        fields = self.read_fields()
+        return [*fields, self.when.field] if self.when else fields
+
+    def apply(self, data: Dict[str, Any]) -> RuleResult:
+        # One-off evaluation; the engine compiles once and reuses the evaluator.
+        return self.compile()(data)
+
 
 # ---------------------------------------------------------------------------
 # Rule shapes (discriminated by "type" in YAML)
@@ -65,16 +234,30 @@ class PresenceRule(Rule):
     message: Optional[str] = None
     when: Optional[Condition] = None
 
-    def apply(self, data: Dict[str, Any]) -> RuleResult:
-        value = get_by_path(data, self.field)
-        passed = value not in (None, "")
-        return RuleResult(
-            name=self.name,
-            passed=passed,
-            severity=self.severity,
-            message=None if passed else self.message,
-            details={"field": self.field, "value": value},
-        )
+    def read_fields(self) -> List[str]:
+        return [self.field]
+
+    def compile(self) -> Evaluator:
+        name, field, severity, message = self.name, self.field, self.severity, self.message
+        parts = split_path(field)
+        layout = DetailsLayout(("field", "value"), {"field": field})
+
+        def evaluate(data: Dict[str, Any]) -> RuleResult:
+            value = get_by_parts(data, parts)
+            passed = value not in (None, "")
+            return RuleResult(
+                name=name,
+                passed=passed,
+                severity=severity,
+                message=None if passed else message,
+                details=Details(layout, (value,)),
+            )
+
+        return evaluate
+
+    def compile_check(self) -> Check:
+        parts = split_path(self.field)
+        return lambda data: get_by_parts(data, parts) not in (None, "")
 
 
 @dataclass
@@ -86,26 +269,43 @@ class StringMatchRule(Rule):
     message: Optional[str] = None
     when: Optional[Condition] = None
 
-    def apply(self, data: Dict[str, Any]) -> RuleResult:
-        value = get_by_path(data, self.field)
-        # "if present" semantics: missing value -> pass
-        if value is None:
+    def read_fields(self) -> List[str]:
+        return [self.field]
+
+    def compile(self) -> Evaluator:
+        name, field, severity, message = self.name, self.field, self.severity, self.message
+        pattern = self.pattern
+        parts = split_path(field)
+        fullmatch = re.compile(pattern).fullmatch
+        missing = missing_field_result(name, field, severity)
+        layout = DetailsLayout(("field", "value", "pattern"), {"field": field, "pattern": pattern})
+
+        def evaluate(data: Dict[str, Any]) -> RuleResult:
+            value = get_by_parts(data, parts)
+            # "if present" semantics: missing value -> pass
+            if value is None:
+                return missing
+
+            passed = fullmatch(str(value)) is not None
             return RuleResult(
-                name=self.name,
-                passed=True,
-                severity=self.severity,
-                message=None,
-                details={"reason": "field_missing_treated_as_pass", "field": self.field},
+                name=name,
+                passed=passed,
+                severity=severity,
+                message=None if passed else message,
+                details=Details(layout, (value,)),
             )
 
-        passed = re.fullmatch(self.pattern, str(value)) is not None
-        return RuleResult(
-            name=self.name,
-            passed=passed,
-            severity=self.severity,
-            message=None if passed else self.message,
-            details={"field": self.field, "value": value, "pattern": self.pattern},
-        )
+        return evaluate
+
+    def compile_check(self) -> Check:
+        parts = split_path(self.field)
+        fullmatch = re.compile(self.pattern).fullmatch
+
+        def check(data: Dict[str, Any]) -> bool:
+            value = get_by_parts(data, parts)
+            return value is None or fullmatch(str(value)) is not None
+
+        return check
 
 
 @dataclass
@@ -121,51 +321,72 @@ class ValueComparisonRule(Rule):
     message: Optional[str] = None
     when: Optional[Condition] = None
 
-    def apply(self, data: Dict[str, Any]) -> RuleResult:
-        raw = get_by_path(data, self.field)
-        if raw is None:
-            # Missing field: treat as pass; separate rules handle "required"
-            return RuleResult(
-                name=self.name,
-                passed=True,
-                severity=self.severity,
-                message=None,
-                details={"reason": "field_missing_treated_as_pass", "field": self.field},
-            )
+    def read_fields(self) -> List[str]:
+        return [self.field]
 
+    def compile(self) -> Evaluator:
+        name, field, severity, message = self.name, self.field, self.severity, self.message
+        operator = self.operator
+        parts = split_path(field)
+        compare = comparison_operator(operator)
         try:
-            v = float(raw)
-            threshold = float(self.value)
+            threshold: Optional[float] = float(self.value)
         except (TypeError, ValueError):
+            # A non-numeric threshold fails every present value as non_numeric
+            threshold = None
+        missing = missing_field_result(name, field, severity)
+        non_numeric, compared = value_comparison_layouts(self, threshold)
+
+        def evaluate(data: Dict[str, Any]) -> RuleResult:
+            raw = get_by_parts(data, parts)
+            if raw is None:
+                # Missing field: treat as pass; separate rules handle "required"
+                return missing
+
+            try:
+                v = float(raw)
+            except (TypeError, ValueError):
+                v = None
+            if v is None or threshold is None:
+                return RuleResult(
+                    name=name,
+                    passed=False,
+                    severity=severity,
+                    message=message,
+                    details=Details(non_numeric, (raw,)),
+                )
+
+            passed = compare(v, threshold)
             return RuleResult(
-                name=self.name,
-                passed=False,
-                severity=self.severity,
-                message=self.message,
-                details={"reason": "non_numeric", "field": self.field, "value": raw},
+                name=name,
+                passed=passed,
+                severity=severity,
+                message=None if passed else message,
+                details=Details(compared, (v,)),
             )
 
-        op_map = {
-            "lt": v < threshold,
-            "lte": v <= threshold,
-            "gt": v > threshold,
-            "gte": v >= threshold,
-            "eq": v == threshold,
-            "neq": v != threshold,
-        }
-        passed = op_map.get(self.operator, False)
-        return RuleResult(
-            name=self.name,
-            passed=passed,
-            severity=self.severity,
-            message=None if passed else self.message,
-            details={
-                "field": self.field,
-                "value": v,
-                "operator": self.operator,
-                "threshold": threshold,
-            },
-        )
+        return evaluate
+
+    def compile_check(self) -> Check:
+        parts = split_path(self.field)
+        compare = comparison_operator(self.operator)
+        try:
+            threshold: Optional[float] = float(self.value)
+        except (TypeError, ValueError):
+            threshold = None
+
+        def check(data: Dict[str, Any]) -> bool:
+            raw = get_by_parts(data, parts)
+            if raw is None:
+                return True
+            if threshold is None:
+                return False
+            try:
+                return compare(float(raw), threshold)
+            except (TypeError, ValueError):
+                return False
+
+        return check
 
 
 @dataclass
@@ -181,50 +402,56 @@ class FieldComparisonRule(Rule):
     message: Optional[str] = None
     when: Optional[Condition] = None
 
-    def apply(self, data: Dict[str, Any]) -> RuleResult:
-        left_raw = get_by_path(data, self.left_field)
-        right_raw = get_by_path(data, self.right_field)
-
-        try:
-            left_val = float(left_raw)
-            right_val = float(right_raw)
-        except (TypeError, ValueError):
+    def read_fields(self) -> List[str]:
+        return [self.left_field, self.right_field]
+
+    def compile(self) -> Evaluator:
+        name, severity, message = self.name, self.severity, self.message
+        left_field, right_field, operator = self.left_field, self.right_field, self.operator
+        left_parts, right_parts = split_path(left_field), split_path(right_field)
+        compare = comparison_operator(operator)
+        non_numeric, compared = field_comparison_layouts(self)
+
+        def evaluate(data: Dict[str, Any]) -> RuleResult:
+            left_raw = get_by_parts(data, left_parts)
+            right_raw = get_by_parts(data, right_parts)
+
+            try:
+                left_val = float(left_raw)
+                right_val = float(right_raw)
+            except (TypeError, ValueError):
+                return RuleResult(
+                    name=name,
+                    passed=False,
+                    severity=severity,
+                    message=message,
+                    details=Details(non_numeric, (left_raw, right_raw)),
+                )
+
+            passed = compare(left_val, right_val)
             return RuleResult(
-                name=self.name,
-                passed=False,
-                severity=self.severity,
-                message=self.message,
-                details={
-                    "reason": "non_numeric",
-                    "left_field": self.left_field,
-                    "left_value": left_raw,
-                    "right_field": self.right_field,
-                    "right_value": right_raw,
-                },
+                name=name,
+                passed=passed,
+                severity=severity,
+                message=None if passed else message,
+                details=Details(compared, (left_val, right_val)),
             )
 
-        op_map = {
-            "lt": left_val < right_val,
-            "lte": left_val <= right_val,
-            "gt": left_val > right_val,
-            "gte": left_val >= right_val,
-            "eq": left_val == right_val,
-            "neq": left_val != right_val,
-        }
-        passed = op_map.get(self.operator, False)
-        return RuleResult(
-            name=self.name,
-            passed=passed,
-            severity=self.severity,
-            message=None if passed else self.message,
-            details={
-                "left_field": self.left_field,
-                "left_value": left_val,
-                "operator": self.operator,
-                "right_field": self.right_field,
-                "right_value": right_val,
-            },
-        )
+        return evaluate
+
+    def compile_check(self) -> Check:
+        left_parts, right_parts = split_path(self.left_field), split_path(self.right_field)
+        compare = comparison_operator(self.operator)
+
+        def check(data: Dict[str, Any]) -> bool:
+            try:
+                left_val = float(get_by_parts(data, left_parts))
+                right_val = float(get_by_parts(data, right_parts))
+            except (TypeError, ValueError):
+                return False
+            return compare(left_val, right_val)
+
+        return check
 
 
 @dataclass
@@ -236,20 +463,58 @@ class ValueInSetRule(Rule):
     message: Optional[str] = None
     when: Optional[Condition] = None
 
-    def apply(self, data: Dict[str, Any]) -> RuleResult:
-        value = get_by_path(data, self.field)
-        passed = value in self.allowed_values
-        return RuleResult(
-            name=self.name,
-            passed=passed,
-            severity=self.severity,
-            message=None if passed else self.message,
-            details={
-                "field": self.field,
-                "value": value,
-                "allowed_values": self.allowed_values,
-            },
-        )
+    def read_fields(self) -> List[str]:
+        return [self.field]
+
+    def compile(self) -> Evaluator:
+        name, field, severity, message = self.name, self.field, self.severity, self.message
+        allowed_values = self.allowed_values
+        parts = split_path(field)
+        try:
+            allowed_set: Optional[frozenset] = frozenset(allowed_values)
+        except TypeError:
+            # Unhashable members (e.g. nested lists) can only be scanned
+            allowed_set = None
+        layout = value_in_set_layout(self)
+
+        def evaluate(data: Dict[str, Any]) -> RuleResult:
+            value = get_by_parts(data, parts)
+            if allowed_set is None:
+                passed = value in allowed_values
+            else:
+                try:
+                    passed = value in allowed_set
+                except TypeError:
+                    # Unhashable value (dict/list): fall back to the list scan
+                    passed = value in allowed_values
+            return RuleResult(
+                name=name,
+                passed=passed,
+                severity=severity,
+                message=None if passed else message,
+                details=Details(layout, (value,)),
+            )
+
+        return evaluate
+
+    def compile_check(self) -> Check:
+        allowed_values = self.allowed_values
+        parts = split_path(self.field)
+        try:
+            allowed_set: Optional[frozenset] = frozenset(allowed_values)
+        except TypeError:
+            allowed_set = None
+
+        def check(data: Dict[str, Any]) -> bool:
+            value = get_by_parts(data, parts)
+            if allowed_set is not None:
+                try:
+                    return value in allowed_set
+                except TypeError:
+                    pass
+            return value in allowed_values
+
+        return check
 
 
 @dataclass
@@ -263,24 +528,97 @@ class RequiresRule(Rule):
     message: Optional[str] = None
     when: Optional[Condition] = None
 
-    def apply(self, data: Dict[str, Any]) -> RuleResult:
-        missing: List[str] = []
-        for path in self.required_fields:
-            val = get_by_path(data, path)
-            if val in (None, ""):
-                missing.append(path)
+    def read_fields(self) -> List[str]:
+        return list(self.required_fields)
+
+    def compile(self) -> Evaluator:
+        name, severity, message = self.name, self.severity, self.message
+        required = [(path, split_path(path)) for path in self.required_fields]
+        satisfied = RuleResult(name=name, passed=True, severity=severity)
+        layout = DetailsLayout(("missing_fields",))
+
+        def evaluate(data: Dict[str, Any]) -> RuleResult:
+            missing: List[str] = []
+            for path, parts in required:
+                val = get_by_parts(data, parts)
+                if val in (None, ""):
+                    missing.append(path)
+
+            if not missing:
+                return satisfied
+            return RuleResult(
+                name=name,
+                passed=False,
+                severity=severity,
+                message=message,
+                details=Details(layout, (missing,)),
+            )
+
+        return evaluate
 
-        passed = not missing
+    def compile_check(self) -> Check:
+        required = [split_path(path) for path in self.required_fields]
+        return lambda data: all(get_by_parts(data, parts) not in (None, "") for parts in required)
+
+
+@dataclass
+class UniqueInBatchRule(Rule):
+    """
+    Fails when a value of any of `fields` already appeared, in any of them,
+    in an earlier application of the same batch (see app.rules.batch). Empty
+    values are ignored, as are repeats within one application; outside a
+    batch the rule passes. Details name the fields, never their values.
+    """
+    name: str
+    fields: List[str]
+    severity: RuleSeverity = RuleSeverity.ERROR
+    message: Optional[str] = None
+    when: Optional[Condition] = None
+
+    batch_scoped = True
+
+    def read_fields(self) -> List[str]:
+        return list(self.fields)
+
+    def layout(self) -> DetailsLayout:
+        """Dynamic values are (duplicate_fields,)."""
+        return DetailsLayout(("fields", "duplicate_fields"), {"fields": self.fields})
+
+    def failure(self, duplicates: List[str], layout: Optional[DetailsLayout] = None) -> RuleResult:
+        """The result for an application whose `duplicates` fields were seen before."""
         return RuleResult(
             name=self.name,
-            passed=passed,
+            passed=False,
             severity=self.severity,
-            message=None if passed else self.message,
-            details={"missing_fields": missing} if not passed else None,
+            message=self.message,
+            details=Details(layout or self.layout(), (duplicates,)),
         )
 
-
-# Transform rules don’t produce validation results; they mutate data.
+    def compile(self) -> Evaluator:
+        name, severity, failure = self.name, self.severity, self.failure
+        fields = [(path, split_path(path)) for path in self.fields]
+        layout = self.layout()
+        unique = RuleResult(name=name, passed=True, severity=severity, details=Details(layout, ([],)))
+
+        def evaluate(data: Dict[str, Any]) -> RuleResult:
+            scope = active_scope()
+            if scope is None:
+                return unique
+            values = []
+            for path, parts in fields:
+                value = get_by_parts(data, parts)
+                if value not in (None, ""):
+                    values.append((path, value))
+            duplicates = scope.seen(name, data, values) if values else []
+            if not duplicates:
+                return unique
+            return failure(duplicates, layout)
+
+        return evaluate
+
+
+# Transform rules don’t produce validation results; they derive fields
+# that rules can read (computed lazily, never written into the payload).
 @dataclass
 class TransformRule:
     name: str
@@ -0,0 +1,182 @@
+"""
+Reading validated pydantic models without dumping them.
+
+`RulesEngine.validate` works on nested dicts, so callers used to pass
+`model.model_dump()`: a full copy of every field, most of which no rule
+reads. A ModelProjection copies out only the paths a rule set reads (rule
+fields, `when` fields, transform inputs), straight from the model's
+attributes. On each of those paths it holds exactly what `model_dump()`
+would, so results are unchanged.
+
+The projection is built fresh for every call and belongs to the evaluation,
+which may write derived fields into it directly (`owned=True`) instead of
+into copies.
+"""
+import datetime
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+
+# Values model_dump() returns as they are
+_SCALARS = frozenset({str, int, float, bool, type(None), datetime.date, datetime.datetime})
+
+# Path trie: part -> subtree, or None where the whole value is read
+_Node = Dict[str, Optional["_Node"]]
+
+
+def _plain(value: Any) -> Any:
+    """What model_dump() makes of a field value: models become dicts, containers are copied."""
+    if type(value) in _SCALARS:
+        return value
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+    return value
+
+
+def _dumps_attributes(model_class: type) -> bool:
+    """True if model_dump() of this class is just its field values (plus extras)."""
+    decorators = model_class.__pydantic_decorators__
+    return not (
+        decorators.field_serializers
+        or decorators.model_serializers
+        or decorators.computed_fields
+        or any(field.exclude for field in model_class.model_fields.values())
+    )
+
+
+def _static_model(model_class: type, field: str) -> Optional[type]:
+    """The one model class a field can hold (besides None), if its class is read attribute-wise."""
+    annotation = model_class.model_fields[field].annotation
+    candidates = get_args(annotation) if get_origin(annotation) is Union else (annotation,)
+    models = [c for c in candidates if isinstance(c, type) and issubclass(c, BaseModel)]
+    if len(models) == 1 and _reads_attributes(models[0]):
+        return models[0]
+    return None
+
+
+def _reads_attributes(model_class: type) -> bool:
+    return _dumps_attributes(model_class) and model_class.model_config.get("extra") != "allow"
+
+
+class ModelProjection:
+    """
+    Builds, for one set of paths, the nested dict that `model_dump()` would
+    give restricted to those paths. Paths under another path are covered by
+    it.
+
+    For each top-level model class a straight-line function is compiled on
+    first use: attribute reads down the statically known nested models, with
+    the general walker (`_project`) only where the value isn't the expected
+    model. The walker resolves each (class, subtree) it meets once, too.
+    """
+    __slots__ = ("_tree", "_builders", "_compiled")
+
+    def __init__(self, paths: Iterable[Tuple[str, ...]]):
+        tree: _Node = {}
+        # Shortest first, so a path read whole is in place before any path under it
+        for parts in sorted(set(paths), key=len):
+            if not parts:
+                continue
+            node: Optional[_Node] = tree
+            for part in parts[:-1]:
+                if node is None:
+                    break
+                node = node.setdefault(part, {})
+            if node is not None and parts[-1] not in node:
+                node[parts[-1]] = None
+        self._tree = tree
+        self._builders: Dict[Tuple[type, int], Callable[[Any], Any]] = {}
+        self._compiled: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+    def __call__(self, model: Any) -> Dict[str, Any]:
+        project = self._compiled.get(type(model))
+        if project is None:
+            project = self._compiled[type(model)] = self._compile(type(model))
+        return project(model)
+
+    def _compile(self, model_class: type) -> Callable[[Any], Dict[str, Any]]:
+        if not (isinstance(model_class, type) and issubclass(model_class, BaseModel)) or not _reads_attributes(model_class):
+            def walk(model: Any) -> Dict[str, Any]:
+                projected = self._project(model, self._tree)
+                return projected if isinstance(projected, dict) else {}
+            return walk
+
+        lines = ["def project(model):"]
+        namespace: Dict[str, Any] = {"SCALARS": _SCALARS, "plain": _plain, "walk": self._project}
+        names = count()
+
+        def emit_model(source: str, cls: type, node: _Node, out: str, depth: int) -> None:
+            pad = "    " * depth
+            fields = f"f{next(names)}"
+            lines.append(f"{pad}{out} = {{}}")
+            lines.append(f"{pad}{fields} = {source}.__dict__")
+            for key, child in node.items():
+                if key not in cls.model_fields:
+                    continue  # not in the dump either
+                value = f"x{next(names)}"
+                lines.append(f"{pad}if {key!r} in {fields}:")
+                lines.append(f"{pad}    {value} = {fields}[{key!r}]")
+                if child is None:
+                    lines.append(f"{pad}    {out}[{key!r}] = {value} if type({value}) in SCALARS else plain({value})")
+                    continue
+                subtree = f"NODE{next(names)}"
+                namespace[subtree] = child
+                nested = _static_model(cls, key)
+                if nested is None:
+                    lines.append(f"{pad}    {out}[{key!r}] = walk({value}, {subtree})")
+                    continue
+                expected = f"MODEL{next(names)}"
+                namespace[expected] = nested
+                inner = f"o{next(names)}"
+                lines.append(f"{pad}    if type({value}) is {expected}:")
+                emit_model(value, nested, child, inner, depth + 2)
+                lines.append(f"{pad}        {out}[{key!r}] = {inner}")
+                lines.append(f"{pad}    else:")
+                lines.append(f"{pad}        {out}[{key!r}] = walk({value}, {subtree})")
+
+        emit_model("model", model_class, self._tree, "out", 1)
+        lines.append("    return out")
+        exec(compile("\n".join(lines) + "\n", f"<projection of {model_class.__qualname__}>", "exec"), namespace)
+        return namespace["project"]
+
+    def _project(self, value: Any, node: Optional[_Node]) -> Any:
+        if node is None:
+            return _plain(value)
+        builder = self._builders.get((type(value), id(node)))
+        if builder is None:
+            builder = self._builders[(type(value), id(node))] = self._builder(type(value), node)
+        return builder(value)
+
+    def _builder(self, kind: type, node: _Node) -> Callable[[Any], Any]:
+        items = tuple(node.items())
+        project = self._project
+
+        def from_mapping(values: Dict[str, Any]) -> Dict[str, Any]:
+            out = {}
+            for key, child in items:
+                if key in values:
+                    value = values[key]
+                    out[key] = value if child is None and type(value) in _SCALARS else project(value, child)
+            return out
+
+        if issubclass(kind, BaseModel):
+            if not _dumps_attributes(kind):
+                return lambda model: from_mapping(model.model_dump())
+            if kind.model_config.get("extra") == "allow":
+                def from_model(model: BaseModel) -> Dict[str, Any]:
+                    extra = model.__pydantic_extra__
+                    return from_mapping({**model.__dict__, **extra} if extra else model.__dict__)
+                return from_model
+            return lambda model: from_mapping(model.__dict__)
+        if issubclass(kind, dict):
+            return from_mapping
+        # Not a container: the paths below it don't exist, as in the dump
+        return _plain
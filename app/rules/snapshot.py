@@ -0,0 +1,110 @@
+"""
+Pre-validated rule-set snapshots.
+
+A snapshot is a compact JSON document holding every rule of a rules YAML
+file after it has been parsed and validated by `rule_from_dict`, normalized
+to the same discriminated-dict shape, together with the SHA-256 of the
+source YAML. Loading one skips YAML parsing entirely; the engine only uses
+it when the hash still matches the YAML next to it.
+"""
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from app.rules.models import (
+    FieldComparisonRule,
+    PresenceRule,
+    RequiresRule,
+    Rule,
+    RuleSeverity,
+    StringMatchRule,
+    TransformRule,
+    UniqueInBatchRule,
+    ValueComparisonRule,
+    ValueInSetRule,
+)
+
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+RULE_TYPES = {
+    PresenceRule: "presence",
+    StringMatchRule: "string_match",
+    ValueComparisonRule: "value_comparison",
+    FieldComparisonRule: "field_comparison",
+    ValueInSetRule: "value_in_set",
+    RequiresRule: "requires",
+    UniqueInBatchRule: "unique_in_batch",
+    TransformRule: "transform",
+}
+
+
+def rule_to_dict(rule: Union[Rule, TransformRule]) -> Dict[str, Any]:
+    """Inverse of `rule_from_dict`: a rule back in its YAML dict shape."""
+    rtype = RULE_TYPES.get(type(rule))
+    if rtype is None:
+        raise ValueError(f"Rule {type(rule).__name__} cannot be snapshotted")
+
+    # Every declared field, None included: a None may be the rule's operand
+    raw: Dict[str, Any] = {"type": rtype}
+    for f in fields(rule):  # type: ignore[arg-type]
+        value = getattr(rule, f.name)
+        if isinstance(value, RuleSeverity):
+            value = value.value
+        elif f.name == "when" and value is not None:
+            value = {"field": value.field, "equals": value.equals}
+        raw[f.name] = value
+    return raw
+
+
+def snapshot_path_for(rules_path: Union[str, Path]) -> Path:
+    """`config/rules.yaml` -> `config/rules.snapshot.json`."""
+    rules_path = Path(rules_path)
+    return rules_path.with_name(rules_path.stem + SNAPSHOT_SUFFIX)
+
+
+def build_snapshot(
+    rules: List[Union[Rule, TransformRule]],
+    source_sha256: str,
+) -> Dict[str, Any]:
+    raw_rules = [rule_to_dict(rule) for rule in rules]
+    # YAML can express values JSON can't (dates, non-string keys, ...);
+    # refuse to write a snapshot that would not load back identically.
+    try:
+        round_tripped = json.loads(json.dumps(raw_rules))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Rules are not JSON-representable: {exc}") from exc
+    if round_tripped != raw_rules:
+        raise ValueError("Rules are not JSON-representable without loss")
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "source_sha256": source_sha256,
+        "rules": raw_rules,
+    }
+
+
+def write_snapshot(snapshot: Dict[str, Any], path: Union[str, Path]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+
+
+def read_snapshot(
+    path: Union[str, Path],
+    expected_sha256: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Load a snapshot, or return None if it is missing, unreadable, of another
+    format, or (when `expected_sha256` is given) built from different YAML.
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if expected_sha256 is not None and snapshot.get("source_sha256") != expected_sha256:
+        return None
+    return snapshot
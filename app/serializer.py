@@ -0,0 +1,215 @@
+"""
+Single-pass JSON encoding of ValidationSummary objects.
+
+Produces exactly the bytes `JSONResponse(summary_to_dict(summary))` would
+(stdlib json, `ensure_ascii=False`, `allow_nan=False`, compact separators)
+without building the intermediate dicts. Everything static about a rule --
+its name, severity, message and the `condition_not_met` entry -- is encoded
+once per engine, and the static part of each DetailsLayout (field names,
+patterns, allowed-value lists) once per layout. If orjson is installed it
+encodes dynamic list/dict detail values, but only where its output is
+provably identical (no floats, whose exponent formatting differs from
+`repr`).
+"""
+import json
+import math
+import weakref
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.rules.engine import RulesEngine
+from app.rules.models import (
+    CONDITION_NOT_MET,
+    Details,
+    DetailsLayout,
+    Rule,
+    RuleResult,
+    ValidationSummary,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+_encode_string: Callable[[str], str] = (
+    json.encoder.c_encode_basestring or json.encoder.py_encode_basestring  # type: ignore[attr-defined]
+)
+_encode_fallback = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, separators=(",", ":")
+).encode
+
+_FLOAT = float
+_INF = math.inf
+
+
+def _orjson_safe(value: Any, depth: int = 0) -> bool:
+    """True if orjson encodes `value` exactly like the stdlib (no floats, plain types)."""
+    t = type(value)
+    if t is str or t is bool or value is None:
+        return True
+    if t is int:
+        return -(2 ** 63) <= value < 2 ** 64
+    if depth > 16:
+        return False
+    if t is list or t is tuple:
+        return all(_orjson_safe(v, depth + 1) for v in value)
+    if t is dict:
+        return all(type(k) is str and _orjson_safe(v, depth + 1) for k, v in value.items())
+    return False
+
+
+def encode_value(value: Any) -> str:
+    """Encode one JSON value exactly like `json.dumps(..., ensure_ascii=False, allow_nan=False)`."""
+    t = type(value)
+    if t is str:
+        return _encode_string(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if t is int:
+        return int.__repr__(value)
+    if t is _FLOAT:
+        if value != value or value == _INF or value == -_INF:
+            raise ValueError("Out of range float values are not JSON compliant: " + repr(value))
+        return _FLOAT.__repr__(value)
+    if orjson is not None and (t is list or t is dict) and _orjson_safe(value):
+        return orjson.dumps(value).decode("utf-8")
+    return _encode_fallback(value)
+
+
+# ---------------------------------------------------------------------------
+# Per-rule pre-encoded fragments
+# ---------------------------------------------------------------------------
+
+def _layout_fragments(layout: DetailsLayout) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Per key: the encoded `"key":` and the encoded static value (None if dynamic)."""
+    fragments = layout.encoded
+    if fragments is None:
+        fragments = layout.encoded = tuple(
+            (
+                _encode_string(key) + ":",
+                encode_value(layout.static[key]) if layout.positions[key] < 0 else None,
+            )
+            for key in layout.keys
+        )
+    return fragments
+
+
+class _RuleFragments:
+    __slots__ = ("severity", "message", "failed_head", "passed_head", "skipped", "message_json")
+
+    def __init__(self, rule: Rule):
+        name, severity = _encode_string(rule.name), _encode_string(rule.severity.value)
+        self.severity = rule.severity
+        self.message = rule.message
+        self.message_json = encode_value(rule.message)
+        self.failed_head = '{"rule":' + name + ',"severity":' + severity + ',"message":'
+        self.passed_head = '{"rule":' + name + ',"passed":true,"severity":' + severity + ',"message":'
+        self.skipped = (
+            self.passed_head + 'null,"details":{"reason":"condition_not_met"}}'
+        )
+
+
+class SummaryEncoder:
+    """Encodes summaries produced by one rule set; build once per engine."""
+
+    def __init__(self, rules: List[Rule]):
+        self._rules: Dict[str, _RuleFragments] = {}
+        # detail key -> encoded key and colon, for plain dict details
+        self._keys: Dict[str, str] = {}
+        names = [rule.name for rule in rules]
+        for rule in rules:
+            if names.count(rule.name) > 1:
+                continue  # ambiguous by name: encoded generically
+            self._rules[rule.name] = _RuleFragments(rule)
+
+    def _details(self, details: Optional[Mapping]) -> str:
+        if details is None:
+            return "null"
+        if type(details) is Details:
+            values = iter(details.values)
+            return "{" + ",".join([
+                key + (static if static is not None else encode_value(next(values)))
+                for key, static in _layout_fragments(details.layout)
+            ]) + "}"
+        if type(details) is not dict:
+            return _encode_fallback(details)
+        keys = self._keys
+        try:
+            return "{" + ",".join([
+                keys[key] + encode_value(value) for key, value in details.items()
+            ]) + "}"
+        except KeyError:
+            pass
+        if not all(type(key) is str for key in details):
+            return _encode_fallback(details)
+        for key in details:
+            keys.setdefault(key, _encode_string(key) + ":")
+        return self._details(details)
+
+    def _failure(self, result: RuleResult) -> str:
+        fragments = self._rules.get(result.name)
+        if (
+            fragments is None
+            or result.severity is not fragments.severity
+            or (result.message is not None and result.message != fragments.message)
+        ):
+            head = (
+                '{"rule":' + encode_value(result.name)
+                + ',"severity":' + encode_value(result.severity.value)
+                + ',"message":' + encode_value(result.message)
+            )
+        else:
+            head = fragments.failed_head + (
+                "null" if result.message is None else fragments.message_json
+            )
+        return head + ',"details":' + self._details(result.details) + "}"
+
+    def _success(self, result: RuleResult) -> str:
+        fragments = self._rules.get(result.name)
+        if (
+            fragments is None
+            or result.passed is not True
+            or result.severity is not fragments.severity
+            or (result.message is not None and result.message != fragments.message)
+        ):
+            return (
+                '{"rule":' + encode_value(result.name)
+                + ',"passed":' + encode_value(result.passed)
+                + ',"severity":' + encode_value(result.severity.value)
+                + ',"message":' + encode_value(result.message)
+                + ',"details":' + self._details(result.details) + "}"
+            )
+        if result.details is CONDITION_NOT_MET and result.message is None:
+            return fragments.skipped
+        return (
+            fragments.passed_head
+            + ("null" if result.message is None else fragments.message_json)
+            + ',"details":' + self._details(result.details) + "}"
+        )
+
+    def encode(self, summary: ValidationSummary) -> bytes:
+        failure, success = self._failure, self._success
+        return (
+            '{"valid":' + ("true" if summary.valid else "false")
+            + ',"errors":[' + ",".join([failure(r) for r in summary.errors])
+            + '],"warnings":[' + ",".join([failure(r) for r in summary.warnings])
+            + '],"passed":[' + ",".join([success(r) for r in summary.successes])
+            + "]}"
+        ).encode("utf-8")
+
+
+_encoders: "weakref.WeakKeyDictionary[RulesEngine, SummaryEncoder]" = weakref.WeakKeyDictionary()
+
+
+def encoder_for(engine: RulesEngine) -> SummaryEncoder:
+    """The (cached) encoder for an engine's rule set."""
+    encoder = _encoders.get(engine)
+    if encoder is None:
+        encoder = _encoders[engine] = SummaryEncoder(engine.rules)
+    return encoder
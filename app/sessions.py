@@ -0,0 +1,74 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.rules.engine import ValidationState
+
+
+@dataclass
+class DeltaSession:
+    # Schema-validated application as submitted (before transforms)
+    application: Dict[str, Any]
+    state: ValidationState
+
+
+# ---------------------------------------------------------------------------
+# Session store for /validate/delta
+# ---------------------------------------------------------------------------
+
+class SessionStore:
+    """
+    Bounded, in-process store of validation sessions keyed by opaque
+    tokens. Least recently used sessions are evicted beyond `max_sessions`;
+    sessions idle for longer than `ttl_seconds` expire.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_seconds: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # token -> (expires_at, session), least recently used first
+        self._sessions: "OrderedDict[str, Tuple[float, DeltaSession]]" = OrderedDict()
+
+    def put(self, session: DeltaSession, replaces: Optional[str] = None) -> str:
+        """
+        Store `session` under a new token. Pass the token of the session it
+        was derived from as `replaces` to drop that one: a chain of edits
+        holds a single session, and its older tokens stop working.
+        """
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            if replaces is not None:
+                self._sessions.pop(replaces, None)
+            self._sessions[token] = (self._clock() + self.ttl_seconds, session)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return token
+
+    def get(self, token: str) -> Optional[DeltaSession]:
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            expires_at, session = entry
+            now = self._clock()
+            if expires_at <= now:
+                del self._sessions[token]
+                return None
+            self._sessions[token] = (now + self.ttl_seconds, session)
+            self._sessions.move_to_end(token)
+            return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
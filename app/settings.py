@@ -0,0 +1,108 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping, Optional
+
+
+DEFAULT_RULES_PATH = Path(__file__).parent / "config" / "rules.yaml"
+
+
+# ---------------------------------------------------------------------------
+# Service settings (read from FAFSA_* environment variables)
+# ---------------------------------------------------------------------------
+
+def _env_bool(environ: Mapping[str, str], key: str, default: bool) -> bool:
+    raw = environ.get(key)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(environ: Mapping[str, str], key: str, default: int) -> int:
+    raw = environ.get(key)
+    return default if raw is None else int(raw)
+
+
+def _env_float(environ: Mapping[str, str], key: str, default: float) -> float:
+    raw = environ.get(key)
+    return default if raw is None else float(raw)
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Rules file and hot-reload (poll interval in seconds; 0 disables polling)
+    rules_path: Path = DEFAULT_RULES_PATH
+    rules_watch_interval: float = 5.0
+    # Engine backend: "interpreted" or "codegen" (see app.rules.codegen)
+    rules_backend: str = "interpreted"
+
+    # Per-award-year rule sets (<award year>.yaml files, selected with
+    # ?award_year= or X-Award-Year), loaded on demand into a bounded LRU
+    rules_dir: Optional[Path] = None
+    rules_max_loaded: int = 4
+    rules_max_loaded_bytes: int = 256 * 1024 * 1024
+
+    # Candidate rules evaluated in the background on 1 in N /validate
+    # requests and compared with the primary engine (unset disables)
+    shadow_rules_path: Optional[Path] = None
+    shadow_sample_every: int = 10
+    shadow_queue: int = 1000
+
+    # Shared secret for /admin endpoints (X-Admin-Token); unset leaves them open
+    admin_token: Optional[str] = None
+
+    # Engine instrumentation exposed on /metrics
+    metrics_enabled: bool = True
+    metrics_sample_every: int = 16
+
+    # /validate result cache (off by default); TTL in seconds
+    result_cache_enabled: bool = False
+    result_cache_max_entries: int = 10_000
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_ttl: float = 300.0
+
+    # Share one evaluation among concurrent identical /validate requests
+    single_flight_enabled: bool = True
+
+    # /validate evaluation pool ("thread" or "process") and admission queue;
+    # requests beyond workers + queue get 503 with Retry-After (seconds)
+    validate_executor: str = "thread"
+    validate_workers: int = os.cpu_count() or 1
+    validate_queue: int = 64
+    validate_retry_after: int = 1
+
+    # /validate/delta sessions; idle TTL in seconds
+    delta_max_sessions: int = 10_000
+    delta_session_ttl: float = 900.0
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "Settings":
+        return cls(
+            rules_path=Path(environ.get("FAFSA_RULES_PATH", cls.rules_path)),
+            rules_watch_interval=_env_float(environ, "FAFSA_RULES_WATCH_INTERVAL", cls.rules_watch_interval),
+            rules_backend=environ.get("FAFSA_RULES_BACKEND", cls.rules_backend),
+            rules_dir=Path(environ["FAFSA_RULES_DIR"]) if environ.get("FAFSA_RULES_DIR") else None,
+            rules_max_loaded=_env_int(environ, "FAFSA_RULES_MAX_LOADED", cls.rules_max_loaded),
+            rules_max_loaded_bytes=_env_int(environ, "FAFSA_RULES_MAX_LOADED_BYTES", cls.rules_max_loaded_bytes),
+            shadow_rules_path=(
+                Path(environ["FAFSA_SHADOW_RULES_PATH"]) if environ.get("FAFSA_SHADOW_RULES_PATH") else None
+            ),
+            shadow_sample_every=_env_int(environ, "FAFSA_SHADOW_SAMPLE_EVERY", cls.shadow_sample_every),
+            shadow_queue=_env_int(environ, "FAFSA_SHADOW_QUEUE", cls.shadow_queue),
+            admin_token=environ.get("FAFSA_ADMIN_TOKEN") or None,
+            metrics_enabled=_env_bool(environ, "FAFSA_METRICS_ENABLED", cls.metrics_enabled),
+            metrics_sample_every=_env_int(environ, "FAFSA_METRICS_SAMPLE_EVERY", cls.metrics_sample_every),
+            result_cache_enabled=_env_bool(environ, "FAFSA_RESULT_CACHE_ENABLED", cls.result_cache_enabled),
+            result_cache_max_entries=_env_int(
+                environ, "FAFSA_RESULT_CACHE_MAX_ENTRIES", cls.result_cache_max_entries
+            ),
+            result_cache_max_bytes=_env_int(environ, "FAFSA_RESULT_CACHE_MAX_BYTES", cls.result_cache_max_bytes),
+            result_cache_ttl=_env_float(environ, "FAFSA_RESULT_CACHE_TTL", cls.result_cache_ttl),
+            single_flight_enabled=_env_bool(environ, "FAFSA_SINGLE_FLIGHT_ENABLED", cls.single_flight_enabled),
+            validate_executor=environ.get("FAFSA_VALIDATE_EXECUTOR", cls.validate_executor),
+            validate_workers=_env_int(environ, "FAFSA_VALIDATE_WORKERS", cls.validate_workers),
+            validate_queue=_env_int(environ, "FAFSA_VALIDATE_QUEUE", cls.validate_queue),
+            validate_retry_after=_env_int(environ, "FAFSA_VALIDATE_RETRY_AFTER", cls.validate_retry_after),
+            delta_max_sessions=_env_int(environ, "FAFSA_DELTA_MAX_SESSIONS", cls.delta_max_sessions),
+            delta_session_ttl=_env_float(environ, "FAFSA_DELTA_SESSION_TTL", cls.delta_session_ttl),
+        )
@@ -0,0 +1,225 @@
+import itertools
+import json
+import logging
+import queue
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.rules.engine import RulesEngine
+from app.rules.instrumentation import format_metric
+from app.rules.models import EvaluationMode, ValidationSummary
+
+
+logger = logging.getLogger(__name__)
+
+DIFF_KINDS = ("new_failures", "resolved_failures", "severity_changes")
+
+# (validated payload, mode, primary /validate body)
+_Job = Tuple[BaseModel, EvaluationMode, bytes]
+
+
+def _failures_from_body(body: bytes) -> Tuple[bool, Dict[str, str]]:
+    """(valid, rule -> severity of each failure) from a rendered /validate body."""
+    parsed = json.loads(body)
+    failures = {item["rule"]: item["severity"] for item in (*parsed["errors"], *parsed["warnings"])}
+    return parsed["valid"], failures
+
+
+def _failures_from_summary(summary: ValidationSummary) -> Dict[str, str]:
+    return {result.name: result.severity.value for result in (*summary.errors, *summary.warnings)}
+
+
+# ---------------------------------------------------------------------------
+# Aggregated differences
+# ---------------------------------------------------------------------------
+
+class ShadowDiff:
+    """Per-rule counts of how the candidate's outcomes differ from the primary's."""
+
+    def __init__(self) -> None:
+        self.compared = 0
+        self.identical = 0
+        self.became_invalid = 0
+        self.became_valid = 0
+        self.rules: Dict[str, Dict[str, int]] = {}
+
+    def _rule(self, name: str) -> Dict[str, int]:
+        counts = self.rules.get(name)
+        if counts is None:
+            counts = self.rules[name] = dict.fromkeys(DIFF_KINDS, 0)
+        return counts
+
+    def add(
+        self,
+        primary_valid: bool,
+        primary: Dict[str, str],
+        candidate_valid: bool,
+        candidate: Dict[str, str],
+    ) -> None:
+        self.compared += 1
+        if primary == candidate and primary_valid == candidate_valid:
+            self.identical += 1
+            return
+        if primary_valid and not candidate_valid:
+            self.became_invalid += 1
+        elif candidate_valid and not primary_valid:
+            self.became_valid += 1
+        # A rule missing from one side counts as not failing there
+        for name in primary.keys() | candidate.keys():
+            before, after = primary.get(name), candidate.get(name)
+            if before == after:
+                continue
+            if before is None:
+                self._rule(name)["new_failures"] += 1
+            elif after is None:
+                self._rule(name)["resolved_failures"] += 1
+            else:
+                self._rule(name)["severity_changes"] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "compared": self.compared,
+            "identical": self.identical,
+            "became_invalid": self.became_invalid,
+            "became_valid": self.became_valid,
+            "rules": {name: dict(counts) for name, counts in sorted(self.rules.items())},
+        }
+
+
+# ---------------------------------------------------------------------------
+# Background shadow evaluation
+# ---------------------------------------------------------------------------
+
+class ShadowEvaluator:
+    """
+    Runs a candidate engine on 1 in `sample_every` offered /validate
+    requests and compares its failures with what the primary engine
+    returned.
+
+    `offer` only counts and enqueues; evaluation happens on one background
+    thread fed by a queue of at most `max_queue` jobs. When the queue is
+    full the sample is dropped (and counted), so the request path never
+    waits on shadow work.
+
+    FAIL_FAST requests are skipped (and counted): their bodies hold only
+    the first failure, so a comparison would report rules failing on both
+    sides as new or resolved.
+    """
+
+    def __init__(self, candidate: RulesEngine, sample_every: int = 10, max_queue: int = 1000):
+        if sample_every < 1 or max_queue < 1:
+            raise ValueError("sample_every and max_queue must be >= 1")
+        self.sample_every = sample_every
+        self._candidate = candidate
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=max_queue)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._diff = ShadowDiff()
+        self._thread: Optional[threading.Thread] = None
+        self.sampled = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.failures = 0
+
+    @property
+    def candidate(self) -> RulesEngine:
+        return self._candidate
+
+    def offer(self, payload: BaseModel, mode: EvaluationMode, primary_body: bytes) -> bool:
+        """Queue a sampled request for comparison; True if it was queued."""
+        if mode is EvaluationMode.FAIL_FAST:
+            with self._lock:
+                self.skipped += 1
+            return False
+        if next(self._counter) % self.sample_every:
+            return False
+        try:
+            self._queue.put_nowait((payload, mode, primary_body))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.sampled += 1
+        return True
+
+    def _compare(self, job: _Job) -> None:
+        payload, mode, primary_body = job
+        primary_valid, primary = _failures_from_body(primary_body)
+        summary = self._candidate.validate_model(payload, mode)
+        with self._lock:
+            self._diff.add(primary_valid, primary, summary.valid, _failures_from_summary(summary))
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._compare(job)
+            except Exception:
+                with self._lock:
+                    self.failures += 1
+                logger.exception("Shadow evaluation failed")
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="shadow-rules", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Finish the queued comparisons and stop the worker."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def reset(self, candidate: Optional[RulesEngine] = None) -> None:
+        """Start a new comparison, optionally against another candidate."""
+        with self._lock:
+            if candidate is not None:
+                self._candidate = candidate
+            self._diff = ShadowDiff()
+            self.sampled = self.dropped = self.skipped = self.failures = 0
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidate_version": self._candidate.version,
+                "sample_every": self.sample_every,
+                "sampled": self.sampled,
+                "dropped": self.dropped,
+                "skipped_fail_fast": self.skipped,
+                "failures": self.failures,
+                "queued": self._queue.qsize(),
+                **self._diff.to_dict(),
+            }
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            sampled, dropped, skipped, failures = self.sampled, self.dropped, self.skipped, self.failures
+            compared, identical = self._diff.compared, self._diff.identical
+        return "".join([
+            format_metric(
+                "fafsa_shadow_samples_total",
+                "counter",
+                "Requests sampled for shadow evaluation by outcome (fail_fast requests are skipped).",
+                [
+                    ({"outcome": "queued"}, sampled),
+                    ({"outcome": "dropped"}, dropped),
+                    ({"outcome": "skipped_fail_fast"}, skipped),
+                ],
+            ),
+            format_metric(
+                "fafsa_shadow_comparisons_total",
+                "counter",
+                "Shadow comparisons by outcome.",
+                [
+                    ({"outcome": "identical"}, identical),
+                    ({"outcome": "different"}, compared - identical),
+                    ({"outcome": "error"}, failures),
+                ],
+            ),
+        ])
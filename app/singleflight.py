@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+from datetime import date
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.rules.instrumentation import format_metric
+
+
+def single_flight_key(
+    body: bytes,
+    rules_version: Optional[str],
+    mode: str,
+    today: Optional[date] = None,
+) -> str:
+    """
+    Key an in-flight validation by raw request body, rule set and evaluation
+    mode. Pass `today` for date-dependent rule sets, as for result_cache_key.
+    """
+    day = today.isoformat() if today is not None else "-"
+    return f"{rules_version or '-'}:{mode}:{day}:{hashlib.sha256(body).hexdigest()}"
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical validations: the first caller for a key
+    starts the work, later callers with the same key await its result
+    instead of starting their own. The entry is dropped as soon as the work
+    finishes, so nothing outlives it (that is the result cache's job).
+
+    Runs on the event loop thread only, so no locking is needed. The work
+    runs as its own task: a caller that disconnects stops waiting but doesn't
+    cancel it for the others. Exceptions (e.g. ExecutorSaturated) reach every
+    caller sharing the work.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, "asyncio.Task[bytes]"] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable[bytes]]) -> bytes:
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            task = self._in_flight[key] = asyncio.ensure_future(work())
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: "asyncio.Task[bytes]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved even if every caller went away
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def render_prometheus(self) -> str:
+        return "".join([
+            format_metric(
+                "fafsa_single_flight_requests_total",
+                "counter",
+                "/validate requests that evaluated (leader) or shared an identical in-flight evaluation (coalesced).",
+                [({"role": "leader"}, self.leaders), ({"role": "coalesced"}, self.coalesced)],
+            ),
+            format_metric(
+                "fafsa_single_flight_in_flight",
+                "gauge",
+                "Distinct validations currently being evaluated.",
+                [({}, len(self._in_flight))],
+            ),
+        ])
@@ -0,0 +1,40 @@
+"""
+Run benchmark suites and write one JSON document per suite.
+
+    python -m benchmarks [SUITE ...] [--output-dir .benchmarks]
+
+Compare two runs (e.g. from two commits) with `python -m benchmarks.compare`.
+"""
+import argparse
+import importlib
+from pathlib import Path
+
+from benchmarks.harness import write_results
+
+
+SUITES = {
+    "micro": "benchmarks.bench_micro",
+    "engine": "benchmarks.bench_engine",
+    "asgi": "benchmarks.bench_asgi",
+    "startup": "benchmarks.bench_startup",
+    "serialization": "benchmarks.bench_serialization",
+    "memory": "benchmarks.bench_memory",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("suites", nargs="*", help=f"Suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--output-dir", default=".benchmarks", help="Directory for <suite>.json files")
+    args = parser.parse_args()
+    unknown = [suite for suite in args.suites if suite not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    for suite in args.suites or SUITES:
+        module = importlib.import_module(SUITES[suite])
+        write_results(suite, module.run(), str(Path(args.output_dir) / f"{suite}.json"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+In-process ASGI benchmark of the HTTP layer: the FastAPI app (lifespan,
+middleware, schema parsing, executor, serialization) driven through
+httpx's ASGI transport, so no sockets or server process are involved.
+
+Per rule-set scale it reports `/validate` latency percentiles for
+sequential requests, throughput with concurrent clients, and
+`/validate/batch` time per application.
+
+    python -m benchmarks.bench_asgi [--output .benchmarks/asgi.json]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import httpx
+import yaml
+
+from app.main import app
+from benchmarks.corpus import generate_payloads
+from benchmarks.harness import scaled_rules, write_results
+
+
+SCALES = (1, 100)
+REQUESTS = 2000
+CONCURRENCY = 16
+BATCH_SIZE = 100
+
+
+@contextmanager
+def _environment(**values: str) -> Iterator[None]:
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _latencies(name: str, samples: List[float], **extra: Any) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "name": name,
+        "number": len(samples),
+        "min_s": ordered[0],
+        "median_s": statistics.median(ordered),
+        "mean_s": statistics.fmean(ordered),
+        "p90_s": ordered[int(len(ordered) * 0.90)],
+        "p99_s": ordered[int(len(ordered) * 0.99)],
+        **extra,
+    }
+
+
+async def _run_scale(factor: int, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            extra = {"rules": len(app.state.rules_engine.rules)}
+            for payload in payloads[:50]:  # warm up
+                (await client.post("/validate", json=payload)).raise_for_status()
+
+            samples: List[float] = []
+            for payload in payloads:
+                start = time.perf_counter()
+                response = await client.post("/validate", json=payload)
+                samples.append(time.perf_counter() - start)
+                response.raise_for_status()
+            results.append(_latencies(f"POST /validate sequential x{factor}", samples, **extra))
+
+            queue = list(payloads)
+            samples = []
+
+            async def worker() -> None:
+                while queue:
+                    payload = queue.pop()
+                    start = time.perf_counter()
+                    response = await client.post("/validate", json=payload)
+                    samples.append(time.perf_counter() - start)
+                    response.raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+            elapsed = time.perf_counter() - start
+            results.append(_latencies(
+                f"POST /validate concurrency={CONCURRENCY} x{factor}", samples,
+                requests_per_s=len(samples) / elapsed, **extra,
+            ))
+
+            samples = []
+            for i in range(0, len(payloads) - BATCH_SIZE + 1, BATCH_SIZE):
+                start = time.perf_counter()
+                response = await client.post("/validate/batch", json=payloads[i:i + BATCH_SIZE])
+                samples.append((time.perf_counter() - start) / BATCH_SIZE)
+                response.raise_for_status()
+            results.append(_latencies(
+                f"POST /validate/batch per application x{factor}", samples,
+                batch_size=BATCH_SIZE, **extra,
+            ))
+    return results
+
+
+def run(scales=SCALES, requests: int = REQUESTS) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in scales:
+            rules_path = Path(tmp) / f"rules_x{factor}.yaml"
+            rules_path.write_text(yaml.safe_dump({"rules": scaled_rules(factor)}, sort_keys=False))
+            payloads = generate_payloads(max(BATCH_SIZE, requests // factor), seed=factor)
+            with _environment(
+                FAFSA_RULES_PATH=str(rules_path),
+                FAFSA_RULES_WATCH_INTERVAL="0",
+                FAFSA_RESULT_CACHE_ENABLED="false",
+                FAFSA_SINGLE_FLIGHT_ENABLED="false",
+            ):
+                results.extend(asyncio.run(_run_scale(factor, payloads)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+    write_results("asgi", run(), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Macro-benchmarks of `RulesEngine.validate` over synthetic corpora (see
+benchmarks.corpus) with the shipped rules scaled up to thousands of rules
+(see harness.scaled_rules). Times are per application; each sample
+validates the whole corpus once.
+
+    python -m benchmarks.bench_engine [--output .benchmarks/engine.json]
+"""
+import argparse
+from typing import Any, Dict, List
+
+from app.rules.engine import RulesEngine
+from app.rules.models import EvaluationMode
+from benchmarks.corpus import generate_payloads, to_records
+from benchmarks.harness import measure, scaled_rules, write_results
+
+
+SCALES = (1, 10, 100, 1000)
+CORPUS_SIZE = 1000
+
+
+def run(scales=SCALES, corpus_size: int = CORPUS_SIZE) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    corpus = to_records(generate_payloads(corpus_size, seed=17))
+    for factor in scales:
+        raw_rules = scaled_rules(factor)
+        engine = RulesEngine._from_raw_rules(raw_rules, metrics=None, version=None)
+        # Keep each sample to roughly the same amount of work
+        records = corpus[: max(10, corpus_size // factor)]
+        n = len(records)
+        extra = {"rules": len(engine.rules), "applications": n}
+        repeat = 5 if factor < 1000 else 3
+
+        generated = RulesEngine._from_raw_rules(raw_rules, metrics=None, version=None, backend="codegen")
+        for mode in EvaluationMode:
+            results.append(_per_application(measure(
+                f"validate[{mode.value}] x{factor}",
+                lambda: [engine.validate(r, mode) for r in records],
+                repeat=repeat, **extra,
+            ), n))
+            results.append(_per_application(measure(
+                f"validate[{mode.value}, codegen] x{factor}",
+                lambda: [generated.validate(r, mode) for r in records],
+                repeat=repeat, **extra,
+            ), n))
+        results.append(_per_application(measure(
+            f"validate_many x{factor}",
+            lambda: engine.validate_many(records), repeat=repeat, **extra,
+        ), n))
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            continue
+        results.append(_per_application(measure(
+            f"validate_many[columnar] x{factor}",
+            lambda: engine.validate_many(records, columnar=True), repeat=repeat, **extra,
+        ), n))
+    return results
+
+
+def _per_application(result: Dict[str, Any], n: int) -> Dict[str, Any]:
+    for key in ("min_s", "median_s", "mean_s"):
+        result[key] /= n
+    result["applications_per_s"] = 1 / result["median_s"]
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+    write_results("engine", run(), args.output)
+
+
+if __name__ == "__main__":
+    main()
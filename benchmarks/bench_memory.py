@@ -0,0 +1,125 @@
+"""
+Memory cost of holding batch results: `validate_many` over N applications
+with every summary kept alive, as a batch endpoint or the offline CLI does
+for a chunk. Each measurement runs in a fresh process and reports
+
+- `alloc_bytes_per_app` / `alloc_blocks_per_app`: live Python allocations
+  (tracemalloc) attributable to the results, per application;
+- `peak_traced_bytes_per_app`: peak traced memory during the batch, per
+  application (retained results plus transient garbage);
+- `peak_rss_delta_bytes`: growth of peak RSS while validating the batch.
+
+It also sizes the `unique_in_batch` index (app.rules.batch) for N distinct
+values: `index_bytes_per_key` for the exact table, the Bloom filter alone
+and the table behind a Bloom prefilter, against a Python set of the same
+digests.
+
+    python -m benchmarks.bench_memory [--output .benchmarks/memory.json]
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import tracemalloc
+from typing import Any, Dict, List
+
+from app.rules.batch import BatchScope, BloomKeySet, HashedKeySet, PrefilteredKeySet
+from app.rules.engine import RulesEngine
+from app.settings import DEFAULT_RULES_PATH
+from benchmarks.corpus import generate_payloads, to_records
+from benchmarks.harness import write_results
+
+
+BATCH_SIZES = (1000, 10000)
+
+
+def _rss_bytes() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _measure(n: int, columnar: bool) -> Dict[str, Any]:
+    engine = RulesEngine.from_yaml(DEFAULT_RULES_PATH)
+    records = to_records(generate_payloads(n))
+    engine.validate_many(records[:10], columnar=columnar)  # warm up lazy state
+
+    # Untraced first: tracemalloc's own bookkeeping would dominate RSS
+    rss_before = _rss_bytes()
+    summaries = engine.validate_many(records, columnar=columnar)
+    rss_delta = _rss_bytes() - rss_before
+    del summaries
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    summaries = engine.validate_many(records, columnar=columnar)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(s.size_diff for s in stats)
+    blocks = sum(s.count_diff for s in stats)
+    results = sum(len(s.errors) + len(s.warnings) + len(s.successes) for s in summaries)
+    return {
+        "name": f"validate_many[{'columnar' if columnar else 'row'}] n={n}",
+        "applications": n,
+        "results": results,
+        "alloc_bytes_per_app": size / n,
+        "alloc_blocks_per_app": blocks / n,
+        "bytes_per_result": size / results,
+        "peak_traced_bytes_per_app": (peak - baseline) / n,
+        "peak_rss_delta_bytes": rss_delta,
+    }
+
+
+def _measure_index(n: int) -> List[Dict[str, Any]]:
+    scope = BatchScope()
+    keys = [scope.digest(f"{i:09d}") for i in range(n)]
+    results = []
+    for name, build in (
+        ("set", set),
+        ("hashed", lambda: HashedKeySet()),
+        ("bloom p=0.001", lambda: BloomKeySet(n, 0.001)),
+        ("bloom p=0.01", lambda: BloomKeySet(n, 0.01)),
+        ("prefiltered p=0.001", lambda: PrefilteredKeySet(n, 0.001)),
+    ):
+        tracemalloc.start()
+        index = build()
+        for key in keys:
+            index.add(key)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append({
+            "name": f"unique_in_batch index[{name}] n={n}",
+            "keys": n,
+            "index_bytes_per_key": size / n,
+            "index_bytes_per_million_keys": size / n * 1_000_000,
+        })
+    return results
+
+
+def run(sizes=BATCH_SIZES) -> List[Dict[str, Any]]:
+    ctx = multiprocessing.get_context("spawn")
+    results: List[Dict[str, Any]] = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for n in sizes:
+            for columnar in (False, True):
+                try:
+                    results.append(pool.apply(_measure, (n, columnar)))
+                except ImportError:
+                    continue  # columnar needs numpy
+            results.extend(pool.apply(_measure_index, (n,)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+    write_results("memory", run(), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Micro-benchmarks of the engine's building blocks:
+
+- every rule type, compiled (`compile()` once, then the evaluator, as the
+  engine runs it) and one-off (`Rule.apply`, which compiles per call), on a
+  passing and a failing record;
+- `get_by_path` / `set_by_path` at several depths;
+- derived fields: each transform function alone and every live transform
+  of the shipped rule set on an evaluation view (what replaced the eager
+  `_apply_transforms` pass);
+- `RulesEngine.from_yaml` on the shipped rules.
+
+    python -m benchmarks.bench_micro [--output .benchmarks/micro.json]
+"""
+import argparse
+import copy
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from app.rules import helpers
+from app.rules.engine import RulesEngine, _View
+from app.rules.models import (
+    FieldComparisonRule,
+    PresenceRule,
+    RequiresRule,
+    Rule,
+    StringMatchRule,
+    ValueComparisonRule,
+    ValueInSetRule,
+)
+from app.settings import DEFAULT_RULES_PATH
+from benchmarks.corpus import STATE_CODES, generate_payloads, to_records
+from benchmarks.harness import measure, write_results
+
+
+NUMBER = 20_000
+
+# (rule, passing record, failing record) per rule type
+RULE_CASES: List[Tuple[Rule, Dict[str, Any], Dict[str, Any]]] = [
+    (
+        PresenceRule(name="presence", field="a.b"),
+        {"a": {"b": "x"}},
+        {"a": {"b": ""}},
+    ),
+    (
+        StringMatchRule(name="string_match", field="a.ssn", pattern="^[0-9]{9}$"),
+        {"a": {"ssn": "123456789"}},
+        {"a": {"ssn": "1234"}},
+    ),
+    (
+        ValueComparisonRule(name="value_comparison", field="a.income", operator="gte", value=0),
+        {"a": {"income": 100.0}},
+        {"a": {"income": -5.0}},
+    ),
+    (
+        FieldComparisonRule(name="field_comparison", left_field="h.college", operator="lte", right_field="h.size"),
+        {"h": {"college": 1, "size": 4}},
+        {"h": {"college": 5, "size": 4}},
+    ),
+    (
+        ValueInSetRule(name="value_in_set", field="state", allowed_values=list(STATE_CODES)),
+        {"state": "WY"},
+        {"state": "XX"},
+    ),
+    (
+        RequiresRule(name="requires", required_fields=["s.name", "s.ssn"]),
+        {"s": {"name": "x", "ssn": "1"}},
+        {"s": {"name": ""}},
+    ),
+]
+
+PATHS = ("a", "a.b.c", "a.b.c.d.e")
+
+
+def _nested(path: str) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    helpers.set_by_path(data, path, 1)
+    return data
+
+
+def run(number: int = NUMBER) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+
+    for rule, passing, failing in RULE_CASES:
+        evaluate = rule.compile()
+        for outcome, record in (("pass", passing), ("fail", failing)):
+            results.append(measure(
+                f"rule[{rule.name}] compiled {outcome}",
+                lambda: evaluate(record), number=number,
+            ))
+        results.append(measure(
+            f"rule[{rule.name}] apply fail",
+            lambda: rule.apply(failing), number=number // 10,
+        ))
+
+    for path in PATHS:
+        data = _nested(path)
+        depth = path.count(".") + 1
+        results.append(measure(
+            f"get_by_path depth={depth}",
+            lambda: helpers.get_by_path(data, path), number=number, depth=depth,
+        ))
+        results.append(measure(
+            f"set_by_path depth={depth}",
+            lambda: helpers.set_by_path(data, path, 2), number=number, depth=depth,
+        ))
+
+    today = date.today()
+    for name, func in helpers.TRANSFORM_REGISTRY.items():
+        args = ("2000-02-29", today) if name in helpers.DATE_DEPENDENT_TRANSFORMS else ("2000-02-29",)
+        results.append(measure(f"transform[{name}]", lambda: func(*args), number=number))
+
+    engine = RulesEngine.from_yaml(DEFAULT_RULES_PATH)
+    record = to_records(generate_payloads(1, invalid_rate=0))[0]
+    transforms, live = engine._compiled_transforms, engine._transform_graph.live
+    results.append(measure(
+        "transforms[live] on a view",
+        lambda: _View(record, transforms, today).run(live),
+        number=number, transforms=len(live),
+    ))
+    results.append(measure(
+        "transforms[live] on a deep copy (eager baseline)",
+        lambda: _View(copy.deepcopy(record), transforms, today).run(live),
+        number=number // 10, transforms=len(live),
+    ))
+
+    results.append(measure(
+        "RulesEngine.from_yaml shipped rules",
+        lambda: RulesEngine.from_yaml(DEFAULT_RULES_PATH), number=20,
+    ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+    write_results("micro", run(), args.output)
+
+
+if __name__ == "__main__":
+    main()
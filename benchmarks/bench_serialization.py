@@ -0,0 +1,79 @@
+"""
+Cost of rendering a /validate body: the previous path (build the response
+dicts, then `JSONResponse`) versus `render_summary` with the engine's
+pre-encoded `SummaryEncoder`. Both produce identical bytes; the benchmark
+asserts that before timing.
+
+    python -m benchmarks.bench_serialization [--output .benchmarks/serialization.json]
+"""
+import argparse
+from typing import Any, Dict, List
+
+from fastapi.responses import JSONResponse
+
+from app.responses import render_summary, summary_to_dict
+from app.rules.engine import RulesEngine
+from app.serializer import encoder_for, orjson
+from benchmarks.harness import measure, scaled_rules, write_results
+
+
+SCALES = (1, 10, 100)
+
+APPLICATIONS: Dict[str, Dict[str, Any]] = {
+    "valid": {
+        "studentInfo": {
+            "firstName": "John",
+            "lastName": "Doe",
+            "ssn": "123456789",
+            "dateOfBirth": "2000-01-01",
+        },
+        "dependencyStatus": "dependent",
+        "maritalStatus": "single",
+        "household": {"numberInHousehold": 4, "numberInCollege": 1},
+        "income": {"studentIncome": 15000, "parentIncome": 40000},
+        "stateOfResidence": "CA",
+        "spouseInfo": None,
+    },
+    "invalid": {
+        "studentInfo": {"firstName": "", "ssn": "12-34", "dateOfBirth": "2020-01-01"},
+        "dependencyStatus": "dependent",
+        "maritalStatus": "married",
+        "household": {"numberInHousehold": 1, "numberInCollege": 3},
+        "income": {"studentIncome": -10.5},
+        "stateOfResidence": "XX",
+    },
+}
+
+
+def run(scales=SCALES) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for factor in scales:
+        engine = RulesEngine._from_raw_rules(scaled_rules(factor), metrics=None, version=None)
+        encoder_for(engine)
+        number = max(10, 2000 // factor)
+        for label, application in APPLICATIONS.items():
+            summary = engine.validate(application)
+            baseline = JSONResponse(summary_to_dict(summary)).body
+            assert render_summary(summary, engine) == baseline, f"{label} x{factor}"
+
+            extra = {"rules": len(engine.rules), "bytes": len(baseline), "orjson": orjson is not None}
+            results.append(measure(
+                f"JSONResponse(summary_to_dict) {label} x{factor}",
+                lambda: JSONResponse(summary_to_dict(summary)).body, number=number, **extra,
+            ))
+            results.append(measure(
+                f"render_summary[encoder] {label} x{factor}",
+                lambda: render_summary(summary, engine), number=number, **extra,
+            ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+    write_results("serialization", run(), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cold-start cost of loading a rule set: YAML (pure-Python and libyaml
+loaders, as used by `RulesEngine.from_yaml`) versus a pre-built snapshot
+(`RulesEngine.load` with a fresh `rules.snapshot.json`).
+
+    python -m benchmarks.bench_startup [--output .benchmarks/startup.json]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from app.rules import engine as engine_module
+from app.rules.engine import RulesEngine
+from app.rules.snapshot import snapshot_path_for
+from benchmarks.harness import measure, scaled_rules, write_results
+
+
+SCALES = (1, 10, 100, 1000)
+
+
+def run(scales=SCALES) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in scales:
+            raw_rules = scaled_rules(factor)
+            rules_path = Path(tmp) / f"rules_x{factor}.yaml"
+            rules_path.write_text(yaml.safe_dump({"rules": raw_rules}, sort_keys=False))
+            RulesEngine.from_yaml(rules_path).write_snapshot(snapshot_path_for(rules_path))
+
+            repeat = 5 if factor < 1000 else 3
+            extra = {"rules": len(raw_rules)}
+
+            pure_loader = engine_module._YAMLLoader
+            engine_module._YAMLLoader = yaml.SafeLoader
+            try:
+                results.append(measure(
+                    f"from_yaml[pure-python] x{factor}",
+                    lambda: RulesEngine.from_yaml(rules_path), repeat=repeat, **extra,
+                ))
+            finally:
+                engine_module._YAMLLoader = pure_loader
+
+            if getattr(yaml, "CSafeLoader", None) is not None:
+                results.append(measure(
+                    f"from_yaml[libyaml] x{factor}",
+                    lambda: RulesEngine.from_yaml(rules_path), repeat=repeat, **extra,
+                ))
+            results.append(measure(
+                f"load[snapshot] x{factor}",
+                lambda: RulesEngine.load(rules_path), repeat=repeat, **extra,
+            ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+    write_results("startup", run(), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare two benchmark runs result by result.
+
+    python -m benchmarks.compare BASE NEW [--metric median_s] [--threshold 0.10]
+
+BASE and NEW are suite JSON files or directories of them (as written by
+`python -m benchmarks`, or benchmarks.loadtest). Results are matched by
+suite and name. Exits with status 1 when any result got worse by more
+than `threshold`, so CI can gate on it. Throughputs (`*_per_s`) are better
+when higher; every other metric (times, bytes, error rates) when lower.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def load(path: Path) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """(suite, result name) -> result, from a file or every *.json in a directory."""
+    files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+    results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for file in files:
+        document = json.loads(file.read_text())
+        for result in document.get("results", []):
+            results[(document["suite"], result["name"])] = result
+    return results
+
+
+def compare(
+    base: Dict[Tuple[str, str], Dict[str, Any]],
+    new: Dict[Tuple[str, str], Dict[str, Any]],
+    metric: str,
+) -> List[Tuple[str, str, float, float, float]]:
+    """(suite, name, base, new, relative change) for results present in both runs."""
+    rows = []
+    for key in sorted(base.keys() & new.keys()):
+        before: Optional[float] = base[key].get(metric)
+        after: Optional[float] = new[key].get(metric)
+        if before is None or after is None:
+            continue
+        if before:
+            change = (after - before) / before
+        else:
+            change = 0.0 if after == before else float("inf")
+        rows.append((*key, before, after, change))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__)
+    parser.add_argument("base", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--metric", default="median_s", help="Result field to compare (default: median_s)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative worsening (default: 0.10)")
+    args = parser.parse_args()
+
+    rows = compare(load(args.base), load(args.new), args.metric)
+    higher_is_better = args.metric.endswith("_per_s")
+    regressions = 0
+    for suite, name, before, after, change in rows:
+        flag = ""
+        if (-change if higher_is_better else change) > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{suite:<14} {name:<52} {before:14.6g} -> {after:14.6g} {change:+8.1%}{flag}")
+    print(f"{len(rows)} compared, {regressions} regressed by more than {args.threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
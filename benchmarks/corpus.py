@@ -0,0 +1,125 @@
+"""
+Synthetic application corpora, generated from a pydantic model's JSON
+schema (ApplicationData by default).
+
+The schema drives the structure: objects, required and optional
+properties, enums, nullable fields and formats. Fields the rules care about
+get realistic values from FIELD_VALUES; everything else is random data of
+the right type. A fraction of applications (`invalid_rate`) gets one field
+replaced by a value the shipped rules reject, so benchmarks exercise both
+passing and failing paths.
+"""
+import random
+import string
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from app.models import ApplicationData
+
+
+STATE_CODES = (
+    "AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH "
+    "NJ NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC"
+).split()
+
+# property name -> (valid value, invalid value) generators
+_Generator = Callable[[random.Random], Any]
+
+
+def _digits(n: int) -> _Generator:
+    return lambda rng: "".join(rng.choice(string.digits) for _ in range(n))
+
+
+def _birth_date(min_age: int, max_age: int) -> _Generator:
+    def generate(rng: random.Random) -> str:
+        days = rng.randint(min_age * 365 + 5, max_age * 365 - 5)
+        return (date.today() - timedelta(days=days)).isoformat()
+    return generate
+
+
+FIELD_VALUES: Dict[str, "tuple[_Generator, _Generator]"] = {
+    "ssn": (_digits(9), lambda rng: _digits(rng.choice([4, 8, 11]))(rng)),
+    "dateOfBirth": (_birth_date(16, 60), _birth_date(2, 13)),
+    "stateOfResidence": (lambda rng: rng.choice(STATE_CODES), lambda rng: rng.choice(["XX", "ca", "Cal"])),
+    "studentIncome": (lambda rng: round(rng.uniform(0, 60_000), 2), lambda rng: -round(rng.uniform(1, 500), 2)),
+    "parentIncome": (lambda rng: round(rng.uniform(0, 200_000), 2), lambda rng: -round(rng.uniform(1, 500), 2)),
+    "numberInHousehold": (lambda rng: rng.randint(3, 8), lambda rng: 1),
+    "numberInCollege": (lambda rng: rng.randint(0, 2), lambda rng: rng.randint(9, 12)),
+}
+
+
+class CorpusGenerator:
+    """Random payloads that follow `model`'s JSON schema."""
+
+    def __init__(
+        self,
+        model: Type[BaseModel] = ApplicationData,
+        seed: int = 0,
+        invalid_rate: float = 0.3,
+        null_rate: float = 0.2,
+    ):
+        self.schema = model.model_json_schema()
+        self.defs: Dict[str, Any] = self.schema.get("$defs", {})
+        self.rng = random.Random(seed)
+        self.invalid_rate = invalid_rate
+        self.null_rate = null_rate
+
+    def payload(self) -> Dict[str, Any]:
+        """One JSON-compatible payload (dates as ISO strings)."""
+        invalid: Optional[str] = None
+        if self.rng.random() < self.invalid_rate:
+            invalid = self.rng.choice(sorted(FIELD_VALUES))
+        return self._value(self.schema, None, invalid)
+
+    def _value(self, schema: Dict[str, Any], name: Optional[str], invalid: Optional[str]) -> Any:
+        rng = self.rng
+        if "$ref" in schema:
+            return self._value(self.defs[schema["$ref"].rsplit("/", 1)[-1]], name, invalid)
+        if "anyOf" in schema:
+            options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+            if len(options) < len(schema["anyOf"]) and rng.random() < self.null_rate:
+                return None
+            return self._value(rng.choice(options), name, invalid)
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+        if "const" in schema:
+            return schema["const"]
+
+        if name in FIELD_VALUES:
+            valid, bad = FIELD_VALUES[name]
+            return bad(rng) if name == invalid else valid(rng)
+
+        kind = schema.get("type")
+        if kind == "object":
+            required = set(schema.get("required", ()))
+            return {
+                prop: self._value(sub, prop, invalid)
+                for prop, sub in schema.get("properties", {}).items()
+                if prop in required or rng.random() >= self.null_rate
+            }
+        if kind == "array":
+            return [self._value(schema.get("items", {}), None, invalid) for _ in range(rng.randint(0, 3))]
+        if kind == "string":
+            if schema.get("format") == "date":
+                return (date(1950, 1, 1) + timedelta(days=rng.randint(0, 25_000))).isoformat()
+            return "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(3, 12)))
+        if kind == "integer":
+            return rng.randint(0, 10)
+        if kind == "number":
+            return round(rng.uniform(0, 10_000), 2)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return None
+
+
+def generate_payloads(n: int, seed: int = 0, invalid_rate: float = 0.3) -> List[Dict[str, Any]]:
+    """`n` schema-valid ApplicationData payloads, as clients would send them."""
+    generator = CorpusGenerator(seed=seed, invalid_rate=invalid_rate)
+    return [generator.payload() for _ in range(n)]
+
+
+def to_records(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Payloads parsed the way the endpoints do, ready for RulesEngine.validate."""
+    return [ApplicationData.model_validate(p).model_dump() for p in payloads]
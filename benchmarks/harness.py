@@ -0,0 +1,97 @@
+"""
+Minimal timing harness shared by the benchmark scripts.
+
+Each benchmark produces a list of result dicts; `write_results` wraps them
+with environment metadata (git commit, Python, platform) so JSON files from
+different commits can be compared.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from app.settings import DEFAULT_RULES_PATH
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    number: int = 1,
+    repeat: int = 5,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """Time `func` (`number` calls per sample, `repeat` samples); seconds per call."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "name": name,
+        "number": number,
+        "repeat": repeat,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        **extra,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(suite: str, results: List[Dict[str, Any]], output: Optional[str]) -> None:
+    """Print a short table to stderr and write the JSON document to `output` (or stdout)."""
+    document = {
+        "suite": suite,
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+    for r in results:
+        if "median_s" in r:
+            print(f"{r['name']:<48} median {r['median_s'] * 1e6:12.1f} us", file=sys.stderr)
+        else:
+            metrics = ", ".join(
+                f"{k} {v:,.1f}" for k, v in r.items()
+                if k != "name" and isinstance(v, (int, float)) and not isinstance(v, bool)
+            )
+            print(f"{r['name']:<48} {metrics}", file=sys.stderr)
+
+    text = json.dumps(document, indent=2)
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+def scaled_rules(factor: int, rules_path: Path = DEFAULT_RULES_PATH) -> List[Dict[str, Any]]:
+    """
+    The shipped rules repeated `factor` times (names suffixed), to model large
+    rule sets. Transforms are kept once; every copy reads the same fields.
+    """
+    with open(rules_path, "rb") as f:
+        raw_rules = yaml.safe_load(f)["rules"]
+    transforms = [r for r in raw_rules if r["type"] == "transform"]
+    checks = [r for r in raw_rules if r["type"] != "transform"]
+    scaled = list(transforms)
+    for i in range(factor):
+        scaled.extend({**r, "name": f"{r['name']}_{i}"} for r in checks)
+    return scaled
@@ -0,0 +1,287 @@
+"""
+End-to-end load test against a real uvicorn server.
+
+Starts `uvicorn app.main:app` on a free local port with `--workers N` (or
+targets `--url`), then drives it with a pooled async httpx client, either
+closed-loop (`--concurrency C` clients sending back to back) or open-loop
+(`--rate R` requests per second on a fixed schedule; latency is measured
+from each request's scheduled start, so a stalled server can't hide its
+queueing). Traffic is replayed from a JSONL file or generated from the
+ApplicationData schema.
+
+    python -m benchmarks.loadtest --workers 4 --concurrency 32 --duration 30
+    python -m benchmarks.loadtest --replay traffic.jsonl --rate 500 --output .benchmarks/loadtest.json
+
+Replay lines are either an application payload (sent to `--endpoint`) or
+`{"method": ..., "path": ..., "body": ...}`. Results are written in the
+benchmark JSON format (p50/p95/p99 latency, throughput, error rate); pass
+`--compare` with a previous run's file to see the change, or use
+`python -m benchmarks.compare --metric p99_s`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from benchmarks.compare import compare, load
+from benchmarks.corpus import generate_payloads
+from benchmarks.harness import write_results
+
+
+# (method, path, JSON body)
+Request = Tuple[str, str, Any]
+# (latency in seconds, HTTP status or exception name)
+Sample = Tuple[float, Any]
+
+STARTUP_TIMEOUT = 30.0
+COMPARED_METRICS = ("median_s", "p95_s", "p99_s", "requests_per_s", "error_rate")
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve(workers: int = 1, env: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """Run uvicorn on a free local port for the duration of the block; yields its URL."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--no-access-log", "--log-level", "warning",
+        ],
+        env={**os.environ, **(env or {})},
+    )
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+            try:
+                if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"uvicorn did not become healthy within {STARTUP_TIMEOUT}s")
+            time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+# ---------------------------------------------------------------------------
+# Traffic
+# ---------------------------------------------------------------------------
+
+def load_replay(path: str, endpoint: str = "/validate") -> List[Request]:
+    requests: List[Request] = []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if isinstance(item, dict) and "path" in item:
+                requests.append((item.get("method", "POST").upper(), item["path"], item.get("body")))
+            else:
+                requests.append(("POST", endpoint, item))
+    if not requests:
+        raise ValueError(f"{path} holds no requests")
+    return requests
+
+
+def synthetic(n: int, endpoint: str = "/validate", seed: int = 0) -> List[Request]:
+    return [("POST", endpoint, payload) for payload in generate_payloads(n, seed=seed)]
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+async def _send(client: httpx.AsyncClient, request: Request) -> Any:
+    method, path, body = request
+    try:
+        response = await client.request(method, path, json=body)
+        await response.aread()
+        return response.status_code
+    except httpx.HTTPError as exc:
+        return type(exc).__name__
+
+
+async def run_load(
+    url: str,
+    requests: Sequence[Request],
+    duration: float,
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+    warmup: float = 2.0,
+    timeout: float = 30.0,
+) -> Tuple[List[Sample], float]:
+    """
+    Send `requests` (cycled) for `warmup + duration` seconds; returns the
+    samples started after the warm-up and the measured wall time.
+    """
+    if (concurrency is None) == (rate is None):
+        raise ValueError("Give exactly one of concurrency or rate")
+    connections = concurrency or max(1, min(1000, int(rate * timeout)))  # type: ignore[operator]
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    samples: List[Sample] = []
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        async def timed(request: Request, scheduled: float) -> None:
+            status = await _send(client, request)
+            if scheduled >= measure_from:
+                samples.append((loop.time() - scheduled, status))
+
+        if concurrency is not None:
+            cursor = 0
+
+            async def worker() -> None:
+                nonlocal cursor
+                while loop.time() < stop_at:
+                    request = requests[cursor % len(requests)]
+                    cursor += 1
+                    await timed(request, loop.time())
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        else:
+            interval = 1.0 / rate  # type: ignore[operator]
+            tasks = set()
+            i = 0
+            while True:
+                scheduled = started + i * interval
+                if scheduled >= stop_at:
+                    break
+                delay = scheduled - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                task = asyncio.create_task(timed(requests[i % len(requests)], scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                i += 1
+            if tasks:
+                await asyncio.gather(*tasks)
+
+    return samples, max(loop.time(), stop_at) - measure_from
+
+
+def summarize(name: str, samples: List[Sample], elapsed: float, **extra: Any) -> Dict[str, Any]:
+    latencies = sorted(latency for latency, _ in samples)
+    outcomes = Counter(str(status) for _, status in samples)
+    errors = sum(n for status, n in outcomes.items() if not status.startswith("2"))
+    n = len(latencies)
+
+    def pct(q: float) -> Optional[float]:
+        return latencies[min(n - 1, int(n * q))] if n else None
+
+    return {
+        "name": name,
+        "number": n,
+        "min_s": latencies[0] if n else None,
+        "median_s": pct(0.50),
+        "mean_s": sum(latencies) / n if n else None,
+        "p95_s": pct(0.95),
+        "p99_s": pct(0.99),
+        "max_s": latencies[-1] if n else None,
+        "requests_per_s": n / elapsed if elapsed else None,
+        "error_rate": errors / n if n else None,
+        "outcomes": dict(outcomes),
+        **extra,
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Load an already running server instead of starting one")
+    target.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (default: 1)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the server (repeatable), e.g. FAFSA_VALIDATE_WORKERS=8")
+    shape_group = parser.add_mutually_exclusive_group()
+    shape_group.add_argument("--concurrency", type=int, help="Closed loop: clients sending back to back (default: 16)")
+    shape_group.add_argument("--rate", type=float, help="Open loop: requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds (default: 10)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds first (default: 2)")
+    parser.add_argument("--replay", help="JSONL traffic to replay (default: synthetic applications)")
+    parser.add_argument("--synthetic", type=int, default=1000, help="Distinct synthetic payloads (default: 1000)")
+    parser.add_argument("--endpoint", default="/validate", help="Path for bare payloads (default: /validate)")
+    parser.add_argument("--name", help="Result name (default: derived from the settings)")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--compare", type=Path, metavar="BASE",
+                        help="Print the change against a previous run's JSON (matched by name)")
+    args = parser.parse_args(argv)
+
+    if args.concurrency is None and args.rate is None:
+        args.concurrency = 16
+    requests = (
+        load_replay(args.replay, args.endpoint) if args.replay
+        else synthetic(args.synthetic, args.endpoint)
+    )
+    env = dict(item.split("=", 1) for item in args.env)
+    shape = f"concurrency={args.concurrency}" if args.concurrency else f"rate={args.rate:g}"
+    name = args.name or (
+        f"{args.endpoint} {shape} "
+        + (f"url={args.url}" if args.url else f"workers={args.workers}")
+    )
+
+    def drive(url: str) -> Dict[str, Any]:
+        samples, elapsed = asyncio.run(run_load(
+            url, requests, args.duration,
+            concurrency=args.concurrency, rate=args.rate, warmup=args.warmup,
+        ))
+        return summarize(
+            name, samples, elapsed,
+            workers=None if args.url else args.workers,
+            concurrency=args.concurrency, rate=args.rate,
+            source=args.replay or "synthetic", env=env,
+        )
+
+    if args.url:
+        result = drive(args.url)
+    else:
+        with serve(args.workers, env) as url:
+            result = drive(url)
+
+    write_results("loadtest", [result], args.output)
+    if args.compare:
+        base, new = load(args.compare), {("loadtest", result["name"]): result}
+        for metric in COMPARED_METRICS:
+            for _, _, before, after, change in compare(base, new, metric):
+                print(f"{metric:<16} {before:12.6g} -> {after:12.6g} {change:+8.1%}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
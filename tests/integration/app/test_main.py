@@ -1,3 +1,4 @@
+import json
 import httpx
 import pytest
 from testcontainers.core.container import DockerContainer
@@ -68,3 +69,170 @@ def test_validate_endpoint(fafsa_container):
     assert response_data["errors"] == []
     assert response_data["warnings"] == []
     assert response_data["passed"] != []
+
+
+def test_validate_endpoint_modes(fafsa_container):
+    """Test "/validate?mode=..." reports only failures and can stop at the first error."""
+    base_url = fafsa_container
+    application = {
+        "studentInfo": {
+            "firstName": "John",
+            "lastName": "Doe",
+            "ssn": "12",
+            "dateOfBirth": "2000-01-01",
+        },
+        "household": {"numberInHousehold": 1, "numberInCollege": 2},
+        "income": {"studentIncome": 15000, "parentIncome": 60000},
+        "stateOfResidence": "XX",
+        "dependencyStatus": "dependent",
+        "maritalStatus": "single"
+    }
+
+    full = httpx.post(f"{base_url}/validate", json=application).json()
+    errors_only = httpx.post(f"{base_url}/validate?mode=errors_only", json=application).json()
+    fail_fast = httpx.post(f"{base_url}/validate?mode=fail_fast", json=application).json()
+
+    assert errors_only == {**full, "passed": []}
+    assert fail_fast["valid"] is False
+    assert fail_fast["errors"] == full["errors"][:1]
+    assert fail_fast["passed"] == []
+
+    r = httpx.post(f"{base_url}/validate?mode=everything", json=application)
+    assert r.status_code == 422
+
+
+def test_validate_delta_endpoint(fafsa_container):
+    """Test "/validate/delta" re-validates an edit and matches a full /validate."""
+    base_url = fafsa_container
+    application = {
+        "studentInfo": {
+            "firstName": "John",
+            "lastName": "Doe",
+            "ssn": "123456789",
+            "dateOfBirth": "2000-01-01",
+        },
+        "household": {"numberInHousehold": 4, "numberInCollege": 2},
+        "income": {"studentIncome": 15000, "parentIncome": 60000},
+        "stateOfResidence": "CA",
+        "dependencyStatus": "dependent",
+        "maritalStatus": "single"
+    }
+
+    started = httpx.post(f"{base_url}/validate/delta", json={"application": application})
+    assert started.status_code == 200
+    assert started.json()["valid"] is True
+
+    edited = httpx.post(
+        f"{base_url}/validate/delta",
+        json={"token": started.json()["token"], "changes": {"stateOfResidence": "XX"}},
+    )
+    assert edited.status_code == 200
+    body = edited.json()
+    assert body.pop("token") != started.json()["token"]
+    full = httpx.post(f"{base_url}/validate", json={**application, "stateOfResidence": "XX"})
+    assert body == full.json()
+
+    r = httpx.post(f"{base_url}/validate/delta", json={"token": "unknown", "changes": {}})
+    assert r.status_code == 404
+
+
+def test_validate_batch_endpoint(fafsa_container):
+    """Test "/validate/batch" keeps order and reports schema failures in place."""
+    base_url = fafsa_container
+    application = {
+        "studentInfo": {
+            "firstName": "John",
+            "lastName": "Doe",
+            "ssn": "123456789",
+            "dateOfBirth": "2000-01-01",
+        },
+        "household": {"numberInHousehold": 4, "numberInCollege": 2},
+        "income": {"studentIncome": 15000, "parentIncome": 60000},
+        "stateOfResidence": "CA",
+        "dependencyStatus": "dependent",
+        "maritalStatus": "single"
+    }
+    invalid_state = {**application, "stateOfResidence": "XX"}
+
+    r = httpx.post(
+        f"{base_url}/validate/batch",
+        json=[application, {"not": "an application"}, invalid_state],
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert len(results) == 3
+    assert results[0]["valid"] is True
+    assert results[1]["valid"] is False
+    assert results[1]["schema_errors"] != []
+    assert results[2]["valid"] is False
+    assert [e["rule"] for e in results[2]["errors"]] == ["state_code_valid"]
+
+
+def test_validate_stream_endpoint(fafsa_container):
+    """Test "/validate/stream" returns one NDJSON record per input line."""
+    base_url = fafsa_container
+    application = {
+        "studentInfo": {
+            "firstName": "John",
+            "lastName": "Doe",
+            "ssn": "123456789",
+            "dateOfBirth": "2000-01-01",
+        },
+        "household": {"numberInHousehold": 4, "numberInCollege": 2},
+        "income": {"studentIncome": 15000, "parentIncome": 60000},
+        "stateOfResidence": "CA",
+        "dependencyStatus": "dependent",
+        "maritalStatus": "single"
+    }
+    body = "\n".join([json.dumps(application), "{not json", json.dumps(application)])
+
+    r = httpx.post(
+        f"{base_url}/validate/stream",
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert [rec["line"] for rec in records] == [1, 2, 3]
+    assert [rec["valid"] for rec in records] == [True, False, True]
+    assert records[1]["schema_errors"][0]["type"] == "json_invalid"
+
+
+def test_metrics_endpoint(fafsa_container):
+    """Test "/metrics" exposes Prometheus text with per-rule counters."""
+    base_url = fafsa_container
+    r = httpx.get(f"{base_url}/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "# TYPE fafsa_rule_results_total counter" in r.text
+
+
+def test_rules_version_header(fafsa_container):
+    """Every response reports the active rule set checksum."""
+    base_url = fafsa_container
+    r = httpx.get(f"{base_url}/health")
+    assert r.status_code == 200
+    version = r.headers["x-rules-version"]
+    assert len(version) == 64
+
+    r = httpx.get(f"{base_url}/admin/rules")
+    assert r.status_code == 200
+    assert r.json()["version"] == version
+
+
+def test_unknown_award_year(fafsa_container):
+    """Requests for an award year without a rules file are rejected with 404."""
+    base_url = fafsa_container
+    r = httpx.post(f"{base_url}/validate", params={"award_year": "1999-00"}, json={})
+    assert r.status_code == 404
+
+    r = httpx.post(f"{base_url}/validate/batch", headers={"X-Award-Year": "1999-00"}, json=[])
+    assert r.status_code == 404
+
+
+def test_shadow_report_requires_configuration(fafsa_container):
+    """Without candidate rules there is no shadow report."""
+    base_url = fafsa_container
+    r = httpx.get(f"{base_url}/admin/shadow")
+    assert r.status_code == 404
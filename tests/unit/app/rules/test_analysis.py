@@ -0,0 +1,183 @@
+import copy
+import gc
+import random
+import weakref
+
+import pytest
+
+from app.rules.analysis import rule_cost
+from app.rules.engine import RulesEngine, rule_from_dict
+from app.rules.models import EvaluationMode, TransformRule
+
+
+APPLICATION = {
+    "studentInfo": {"firstName": "John", "lastName": "Doe", "ssn": "123456789", "dateOfBirth": "2000-01-01"},
+    "household": {"numberInHousehold": 4, "numberInCollege": 1},
+    "income": {"studentIncome": 15000, "parentIncome": 40000},
+    "stateOfResidence": "CA",
+    "dependencyStatus": "dependent",
+    "maritalStatus": "single",
+}
+
+RULES = [
+    {"type": "string_match", "name": "ssn_format", "field": "studentInfo.ssn", "pattern": "^[0-9]{9}$"},
+    {"type": "value_comparison", "name": "income_floor", "field": "income.studentIncome", "operator": "gte", "value": 0},
+    {"type": "string_match", "name": "ssn_format_again", "field": "studentInfo.ssn", "pattern": "^[0-9]{9}$",
+     "severity": "warning", "message": "SSN looks wrong"},
+    {"type": "value_in_set", "name": "state", "field": "stateOfResidence", "allowed_values": ["CA", "NY"]},
+    {"type": "value_comparison", "name": "income_floor_too", "field": "income.studentIncome", "operator": "gte",
+     "value": 0, "message": "Income can't be negative"},
+]
+
+
+def engine_for(raw_rules, transforms=(), backend="interpreted"):
+    return RulesEngine([rule_from_dict(raw) for raw in raw_rules], list(transforms), backend=backend)
+
+
+def test_identical_checks_share_evaluation_but_report_every_rule():
+    engine = engine_for(RULES)
+    assert engine.analysis.shared_checks == [[0, 2], [1, 4]]
+
+    rng = random.Random(3)
+    for _ in range(200):
+        data = copy.deepcopy(APPLICATION)
+        data["studentInfo"]["ssn"] = rng.choice(["123456789", "12", None, 123456789])
+        data["income"]["studentIncome"] = rng.choice([-5, 0, 10, "abc", None])
+        data["stateOfResidence"] = rng.choice(["CA", "ZZ"])
+        # Each rule on its own, as if nothing were shared
+        expected = [rule.apply(data) for rule in engine.rules]
+
+        full = engine.validate(copy.deepcopy(data))
+        assert [r for r in expected if r.passed] == full.successes
+        assert [r for r in expected if not r.passed and r.severity.value == "error"] == full.errors
+        assert [r for r in expected if not r.passed and r.severity.value == "warning"] == full.warnings
+
+        errors_only = engine.validate(copy.deepcopy(data), EvaluationMode.ERRORS_ONLY)
+        assert (errors_only.errors, errors_only.warnings) == (full.errors, full.warnings)
+
+
+class Payload(dict):
+    """A dict that can be weakly referenced."""
+
+
+def test_shared_checks_keep_nothing_between_evaluations():
+    engine = engine_for(RULES)
+    data = Payload(copy.deepcopy(APPLICATION))
+    # The same object, edited between calls in every mode and order
+    for ssn, mode in [
+        ("12", EvaluationMode.FAIL_FAST),
+        ("123456789", EvaluationMode.ERRORS_ONLY),
+        ("12", EvaluationMode.FULL),
+        ("123456789", EvaluationMode.FAIL_FAST),
+    ]:
+        data["studentInfo"]["ssn"] = ssn
+        summary = engine.validate(data, mode)
+        assert [r.name for r in summary.errors] == (["ssn_format"] if ssn == "12" else [])
+
+    state = engine.validate_state(copy.deepcopy(APPLICATION))
+    state = engine.validate_delta(state, {"studentInfo.ssn": "12"})
+    assert {r.name for r in state.summary().errors} == {"ssn_format"}
+    assert {r.name for r in state.summary().warnings} == {"ssn_format_again"}
+
+    ref = weakref.ref(data)
+    del data
+    gc.collect()
+    assert ref() is None
+
+
+def test_dead_and_unknown_transforms_are_reported_and_dropped():
+    transforms = [
+        TransformRule(name="age", field="studentInfo.dateOfBirth", transform="age_years", output_field="studentInfo.age"),
+        TransformRule(name="unused", field="studentInfo.dateOfBirth", transform="age_years", output_field="derived.unused"),
+        TransformRule(name="typo", field="studentInfo.dateOfBirth", transform="age_yaers", output_field="derived.typo"),
+    ]
+    engine = engine_for(
+        [{"type": "value_comparison", "name": "age", "field": "studentInfo.age", "operator": "gte", "value": 14}],
+        transforms,
+    )
+
+    assert [t.name for t in engine.analysis.dead_transforms] == ["unused"]
+    assert [t.name for t in engine._compiled_transforms] == ["age"]
+    kinds = {(f.kind, f.subjects) for f in engine.analysis.findings}
+    assert kinds == {("dead_transform", ("unused",)), ("unknown_transform", ("typo",))}
+    assert engine.validate(copy.deepcopy(APPLICATION)).valid
+
+
+def test_schema_findings():
+    engine = engine_for([
+        {"type": "presence", "name": "typo", "field": "studentInfo.snn"},
+        {"type": "presence", "name": "under_a_scalar", "field": "stateOfResidence.code"},
+        {"type": "presence", "name": "fine", "field": "spouseInfo.ssn",
+         "when": {"field": "maritalStatus", "equals": "married"}},
+        {"type": "presence", "name": "bad_literal", "field": "spouseInfo.ssn",
+         "when": {"field": "maritalStatus", "equals": "Married"}},
+        {"type": "presence", "name": "bad_type", "field": "spouseInfo.ssn",
+         "when": {"field": "household.numberInCollege", "equals": "2"}},
+        {"type": "presence", "name": "never_none", "field": "spouseInfo.ssn",
+         "when": {"field": "dependencyStatus", "equals": None}},
+        {"type": "presence", "name": "optional_none", "field": "spouseInfo.ssn",
+         "when": {"field": "spouseInfo", "equals": None}},
+        {"type": "presence", "name": "missing_condition", "field": "spouseInfo.ssn",
+         "when": {"field": "nope", "equals": True}},
+    ])
+
+    found = sorted((f.kind, f.subjects[0]) for f in engine.analysis.findings)
+    assert found == [
+        ("unknown_field", "typo"),
+        ("unknown_field", "under_a_scalar"),
+        ("unreachable_condition", "bad_literal"),
+        ("unreachable_condition", "bad_type"),
+        ("unreachable_condition", "missing_condition"),
+        ("unreachable_condition", "never_none"),
+    ]
+
+
+def test_fail_fast_runs_cheap_rules_first():
+    raw = [
+        {"type": "field_comparison", "name": "college", "left_field": "household.numberInCollege",
+         "operator": "lte", "right_field": "household.numberInHousehold"},
+        {"type": "string_match", "name": "ssn", "field": "studentInfo.ssn", "pattern": "^[0-9]{9}$"},
+        {"type": "unique_in_batch", "name": "unique", "fields": ["studentInfo.ssn"]},
+        {"type": "string_match", "name": "ssn_again", "field": "studentInfo.ssn", "pattern": "^[0-9]{9}$"},
+        {"type": "value_in_set", "name": "state", "field": "stateOfResidence", "allowed_values": ["CA"]},
+    ]
+    engine = engine_for(raw)
+    # Batch-scoped rules keep their place; shared checks follow the rule evaluating them
+    assert [engine.rules[i].name for i in engine.analysis.fail_fast_order] == [
+        "ssn", "college", "unique", "state", "ssn_again",
+    ]
+    assert rule_cost(engine.rules[4]) < rule_cost(engine.rules[3])
+
+    data = copy.deepcopy(APPLICATION)
+    data["studentInfo"]["ssn"] = "x"
+    data["household"]["numberInCollege"] = 9
+    assert [r.name for r in engine.validate(data, EvaluationMode.FAIL_FAST).errors] == ["ssn"]
+    assert [r.name for r in engine.validate(data, EvaluationMode.FULL).errors] == ["college", "ssn", "ssn_again"]
+
+    codegen = engine_for(raw, backend="codegen")
+    assert codegen.validate(copy.deepcopy(data), EvaluationMode.FAIL_FAST) == engine.validate(data, EvaluationMode.FAIL_FAST)
+
+
+def test_fail_fast_order_matches_in_columnar_mode():
+    pytest.importorskip("numpy")
+    engine = engine_for(RULES[::-1])
+    records = []
+    for ssn in ("12", "123456789"):
+        for income in (-1, 1):
+            data = copy.deepcopy(APPLICATION)
+            data["studentInfo"]["ssn"], data["income"]["studentIncome"] = ssn, income
+            records.append(data)
+
+    assert engine.validate_many(copy.deepcopy(records), columnar=True, mode=EvaluationMode.FAIL_FAST) == [
+        engine.validate(data, EvaluationMode.FAIL_FAST) for data in records
+    ]
+
+
+def test_costs_report_savings():
+    engine = engine_for(RULES)
+    costs = engine.analysis.report()["costs"]
+
+    shared = rule_cost(engine.rules[2]) + rule_cost(engine.rules[4])
+    assert costs["all_rules"]["before"] - costs["all_rules"]["after"] == pytest.approx(shared)
+    assert costs["fail_fast_to_error"]["after"] < costs["fail_fast_to_error"]["before"]
+    assert engine.analysis.report()["shared_checks"] == 2
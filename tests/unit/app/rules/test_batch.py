@@ -0,0 +1,198 @@
+import copy
+import io
+import json
+import random
+
+import pytest
+import yaml
+
+from app.rules import snapshot
+from app.rules.batch import BatchScope, BloomKeySet, HashedKeySet, PrefilteredKeySet
+from app.rules.cli import run_validate
+from app.rules.engine import RulesEngine, rule_from_dict
+from app.rules.models import EvaluationMode
+from tests.fixtures import FIXTURESPATH
+
+
+UNIQUE_SSN = {
+    "type": "unique_in_batch",
+    "name": "ssn_unique_in_batch",
+    "fields": ["studentInfo.ssn", "spouseInfo.ssn"],
+    "message": "SSN already used by another application in this batch",
+}
+
+APPLICATION = {
+    "studentInfo": {
+        "firstName": "John",
+        "lastName": "Doe",
+        "ssn": "123456789",
+        "dateOfBirth": "2000-01-01",
+    },
+    "household": {"numberInHousehold": 4, "numberInCollege": 1},
+    "income": {"studentIncome": 15000, "parentIncome": 40000},
+    "stateOfResidence": "CA",
+    "dependencyStatus": "dependent",
+    "maritalStatus": "single",
+}
+
+
+def application(ssn, spouse_ssn=None):
+    data = copy.deepcopy(APPLICATION)
+    data["studentInfo"]["ssn"] = ssn
+    if spouse_ssn is not None:
+        data["maritalStatus"] = "married"
+        data["spouseInfo"] = {"name": "Jane Doe", "ssn": spouse_ssn}
+    return data
+
+
+BATCH = [
+    application("111111111"),
+    application("222222222", spouse_ssn="333333333"),
+    application("333333333"),                         # spouse of the 2nd
+    application("444444444", spouse_ssn="444444444"),  # repeat within one application
+    application("111111111", spouse_ssn="222222222"),
+]
+EXPECTED_DUPLICATES = [None, None, ["studentInfo.ssn"], None, ["studentInfo.ssn", "spouseInfo.ssn"]]
+
+
+def duplicates(summary):
+    for result in summary.errors:
+        if result.name == "ssn_unique_in_batch":
+            return result.details["duplicate_fields"]
+    return None
+
+
+@pytest.fixture
+def engine():
+    return RulesEngine([rule_from_dict(UNIQUE_SSN)], [])
+
+
+def test_hashed_key_set_is_exact_across_growth():
+    keys = HashedKeySet(capacity=4)
+    rng = random.Random(1)
+    values = list({rng.getrandbits(64) | 1 for _ in range(5000)})
+
+    assert [keys.add(v) for v in values] == [False] * len(values)
+    assert all(keys.add(v) for v in values[::7])
+    assert len(keys) == len(values)
+    assert all(v in keys for v in values)
+    assert not any(v in keys for v in range(1, 1000))
+
+
+def test_bloom_key_set_stays_within_its_error_rate():
+    rng = random.Random(2)
+    keys = BloomKeySet(capacity=10_000, error_rate=0.01)
+    for _ in range(10_000):
+        keys.add(rng.getrandbits(64))
+
+    false_positives = sum(rng.getrandbits(64) in keys for _ in range(20_000))
+    assert false_positives / 20_000 < 0.02
+    assert keys.nbytes < 10_000 * 2
+
+
+@pytest.mark.parametrize("mode", list(EvaluationMode))
+def test_validate_many_flags_values_seen_earlier_in_the_batch(engine, mode):
+    summaries = engine.validate_many(copy.deepcopy(BATCH), mode=mode)
+
+    assert [duplicates(s) for s in summaries] == EXPECTED_DUPLICATES
+    assert summaries[2].errors[0].details.to_dict() == {
+        "fields": ["studentInfo.ssn", "spouseInfo.ssn"],
+        "duplicate_fields": ["studentInfo.ssn"],
+    }
+    # A new batch starts with an empty index
+    assert all(s.valid for s in engine.validate_many(copy.deepcopy(BATCH[:2]), mode=mode))
+
+
+def test_other_paths_match_the_interpreter(engine):
+    pytest.importorskip("numpy")
+    codegen = RulesEngine([rule_from_dict(UNIQUE_SSN)], [], backend="codegen")
+
+    assert [duplicates(s) for s in codegen.validate_many(copy.deepcopy(BATCH))] == EXPECTED_DUPLICATES
+    assert [duplicates(s) for s in engine.validate_many(copy.deepcopy(BATCH), columnar=True)] == EXPECTED_DUPLICATES
+
+
+def test_scope_spans_calls_and_ignores_unmet_conditions():
+    engine = RulesEngine(
+        [rule_from_dict({**UNIQUE_SSN, "when": {"field": "maritalStatus", "equals": "married"}})], []
+    )
+    scope = BatchScope()
+
+    first = engine.validate_many(copy.deepcopy(BATCH[:3]), scope=scope)
+    second = engine.validate_many(copy.deepcopy(BATCH[3:]), scope=scope)
+
+    # Only married applicants are indexed: the 3rd isn't, and isn't flagged
+    assert [duplicates(s) for s in first + second] == [None, None, None, None, ["spouseInfo.ssn"]]
+    assert scope.stats()["ssn_unique_in_batch"]["keys"] == 4
+
+
+def test_rule_passes_outside_a_batch(engine):
+    for data in BATCH:
+        assert engine.validate(copy.deepcopy(data)).valid
+    assert engine.batch_scoped
+
+
+def test_prefiltered_key_set_is_exact_past_its_capacity():
+    rng = random.Random(3)
+    values = list({rng.getrandbits(64) | 1 for _ in range(20_000)})
+    # A filter this overloaded reports nearly everything as seen
+    keys = PrefilteredKeySet(capacity=100, error_rate=0.01)
+
+    assert [keys.add(v) for v in values] == [False] * len(values)
+    assert all(keys.add(v) for v in values[::7])
+    assert len(keys) == len(values)
+    assert not any(rng.getrandbits(64) | 1 in keys for _ in range(1000))
+
+
+def test_bloom_scope_gives_the_same_answers(engine):
+    scope = BatchScope(bloom_capacity=1)
+    summaries = engine.validate_many(copy.deepcopy(BATCH), scope=scope)
+    assert [duplicates(s) for s in summaries] == EXPECTED_DUPLICATES
+
+
+def test_snapshot_round_trip():
+    rule = rule_from_dict({**UNIQUE_SSN, "severity": "warning"})
+    assert rule_from_dict(snapshot.rule_to_dict(rule)) == rule
+
+
+def test_cli_resolves_duplicates_across_workers(tmp_path):
+    rules = yaml.safe_load((FIXTURESPATH / "rules.yaml").read_text())
+    rules["rules"].append(UNIQUE_SSN)
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text(yaml.safe_dump(rules))
+    archive = tmp_path / "archive.jsonl"
+    archive.write_text("".join(json.dumps(data) + "\n" for data in BATCH))
+
+    outputs, tallies = [], []
+    for workers in (1, 2):
+        output = io.BytesIO()
+        tallies.append(run_validate([str(archive)], str(rules_path), output, workers=workers, chunk_size=2).to_dict())
+        outputs.append(output.getvalue())
+
+    assert outputs[0] == outputs[1]
+    assert tallies[0] == tallies[1]
+    records = [json.loads(line) for line in outputs[0].splitlines()]
+    flagged = [
+        next((e["details"]["duplicate_fields"] for e in r["errors"] if e["rule"] == "ssn_unique_in_batch"), None)
+        for r in records
+    ]
+    assert flagged == EXPECTED_DUPLICATES
+    assert tallies[0]["rules"]["ssn_unique_in_batch"] == {"passed": 3, "failed": 2, "skipped": 0}
+
+
+@pytest.mark.parametrize("backend", ["interpreted", "codegen"])
+def test_fail_fast_indexes_applications_that_stop_early(backend):
+    pytest.importorskip("numpy")
+    raw = [
+        {"type": "value_comparison", "name": "inc", "field": "income.studentIncome", "operator": "gte", "value": 0},
+        {"type": "unique_in_batch", "name": "dup", "fields": ["studentInfo.ssn"]},
+    ]
+    engine = RulesEngine([rule_from_dict(r) for r in raw], [], backend=backend)
+    batch = [application("111111111"), application("111111111")]
+    batch[0]["income"]["studentIncome"] = -1
+
+    def failed(summaries):
+        return [[e.name for e in s.errors] for s in summaries]
+
+    rows = engine.validate_many(copy.deepcopy(batch), mode=EvaluationMode.FAIL_FAST)
+    columns = engine.validate_many(copy.deepcopy(batch), columnar=True, mode=EvaluationMode.FAIL_FAST)
+    assert failed(rows) == failed(columns) == [["inc"], ["dup"]]
@@ -0,0 +1,77 @@
+import io
+import json
+
+import pytest
+
+from app.rules.cli import main, run_validate
+from tests.fixtures import FIXTURESPATH
+
+
+APPLICATION = {
+    "studentInfo": {
+        "firstName": "John",
+        "lastName": "Doe",
+        "ssn": "123456789",
+        "dateOfBirth": "2000-01-01",
+    },
+    "household": {"numberInHousehold": 4, "numberInCollege": 1},
+    "income": {"studentIncome": 15000, "parentIncome": 40000},
+    "stateOfResidence": "CA",
+    "dependencyStatus": "dependent",
+    "maritalStatus": "single",
+}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    lines = [
+        json.dumps(APPLICATION),
+        json.dumps({**APPLICATION, "stateOfResidence": "XX"}),
+        "",
+        "{not json",
+        json.dumps({**APPLICATION, "maritalStatus": "married"}),
+    ]
+    path = tmp_path / "archive.jsonl"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_validate_keeps_input_order(archive, workers):
+    output = io.BytesIO()
+
+    tally = run_validate(
+        inputs=[str(archive)],
+        rules_path=str(FIXTURESPATH / "rules.yaml"),
+        output=output,
+        workers=workers,
+        chunk_size=2,
+    )
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [r["line"] for r in records] == [1, 2, 4, 5]
+    assert [r["valid"] for r in records] == [True, False, False, False]
+    assert "schema_errors" in records[2]
+
+    assert tally.records == 4
+    assert tally.schema_errors == 1
+    assert tally.rules["state_code_valid"] == {"passed": 2, "failed": 1, "skipped": 0}
+    assert tally.rules["married_requires_spouse_info"] == {"passed": 0, "failed": 1, "skipped": 2}
+
+
+def test_main_writes_report(archive, tmp_path):
+    report_path = tmp_path / "report.json"
+
+    exit_code = main([
+        "validate", str(archive),
+        "--rules", str(FIXTURESPATH / "rules.yaml"),
+        "--output", str(tmp_path / "results.jsonl"),
+        "--report", str(report_path),
+        "--workers", "1",
+    ])
+
+    assert exit_code == 0
+    report = json.loads(report_path.read_text())
+    assert report["records"] == 4
+    assert report["valid"] == 1
+    assert report["records_per_second"] > 0
@@ -0,0 +1,173 @@
+import copy
+import random
+from dataclasses import dataclass
+from datetime import date
+from typing import List
+
+import pytest
+
+from app.rules import helpers
+from app.rules.engine import RulesEngine, rule_from_dict
+from app.rules.instrumentation import EngineMetrics
+from app.rules.models import EvaluationMode, Evaluator, Rule, RuleResult, RuleSeverity, TransformRule
+from tests.fixtures import FIXTURESPATH
+
+
+PATHS = ["a", "a.b", "a.c", "a.b.c", "d", "d.e", "f", "g"]
+VALUES = [
+    None, "", "abc", "123456789", "12", "-4.5", "nan", 5, -3, 0, 1.5, 7.0, True, False,
+    float("inf"), [1], {"b": 2}, {"b": {"c": 3}}, "x", "y", 10 ** 400,
+]
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    if depth < 2 and rng.random() < 0.3:
+        return {key: random_value(rng, depth + 1) for key in rng.sample(["b", "c", "e"], rng.randint(0, 3))}
+    return rng.choice(VALUES)
+
+
+def random_rule(rng: random.Random, i: int) -> dict:
+    raw = {
+        "name": f"r{i}",
+        "severity": rng.choice(["error", "warning"]),
+        "message": rng.choice([None, f"r{i} failed"]),
+    }
+    kind = rng.choice(["presence", "string_match", "value_comparison", "field_comparison", "value_in_set", "requires"])
+    raw["type"] = kind
+    if kind == "field_comparison":
+        raw.update(left_field=rng.choice(PATHS), right_field=rng.choice(PATHS))
+    elif kind == "requires":
+        raw["required_fields"] = rng.sample(PATHS, rng.randint(1, 3))
+    else:
+        raw["field"] = rng.choice(PATHS)
+    if kind == "string_match":
+        raw["pattern"] = rng.choice(["^[0-9]{9}$", "a.c", "[xy]", "True"])
+    if kind in ("value_comparison", "field_comparison"):
+        raw["operator"] = rng.choice(["lt", "lte", "gt", "gte", "eq", "neq", "bogus"])
+    if kind == "value_comparison":
+        raw["value"] = rng.choice([0, 5, -3.5, "12", "n/a", None, float("nan"), float("inf")])
+    if kind == "value_in_set":
+        raw["allowed_values"] = rng.choice([["x", "y"], [0, 5, None], [[1], "x"], [True, ""]])
+    if rng.random() < 0.4:
+        raw["when"] = {"field": rng.choice(PATHS), "equals": rng.choice(["x", 5, None, True, [1]])}
+    return raw
+
+
+def random_rule_set(rng: random.Random) -> tuple:
+    rules = [rule_from_dict(random_rule(rng, i)) for i in range(rng.randint(1, 12))]
+    transforms = [
+        TransformRule(name=f"t{i}", field=rng.choice(PATHS), transform=f"t{i % 3}", output_field=rng.choice(PATHS))
+        for i in range(rng.randint(0, 3))
+    ]
+    return rules, transforms
+
+
+@pytest.fixture
+def tagged_transforms(monkeypatch):
+    for i in range(3):
+        monkeypatch.setitem(helpers.TRANSFORM_REGISTRY, f"t{i}", lambda value, i=i: [i, value])
+
+
+def evaluate(engine: RulesEngine, data: dict, mode: EvaluationMode) -> str:
+    # Compared by repr: "nan" values in details never compare equal
+    try:
+        return repr(engine.validate(copy.deepcopy(data), mode))
+    except OverflowError:
+        return "OverflowError"
+
+
+@pytest.mark.parametrize("mode", list(EvaluationMode))
+def test_codegen_matches_interpreter_on_random_rule_sets(tagged_transforms, mode):
+    rng = random.Random(19)
+    for _ in range(300):
+        rules, transforms = random_rule_set(rng)
+        interpreted = RulesEngine(rules=rules, transforms=transforms)
+        generated = RulesEngine(rules=rules, transforms=transforms, backend="codegen")
+        for _ in range(20):
+            data = {path: random_value(rng) for path in rng.sample(["a", "d", "f", "g"], rng.randint(0, 4))}
+            snapshot = copy.deepcopy(data)
+
+            assert evaluate(generated, data, mode) == evaluate(interpreted, data, mode), generated.generated_source
+            assert data == snapshot
+
+
+def random_application(rng: random.Random) -> dict:
+    def value():
+        return rng.choice([None, "", "123456789", "12", 5, -3, 0, 1.5, "7", True, [1], "CA", "XX", "2000-01-01"])
+
+    return {
+        "studentInfo": {"ssn": value(), "dateOfBirth": rng.choice(["2000-01-01", "2015-07-04", value()])},
+        "household": {"numberInHousehold": value(), "numberInCollege": value()},
+        "income": rng.choice([value(), {"studentIncome": value(), "parentIncome": value()}]),
+        "spouseInfo": rng.choice([None, {"name": value(), "ssn": value()}]),
+        "stateOfResidence": value(),
+        "dependencyStatus": rng.choice(["dependent", "independent", value()]),
+        "maritalStatus": rng.choice(["single", "married", value()]),
+    }
+
+
+def test_codegen_matches_interpreter_on_shipped_rules():
+    interpreted = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+    generated = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml", backend="codegen")
+    rng = random.Random(5)
+    for _ in range(2000):
+        data = random_application(rng)
+        for mode in EvaluationMode:
+            assert generated.validate(data, mode, date(2024, 6, 1)) == interpreted.validate(data, mode, date(2024, 6, 1))
+
+
+def test_generated_source_is_inspectable():
+    engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml", backend="codegen")
+    source = engine.generated_source
+
+    assert RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml").generated_source is None
+    compile(source, "<audit>", "exec")
+    for name in ("validate_full", "validate_errors_only", "validate_fail_fast"):
+        assert f"def {name}(data, today=None, owned=False):" in source
+    # One shared lookup per path, however many rules read it
+    assert source.count("data.get('spouseInfo')") == 3
+    assert "# 3: student_ssn_format (StringMatchRule)" in source
+
+
+@dataclass
+class EvenRule(Rule):
+    """A rule type the generator doesn't know: evaluated through compile()."""
+    name: str
+    field: str
+    severity: RuleSeverity = RuleSeverity.ERROR
+    when = None
+
+    def read_fields(self) -> List[str]:
+        return [self.field]
+
+    def compile(self) -> Evaluator:
+        def evaluate(data):
+            passed = isinstance(data.get(self.field), int) and data[self.field] % 2 == 0
+            return RuleResult(name=self.name, passed=passed, severity=self.severity)
+        return evaluate
+
+
+@pytest.mark.parametrize("mode", list(EvaluationMode))
+def test_unknown_rule_types_use_their_evaluator(mode):
+    rules = [EvenRule(name="even", field="n"), EvenRule(name="even_warning", field="n", severity=RuleSeverity.WARNING)]
+    interpreted = RulesEngine(rules=rules, transforms=[])
+    generated = RulesEngine(rules=rules, transforms=[], backend="codegen")
+
+    for data in ({"n": 2}, {"n": 3}, {}):
+        assert generated.validate(data, mode) == interpreted.validate(data, mode)
+
+
+def test_codegen_with_metrics_records_every_validation():
+    metrics = EngineMetrics(sample_every=2)
+    engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml", metrics=metrics, backend="codegen")
+    reference = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+    data = {"studentInfo": {"ssn": "12"}, "stateOfResidence": "CA"}
+
+    for _ in range(4):
+        assert engine.validate(data) == reference.validate(data)
+    assert "fafsa_validations_total 4\n" in metrics.render_prometheus()
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="backend"):
+        RulesEngine(rules=[], transforms=[], backend="jit")
@@ -0,0 +1,86 @@
+import copy
+import random
+
+import pytest
+
+from app.rules.engine import RulesEngine
+from app.rules.models import (
+    EvaluationMode,
+    FieldComparisonRule,
+    PresenceRule,
+    ValueComparisonRule,
+    ValueInSetRule,
+)
+from tests.fixtures import FIXTURESPATH
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(scope="module")
+def rules_engine():
+    return RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+
+
+def random_application(rng: random.Random) -> dict:
+    def value():
+        return rng.choice([
+            None, "", "abc", "123456789", "12", 5, -3, 0, 1.5, "7", True,
+            [1], {"a": 1}, "CA", "XX", "dependent", "married", "2000-01-01",
+        ])
+
+    return {
+        "studentInfo": {"firstName": value(), "ssn": value(), "dateOfBirth": value()},
+        "household": {"numberInHousehold": value(), "numberInCollege": value()},
+        "income": rng.choice([value(), {"studentIncome": value(), "parentIncome": value()}]),
+        "spouseInfo": rng.choice([None, {"name": value(), "ssn": value()}]),
+        "stateOfResidence": value(),
+        "dependencyStatus": rng.choice(["dependent", "independent", value()]),
+        "maritalStatus": rng.choice(["single", "married", value()]),
+    }
+
+
+def test_columnar_matches_row_by_row(rules_engine):
+    rng = random.Random(42)
+    applications = [random_application(rng) for _ in range(2000)]
+
+    row_wise = rules_engine.validate_many(copy.deepcopy(applications))
+    columnar = rules_engine.validate_many(copy.deepcopy(applications), columnar=True)
+
+    assert columnar == row_wise
+
+
+def test_columnar_semantics_and_fallback_rules():
+    engine = RulesEngine(
+        rules=[
+            ValueComparisonRule(name="v", field="a", operator="gte", value=0, message="v"),
+            FieldComparisonRule(name="f", left_field="a", operator="lte", right_field="b"),
+            ValueInSetRule(name="s", field="c", allowed_values=["x"]),
+            PresenceRule(name="p", field="c"),  # no vectorized form
+        ],
+        transforms=[],
+    )
+    records = [
+        {"a": 1, "b": 2, "c": "x"},
+        {"b": 2, "c": "y"},        # missing a
+        {"a": "n/a", "b": 2},      # non-numeric a, missing c
+    ]
+
+    columnar = engine.validate_many(copy.deepcopy(records), columnar=True)
+
+    assert columnar == engine.validate_many(copy.deepcopy(records))
+    missing = next(r for r in columnar[1].successes if r.name == "v")
+    assert missing.details["reason"] == "field_missing_treated_as_pass"
+    non_numeric = next(r for r in columnar[2].errors if r.name == "v")
+    assert non_numeric.details == {"reason": "non_numeric", "field": "a", "value": "n/a"}
+
+
+@pytest.mark.parametrize("mode", [EvaluationMode.ERRORS_ONLY, EvaluationMode.FAIL_FAST])
+def test_columnar_modes_match_row_by_row(rules_engine, mode):
+    rng = random.Random(7)
+    applications = [random_application(rng) for _ in range(500)]
+
+    row_wise = rules_engine.validate_many(copy.deepcopy(applications), mode=mode)
+    columnar = rules_engine.validate_many(copy.deepcopy(applications), columnar=True, mode=mode)
+
+    assert columnar == row_wise
+    assert all(not s.successes for s in columnar)
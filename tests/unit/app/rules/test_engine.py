@@ -154,3 +154,182 @@ def test_married_requires_spouse_info(rules_engine, sample_application):
     sample_application["spouseInfo"] = {"name": "Jane Doe", "ssn": ""}
     summary = rules_engine.validate(sample_application)
     assert has_error(summary, "married_requires_spouse_info")
+
+
+def test_validate_many_preserves_order(rules_engine, sample_application):
+    invalid = copy.deepcopy(sample_application)
+    invalid["stateOfResidence"] = "XX"
+
+    summaries = rules_engine.validate_many(
+        [copy.deepcopy(sample_application), invalid, copy.deepcopy(sample_application)]
+    )
+
+    assert [s.valid for s in summaries] == [True, False, True]
+    assert has_error(summaries[1], "state_code_valid")
+
+
+def test_engine_version_is_rules_checksum(rules_engine):
+    import hashlib
+
+    expected = hashlib.sha256((FIXTURESPATH / "rules.yaml").read_bytes()).hexdigest()
+    assert rules_engine.version == expected
+
+
+def test_shared_conditions_dispatch_in_rule_order():
+    from app.rules.engine import rule_from_dict
+
+    def gated(name, field, equals):
+        return rule_from_dict({
+            "name": name,
+            "type": "presence",
+            "field": "missing.field",
+            "when": {"field": field, "equals": equals},
+        })
+
+    engine = RulesEngine(
+        rules=[
+            gated("dependent_a", "dependencyStatus", "dependent"),
+            gated("independent", "dependencyStatus", "independent"),
+            gated("list_condition", "codes", ["a", "b"]),
+            gated("dependent_b", "dependencyStatus", "dependent"),
+            gated("flag_is_one", "flag", 1),
+        ],
+        transforms=[],
+    )
+
+    summary = engine.validate({"dependencyStatus": "dependent", "codes": ["a", "b"], "flag": True})
+
+    assert [r.name for r in summary.errors] == ["dependent_a", "list_condition", "dependent_b", "flag_is_one"]
+    assert [(r.name, r.details) for r in summary.successes] == [
+        ("independent", {"reason": "condition_not_met"}),
+    ]
+
+
+def test_evaluation_modes(rules_engine, sample_application):
+    from app.rules.models import EvaluationMode
+
+    sample_application["studentInfo"]["ssn"] = "12"
+    sample_application["stateOfResidence"] = "XX"
+    sample_application["household"]["numberInCollege"] = 10
+
+    full = rules_engine.validate(copy.deepcopy(sample_application))
+    errors_only = rules_engine.validate(copy.deepcopy(sample_application), EvaluationMode.ERRORS_ONLY)
+    fail_fast = rules_engine.validate(copy.deepcopy(sample_application), EvaluationMode.FAIL_FAST)
+
+    assert len(full.errors) >= 2
+    assert errors_only.errors == full.errors
+    assert errors_only.warnings == full.warnings
+    assert errors_only.successes == []
+    # Fail-fast stops at the first failing error in its (cheapest first) order
+    failed = {e.name: e for e in full.errors}
+    order = [rules_engine.rules[i].name for i in rules_engine.analysis.fail_fast_order]
+    assert fail_fast.errors == [failed[next(name for name in order if name in failed)]]
+    assert not fail_fast.valid and fail_fast.successes == []
+
+
+def test_validate_delta_matches_full_revalidation(rules_engine, sample_application):
+    import random
+    from app.rules.helpers import set_by_path
+
+    rng = random.Random(3)
+    paths = [
+        "studentInfo.ssn", "studentInfo.dateOfBirth", "studentInfo", "dependencyStatus",
+        "maritalStatus", "household.numberInCollege", "household", "income.parentIncome",
+        "income", "stateOfResidence", "spouseInfo", "spouseInfo.ssn",
+    ]
+    values = [None, "", "12", "123456789", 0, -5, 3, 10, "dependent", "married", "XX", "CA",
+              "2015-06-01", {"ssn": "1"}, {"numberInHousehold": 2}]
+
+    application = copy.deepcopy(sample_application)
+    state = rules_engine.validate_state(copy.deepcopy(application))
+    for _ in range(300):
+        changes = {rng.choice(paths): rng.choice(values) for _ in range(rng.randint(1, 3))}
+        for path, value in changes.items():
+            set_by_path(application, path, copy.deepcopy(value))
+
+        state = rules_engine.validate_delta(state, copy.deepcopy(changes))
+
+        assert state.summary() == rules_engine.validate(copy.deepcopy(application)), changes
+
+
+def test_validate_delta_only_reevaluates_touched_rules(rules_engine, sample_application):
+    state = rules_engine.validate_state(copy.deepcopy(sample_application))
+
+    delta = rules_engine.validate_delta(state, {"stateOfResidence": "XX"})
+
+    changed = [i for i, (a, b) in enumerate(zip(state.results, delta.results)) if a is not b]
+    assert [delta.results[i].name for i in changed] == ["state_code_valid"]
+    assert has_error(delta.summary(), "state_code_valid")
+    assert not has_error(state.summary(), "state_code_valid")
+
+
+def test_validate_does_not_mutate_input(rules_engine, sample_application):
+    before = copy.deepcopy(sample_application)
+
+    summaries = rules_engine.validate_many([sample_application, sample_application])
+
+    assert sample_application == before
+    assert summaries[0] == summaries[1]
+
+
+def test_date_dependent_transforms_use_given_day(rules_engine, sample_application):
+    sample_application["studentInfo"]["dateOfBirth"] = "2010-06-15"
+
+    younger = rules_engine.validate(sample_application, today=date(2024, 6, 14))
+    older = rules_engine.validate(sample_application, today=date(2024, 6, 15))
+
+    assert has_error(younger, "student_age_minimum")
+    assert not has_error(older, "student_age_minimum")
+
+
+def test_lazy_transforms_match_eager_application(monkeypatch):
+    import random
+    from app.rules import helpers
+    from app.rules.engine import rule_from_dict
+    from app.rules.helpers import get_by_path, set_by_path
+    from app.rules.models import TransformRule
+
+    calls = []
+
+    def tag(name):
+        def transform(value):
+            calls.append(name)
+            return f"{name}({value!r})"
+        return transform
+
+    for name in ("t0", "t1", "t2", "t3", "t4", "t5"):
+        monkeypatch.setitem(helpers.TRANSFORM_REGISTRY, name, tag(name))
+
+    rng = random.Random(11)
+    paths = ["a", "a.b", "a.c", "d", "d.e", "f"]
+    for _ in range(200):
+        transforms = [
+            TransformRule(name=f"t{i}", field=rng.choice(paths), transform=f"t{i}", output_field=rng.choice(paths))
+            for i in range(rng.randint(1, 6))
+        ]
+        rules = [
+            rule_from_dict({
+                "name": f"r{i}",
+                "type": "value_in_set",
+                "field": rng.choice(paths),
+                "allowed_values": [None],
+                **({"when": {"field": rng.choice(paths), "equals": None}} if rng.random() < 0.3 else {}),
+            })
+            for i in range(rng.randint(0, 3))
+        ]
+        data = {"a": {"b": 1}, "d": 2}
+
+        # Reference: every transform, eagerly, in list order
+        eager = copy.deepcopy(data)
+        for t in transforms:
+            set_by_path(eager, t.output_field, helpers.TRANSFORM_REGISTRY[t.transform](get_by_path(eager, t.field)))
+        expected = RulesEngine(rules=rules, transforms=[]).validate(eager)
+
+        calls.clear()
+        summary = RulesEngine(rules=rules, transforms=transforms).validate(data)
+
+        assert summary == expected
+        assert data == {"a": {"b": 1}, "d": 2}
+        assert len(calls) == len(set(calls))  # memoized: each runs at most once
+        if not rules:
+            assert calls == []
@@ -32,3 +32,29 @@ def test_set_by_path():
 
     helpers.set_by_path(data, "a.b", [1, 2, 3])
     assert data == {"x": {"y": {"z": 100, "w": 200}}, "a": {"b": [1, 2, 3]}}
+
+
+def test_split_path_and_get_by_parts():
+    data = {"a": {"b": {"c": 42}}}
+
+    parts = helpers.split_path("a.b.c")
+    assert parts == ("a", "b", "c")
+    assert helpers.get_by_parts(data, parts) == helpers.get_by_path(data, "a.b.c")
+
+    # Empty path behaves like get_by_path("")
+    assert helpers.split_path("") == ()
+    assert helpers.get_by_parts(data, ()) is None
+
+
+def test_set_by_parts():
+    data = {"x": 1}
+
+    helpers.set_by_parts(data, helpers.split_path("x.y"), 2)
+    assert data == {"x": {"y": 2}}
+
+
+def test_comparison_operator():
+    assert helpers.comparison_operator("lte")(1.0, 1.0) is True
+    assert helpers.comparison_operator("neq")(1.0, 1.0) is False
+    # Unknown operators never pass
+    assert helpers.comparison_operator("between")(1.0, 1.0) is False
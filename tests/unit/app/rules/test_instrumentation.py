@@ -0,0 +1,138 @@
+import copy
+
+import pytest
+
+from app.rules.engine import RulesEngine, rule_from_dict
+from app.rules.instrumentation import EngineMetrics, Histogram, format_histogram
+from app.rules.models import EvaluationMode
+from tests.fixtures import FIXTURESPATH
+
+
+APPLICATION = {
+    "studentInfo": {
+        "firstName": "John",
+        "lastName": "Doe",
+        "ssn": "123456789",
+        "dateOfBirth": "2000-01-01",
+    },
+    "household": {"numberInHousehold": 4, "numberInCollege": 1},
+    "income": {"studentIncome": 15000, "parentIncome": 40000},
+    "stateOfResidence": "CA",
+    "dependencyStatus": "dependent",
+    "maritalStatus": "single",
+}
+
+
+def test_metrics_count_outcomes_per_rule():
+    metrics = EngineMetrics(sample_every=2)
+    engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml", metrics=metrics)
+
+    for state in ("CA", "XX", "NY", "XX"):
+        engine.validate({**copy.deepcopy(APPLICATION), "stateOfResidence": state})
+
+    text = metrics.render_prometheus()
+    assert "fafsa_validations_total 4" in text
+    assert 'fafsa_rule_results_total{rule="state_code_valid",outcome="failed"} 2' in text
+    assert 'fafsa_rule_results_total{rule="state_code_valid",outcome="passed"} 2' in text
+    assert 'fafsa_rule_results_total{rule="married_requires_spouse_info",outcome="skipped"} 4' in text
+    assert 'fafsa_rule_evaluations_total{rule="married_requires_spouse_info"} 0' in text
+    # Every second validation is timed
+    assert 'fafsa_validate_duration_seconds_count 2' in text
+    assert 'fafsa_rule_duration_seconds_count{rule="state_code_valid"} 2' in text
+    assert 'fafsa_transform_duration_seconds_count{transform="derive_age"} 2' in text
+
+
+@pytest.mark.parametrize("backend", ["interpreted", "codegen"])
+def test_errors_only_counts_the_same_outcomes_as_full(backend):
+    def rule_counts(mode, columnar=False):
+        metrics = EngineMetrics(sample_every=1000)
+        engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml", metrics=metrics, backend=backend)
+        records = [{**copy.deepcopy(APPLICATION), "stateOfResidence": state} for state in ("CA", "XX", "NY")]
+        if columnar:
+            engine.validate_many(records, columnar=True, mode=mode)
+        else:
+            for data in records:
+                engine.validate(data, mode)
+        return sorted(
+            line for line in metrics.render_prometheus().splitlines()
+            if line.startswith(("fafsa_validations_total", "fafsa_rule_results_total", "fafsa_rule_evaluations_total"))
+        )
+
+    full = rule_counts(EvaluationMode.FULL)
+    assert rule_counts(EvaluationMode.ERRORS_ONLY) == full
+    if backend == "interpreted":
+        pytest.importorskip("numpy")
+        assert rule_counts(EvaluationMode.ERRORS_ONLY, columnar=True) == full
+
+
+def test_fail_fast_counts_only_rules_that_ran():
+    metrics = EngineMetrics(sample_every=1000)
+    engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml", metrics=metrics)
+    data = copy.deepcopy(APPLICATION)
+    data["studentInfo"]["ssn"] = "12"
+    data["stateOfResidence"] = "XX"
+    summary = engine.validate(data, EvaluationMode.FAIL_FAST)
+
+    order = [engine.rules[i].name for i in engine.analysis.fail_fast_order]
+    ran = order[:order.index(summary.errors[0].name) + 1]
+    text = metrics.render_prometheus()
+    for name in order:
+        counted = f'fafsa_rule_results_total{{rule="{name}",outcome="failed"}}' in text
+        assert counted == (name in ran)
+    assert f'fafsa_rule_results_total{{rule="{summary.errors[0].name}",outcome="failed"}} 1' in text
+
+
+@pytest.mark.parametrize("backend, columnar", [("interpreted", False), ("codegen", False), ("interpreted", True)])
+def test_fail_fast_counts_batch_scoped_rules_run_after_the_stop(backend, columnar):
+    if columnar:
+        pytest.importorskip("numpy")
+    raw = [
+        {"type": "value_comparison", "name": "inc", "field": "income.studentIncome", "operator": "gte", "value": 0},
+        {"type": "presence", "name": "spouse", "field": "spouseInfo.ssn",
+         "when": {"field": "maritalStatus", "equals": "married"}},
+        {"type": "unique_in_batch", "name": "dup", "fields": ["studentInfo.ssn"]},
+        {"type": "string_match", "name": "ssn", "field": "studentInfo.ssn", "pattern": "^[0-9]{9}$"},
+    ]
+    metrics = EngineMetrics(sample_every=1000)
+    engine = RulesEngine([rule_from_dict(r) for r in raw], [], metrics=metrics, backend=backend)
+    assert [engine.rules[i].name for i in engine.analysis.fail_fast_order] == ["spouse", "inc", "dup", "ssn"]
+    records = [copy.deepcopy(APPLICATION) for _ in range(3)]
+    records[0]["income"]["studentIncome"] = -1  # stops at inc; dup still indexes it
+    records[2]["studentInfo"]["ssn"] = "987654321"
+
+    summaries = engine.validate_many(records, columnar=columnar, mode=EvaluationMode.FAIL_FAST)
+
+    assert [[e.name for e in s.errors] for s in summaries] == [["inc"], ["dup"], []]
+    counts = [
+        line for line in metrics.render_prometheus().splitlines()
+        if line.startswith("fafsa_rule_results_total{") and not line.endswith(" 0")
+    ]
+    assert sorted(counts) == sorted(
+        f'fafsa_rule_results_total{{rule="{name}",outcome="{outcome}"}} {n}'
+        for name, outcome, n in [
+            ("spouse", "skipped", 3),
+            ("inc", "passed", 2), ("inc", "failed", 1),
+            ("dup", "passed", 2), ("dup", "failed", 1),
+            ("ssn", "passed", 1),
+        ]
+    )
+
+
+def test_instrumented_results_match_plain_engine():
+    plain = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+    instrumented = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml", metrics=EngineMetrics(sample_every=1))
+
+    assert instrumented.validate(copy.deepcopy(APPLICATION)) == plain.validate(copy.deepcopy(APPLICATION))
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram([1_000, 1_000_000])
+    for value in (500, 2_000, 5_000_000):
+        hist.observe(value)
+
+    text = format_histogram("latency_seconds", "Latency.", [({"rule": "r"}, hist)])
+
+    assert 'latency_seconds_bucket{rule="r",le="1e-06"} 1' in text
+    assert 'latency_seconds_bucket{rule="r",le="0.001"} 2' in text
+    assert 'latency_seconds_bucket{rule="r",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{rule="r"} 3' in text
@@ -0,0 +1,114 @@
+import dataclasses
+import pickle
+
+import pytest
+
+from app.rules.models import (
+    Details,
+    DetailsLayout,
+    FieldComparisonRule,
+    RequiresRule,
+    StringMatchRule,
+    ValueComparisonRule,
+    ValueInSetRule,
+)
+
+
+def test_compiled_rule_is_reusable():
+    rule = StringMatchRule(name="ssn", field="ssn", pattern="^[0-9]{9}$")
+    evaluate = rule.compile()
+
+    assert evaluate({"ssn": "123456789"}).passed
+    assert not evaluate({"ssn": "12345"}).passed
+    # Compiled evaluator and one-off apply agree
+    assert evaluate({"ssn": "12345"}) == rule.apply({"ssn": "12345"})
+
+
+def test_value_comparison_non_numeric():
+    rule = ValueComparisonRule(name="n", field="x", operator="gte", value=0)
+
+    result = rule.apply({"x": "abc"})
+    assert not result.passed
+    assert result.details == {"reason": "non_numeric", "field": "x", "value": "abc"}
+
+    # Non-numeric thresholds fail every present value
+    bad_threshold = ValueComparisonRule(name="n", field="x", operator="gte", value="zero")
+    assert bad_threshold.apply({"x": 1}).details["reason"] == "non_numeric"
+    assert bad_threshold.apply({}).passed
+
+
+def test_unknown_operator_never_passes():
+    value_rule = ValueComparisonRule(name="v", field="x", operator="between", value=0)
+    field_rule = FieldComparisonRule(name="f", left_field="x", operator="between", right_field="y")
+
+    assert not value_rule.apply({"x": 1}).passed
+    assert not field_rule.apply({"x": 1, "y": 1}).passed
+
+
+def test_value_in_set_handles_unhashable_values():
+    rule = ValueInSetRule(name="s", field="x", allowed_values=["a", "b"])
+
+    assert rule.apply({"x": "a"}).passed
+    assert not rule.apply({"x": ["a"]}).passed
+
+    nested = ValueInSetRule(name="s", field="x", allowed_values=[["a"], "b"])
+    assert nested.apply({"x": ["a"]}).passed
+
+
+def test_check_agrees_with_evaluator():
+    from app.rules.models import PresenceRule, RequiresRule
+
+    rules = [
+        PresenceRule(name="p", field="x"),
+        StringMatchRule(name="s", field="x", pattern="[0-9]+"),
+        ValueComparisonRule(name="v", field="x", operator="gte", value=0),
+        ValueComparisonRule(name="t", field="x", operator="gte", value="zero"),
+        FieldComparisonRule(name="f", left_field="x", operator="lt", right_field="y"),
+        ValueInSetRule(name="i", field="x", allowed_values=["a", 1, [1]]),
+        RequiresRule(name="r", required_fields=["x", "y"]),
+    ]
+    values = [None, "", "a", "12", 0, -1, 1, 2.5, True, [1], {"k": 1}]
+
+    for rule in rules:
+        evaluate, check = rule.compile(), rule.compile_check()
+        for x in values:
+            for data in ({"x": x}, {"x": x, "y": 1}):
+                assert check(data) == evaluate(data).passed, (rule.name, data)
+
+
+def test_details_behave_like_the_equivalent_dict():
+    layout = DetailsLayout(("field", "value", "pattern"), {"field": "ssn", "pattern": "x"})
+    details = Details(layout, ("123",))
+    expected = {"field": "ssn", "value": "123", "pattern": "x"}
+
+    assert details == expected and expected == details
+    assert details == Details(DetailsLayout(layout.keys, layout.static), ("123",))
+    assert details != {"field": "ssn", "value": "123"}
+    assert details != layout.bind("456")
+    assert list(details.items()) == list(expected.items())
+    assert details.get("value") == "123" and details.get("missing") is None
+    assert details.to_dict() == expected and repr(details) == repr(expected)
+    assert pickle.loads(pickle.dumps(details)) == expected
+
+
+def test_results_are_immutable_and_share_static_details():
+    rule = ValueInSetRule(name="state", field="state", allowed_values=["CA", "NY"])
+    evaluate = rule.compile()
+    ok, bad = evaluate({"state": "CA"}), evaluate({"state": "XX"})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        ok.passed = False  # type: ignore[misc]
+    assert not hasattr(ok, "__dict__")
+    # One layout per rule; the allowed values are referenced, never copied
+    assert ok.details.layout is bad.details.layout
+    assert bad.details["allowed_values"] is rule.allowed_values
+    assert bad.details.values == ("XX",)
+
+
+def test_constant_results_are_shared():
+    match = StringMatchRule(name="ssn", field="ssn", pattern="^[0-9]{9}$").compile()
+    requires = RequiresRule(name="r", required_fields=["a"]).compile()
+
+    assert match({}) is match({"other": 1})
+    assert match({}).details == {"reason": "field_missing_treated_as_pass", "field": "ssn"}
+    assert requires({"a": 1}) is requires({"a": 2})
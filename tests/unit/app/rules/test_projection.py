@@ -0,0 +1,173 @@
+import copy
+import random
+from datetime import date
+from typing import Dict, List, Optional
+
+import pytest
+from pydantic import BaseModel, field_serializer
+
+from app.models import ApplicationData
+from app.rules import helpers
+from app.rules.engine import RulesEngine, rule_from_dict
+from app.rules.models import EvaluationMode, TransformRule
+from tests.fixtures import FIXTURESPATH
+
+
+def random_application(rng: random.Random) -> ApplicationData:
+    def digits(n):
+        return "".join(rng.choice("0123456789") for _ in range(n))
+
+    return ApplicationData.model_validate({
+        "studentInfo": {
+            "firstName": "Ann",
+            "lastName": "Lee",
+            "ssn": rng.choice([digits(9), digits(4), "abc"]),
+            "dateOfBirth": rng.choice(["2000-01-01", "2015-07-04", "1990-12-31"]),
+        },
+        "household": {"numberInHousehold": rng.randint(0, 6), "numberInCollege": rng.randint(0, 6)},
+        "income": {
+            "studentIncome": rng.choice([0, 1500, -20, 12.5]),
+            **({"parentIncome": rng.choice([0, 40000, -1])} if rng.random() < 0.7 else {}),
+        },
+        "spouseInfo": rng.choice([None, {"name": rng.choice(["", "Sam"]), "ssn": digits(rng.choice([9, 3]))}]),
+        "stateOfResidence": rng.choice(["CA", "NY", "XX"]),
+        "dependencyStatus": rng.choice(["dependent", "independent"]),
+        "maritalStatus": rng.choice(["single", "married"]),
+    })
+
+
+# Whole sub-objects, leaves, paths under scalars and fields that don't exist
+PATHS = [
+    "studentInfo", "studentInfo.ssn", "studentInfo.dateOfBirth", "studentInfo.age", "studentInfo.ssn.x",
+    "income", "income.parentIncome", "income.studentIncome", "spouseInfo", "spouseInfo.name",
+    "household.numberInCollege", "stateOfResidence", "maritalStatus", "missing", "missing.deeper",
+]
+
+
+def random_engine(rng: random.Random) -> RulesEngine:
+    rules = []
+    for i in range(rng.randint(1, 8)):
+        raw = {"name": f"r{i}", "type": rng.choice(["presence", "value_in_set", "requires", "value_comparison"])}
+        if raw["type"] == "requires":
+            raw["required_fields"] = rng.sample(PATHS, 2)
+        else:
+            raw["field"] = rng.choice(PATHS)
+        if raw["type"] == "value_in_set":
+            raw["allowed_values"] = ["CA", None, "married"]
+        if raw["type"] == "value_comparison":
+            raw.update(operator="gte", value=0)
+        if rng.random() < 0.3:
+            raw["when"] = {"field": rng.choice(PATHS), "equals": rng.choice(["married", None])}
+        rules.append(rule_from_dict(raw))
+    transforms = [
+        TransformRule(name=f"t{i}", field=rng.choice(PATHS), transform="tag", output_field=rng.choice(PATHS))
+        for i in range(rng.randint(0, 2))
+    ]
+    return RulesEngine(rules=rules, transforms=transforms)
+
+
+@pytest.mark.parametrize("mode", list(EvaluationMode))
+def test_validate_model_matches_validating_the_dump(monkeypatch, mode):
+    monkeypatch.setitem(helpers.TRANSFORM_REGISTRY, "tag", lambda value: ["tag", value])
+    rng = random.Random(20)
+    for _ in range(200):
+        engine = random_engine(rng)
+        for _ in range(10):
+            model = random_application(rng)
+            before = model.model_dump()
+
+            assert repr(engine.validate_model(model, mode)) == repr(engine.validate(model.model_dump(), mode))
+            assert model.model_dump() == before
+
+
+def test_projection_holds_only_what_the_rules_read():
+    engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+    model = random_application(random.Random(1))
+
+    projected = engine.project(model)
+
+    assert "firstName" not in projected["studentInfo"]
+    assert projected["studentInfo"]["dateOfBirth"] == model.studentInfo.dateOfBirth
+    assert engine.validate(projected, owned=True, today=date(2024, 1, 1)) == engine.validate(
+        model.model_dump(), today=date(2024, 1, 1)
+    )
+    # Transforms wrote into the owned projection, not into the model
+    assert "age" in projected["studentInfo"]
+    assert "age" not in model.studentInfo.__dict__
+
+
+class Money(BaseModel):
+    cents: int
+
+    @field_serializer("cents")
+    def _dollars(self, cents: int) -> float:
+        return cents / 100
+
+
+class Account(BaseModel):
+    balance: Money
+    history: List[Money] = []
+    tags: Dict[str, Optional[Money]] = {}
+
+
+def test_projection_follows_model_dump_for_custom_serialization():
+    engine = RulesEngine(
+        rules=[
+            rule_from_dict({"name": "cents", "type": "value_comparison", "field": "balance.cents", "operator": "gte", "value": 1}),
+            rule_from_dict({"name": "history", "type": "presence", "field": "history"}),
+            rule_from_dict({"name": "tag", "type": "presence", "field": "tags.main.cents"}),
+        ],
+        transforms=[],
+    )
+    account = Account(balance=Money(cents=50), history=[Money(cents=1)], tags={"main": Money(cents=7), "old": None})
+
+    assert engine.project(account) == {
+        "balance": {"cents": 0.5},
+        "history": [{"cents": 0.01}],
+        "tags": {"main": {"cents": 0.07}},
+    }
+    assert engine.validate_model(account) == engine.validate(account.model_dump())
+    assert engine.validate_model(account).errors[0].name == "cents"
+
+
+def test_owned_views_write_in_place_and_others_copy():
+    engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+    data = random_application(random.Random(2)).model_dump()
+    shared = copy.deepcopy(data)
+
+    engine.validate(shared)
+    assert shared == data
+    engine.validate(shared, owned=True)
+    assert "age" in shared["studentInfo"]
+
+
+class Inner(BaseModel):
+    code: Optional[str] = None
+
+
+class Special(Inner):
+    pass
+
+
+class Outer(BaseModel):
+    inner: Optional[Inner] = None
+    either: Optional[Dict[str, str]] = None
+
+
+def test_compiled_projection_falls_back_for_unexpected_values():
+    engine = RulesEngine(
+        rules=[
+            rule_from_dict({"name": "code", "type": "presence", "field": "inner.code"}),
+            rule_from_dict({"name": "either", "type": "presence", "field": "either.code"}),
+        ],
+        transforms=[],
+    )
+    cases = [
+        (Outer(inner=Inner(code="a"), either={"code": "b"}), {"inner": {"code": "a"}, "either": {"code": "b"}}),
+        # A subclass instance isn't read by the compiled path, but ends up the same
+        (Outer(inner=Special(code="c")), {"inner": {"code": "c"}, "either": None}),
+        (Outer(), {"inner": None, "either": None}),
+    ]
+    for model, expected in cases:
+        assert engine.project(model) == expected
+        assert engine.validate_model(model) == engine.validate(model.model_dump())
@@ -0,0 +1,117 @@
+import copy
+import json
+from datetime import date
+
+import pytest
+import yaml
+
+from app.rules import snapshot
+from app.rules.engine import RulesEngine
+from tests.fixtures import FIXTURESPATH
+
+
+APPLICATION = {
+    "studentInfo": {
+        "firstName": "John",
+        "lastName": "Doe",
+        "ssn": "12345",
+        "dateOfBirth": "2000-01-01",
+    },
+    "dependencyStatus": "independent",
+    "maritalStatus": "married",
+    "household": {"numberInHousehold": 1, "numberInCollege": 3},
+    "income": {"studentIncome": -1, "parentIncome": 40000},
+    "stateOfResidence": "ZZ",
+    "spouseInfo": None,
+}
+
+
+@pytest.fixture
+def rules_path(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_bytes((FIXTURESPATH / "rules.yaml").read_bytes())
+    return path
+
+
+def test_snapshot_path_for():
+    assert snapshot.snapshot_path_for("config/rules.yaml").as_posix() == "config/rules.snapshot.json"
+
+
+def test_snapshot_round_trip_gives_identical_results(rules_path):
+    from_yaml = RulesEngine.from_yaml(rules_path)
+    from_yaml.write_snapshot(snapshot.snapshot_path_for(rules_path))
+
+    loaded = RulesEngine.load(rules_path)
+
+    assert loaded.version == from_yaml.version
+    assert loaded.validate(copy.deepcopy(APPLICATION)) == from_yaml.validate(copy.deepcopy(APPLICATION))
+
+
+def test_load_ignores_stale_snapshot(rules_path):
+    RulesEngine.from_yaml(rules_path).write_snapshot(snapshot.snapshot_path_for(rules_path))
+    raw = yaml.safe_load(rules_path.read_text())
+    raw["rules"] = [r for r in raw["rules"] if r["name"] != "state_code_valid"]
+    rules_path.write_text(yaml.safe_dump(raw))
+
+    engine = RulesEngine.load(rules_path)
+
+    summary = engine.validate(copy.deepcopy(APPLICATION))
+    assert engine.version == RulesEngine.from_yaml(rules_path).version
+    assert all(r.name != "state_code_valid" for r in summary.errors + summary.warnings + summary.successes)
+
+
+def test_read_snapshot_rejects_invalid_files(tmp_path):
+    path = tmp_path / "rules.snapshot.json"
+    assert snapshot.read_snapshot(path) is None
+
+    path.write_text("{not json")
+    assert snapshot.read_snapshot(path) is None
+
+    path.write_text(json.dumps({"format": 999, "source_sha256": "x", "rules": []}))
+    assert snapshot.read_snapshot(path) is None
+
+    path.write_text(json.dumps({"format": snapshot.SNAPSHOT_FORMAT, "source_sha256": "x", "rules": []}))
+    assert snapshot.read_snapshot(path, expected_sha256="y") is None
+    assert snapshot.read_snapshot(path, expected_sha256="x") is not None
+
+
+def test_rules_that_do_not_survive_json_are_rejected(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(yaml.safe_dump({"rules": [{
+        "name": "fixed_date",
+        "type": "value_in_set",
+        "field": "studentInfo.dateOfBirth",
+        "allowed_values": [date(2000, 1, 1)],
+    }]}))
+
+    with pytest.raises(ValueError):
+        RulesEngine.from_yaml(path).write_snapshot(tmp_path / "rules.snapshot.json")
+
+
+def test_none_operands_survive_a_round_trip(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(yaml.safe_dump({"rules": [{
+        "name": "no_value",
+        "type": "value_comparison",
+        "field": "income.studentIncome",
+        "operator": "eq",
+        "value": None,
+    }]}))
+    from_yaml = RulesEngine.from_yaml(path)
+    from_yaml.write_snapshot(snapshot.snapshot_path_for(path))
+
+    assert RulesEngine.load(path).rules == from_yaml.rules
+
+
+def test_load_falls_back_to_yaml_when_a_matching_snapshot_does_not_build(rules_path):
+    engine = RulesEngine.from_yaml(rules_path)
+    path = snapshot.snapshot_path_for(rules_path)
+    engine.write_snapshot(path)
+    data = json.loads(path.read_text())
+    del data["rules"][0]["name"]
+    path.write_text(json.dumps(data))
+
+    loaded = RulesEngine.load(rules_path)
+
+    assert loaded.rules == engine.rules
+    assert loaded.validate(copy.deepcopy(APPLICATION)) == engine.validate(copy.deepcopy(APPLICATION))
@@ -0,0 +1,83 @@
+from datetime import date
+
+import pytest
+
+from app.cache import LRUResultCache, result_cache_key
+from app.rules.engine import RulesEngine
+from tests.fixtures import FIXTURESPATH
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_is_canonical_and_scoped():
+    a = {"x": 1, "y": {"b": 2, "a": date(2000, 1, 1)}}
+    b = {"y": {"a": date(2000, 1, 1), "b": 2}, "x": 1}
+
+    assert result_cache_key(a, "v1", "full") == result_cache_key(b, "v1", "full")
+    assert result_cache_key(a, "v1", "full") != result_cache_key(a, "v2", "full")
+    assert result_cache_key(a, "v1", "full") != result_cache_key(a, "v1", "errors_only")
+    assert result_cache_key(a, "v1", "full", date(2024, 1, 1)) != result_cache_key(
+        a, "v1", "full", date(2024, 1, 2)
+    )
+
+
+def test_lru_evicts_by_count_and_bytes():
+    cache = LRUResultCache(max_entries=2, max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    assert cache.get("a") == b"1234"  # a is now most recently used
+    cache.set("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+
+    cache.set("d", b"12345678")  # over max_bytes together with a or c
+    assert len(cache) == 1 and cache.size_bytes == 8
+    cache.set("huge", b"x" * 11)  # never cached
+    assert cache.get("huge") is None
+    assert cache.evictions == 3
+
+
+def test_ttl_expiry_and_clear():
+    clock = FakeClock()
+    cache = LRUResultCache(ttl_seconds=10, clock=clock)
+    cache.set("a", b"1")
+
+    clock.now = 9.9
+    assert cache.get("a") == b"1"
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses, cache.expirations) == (1, 1, 1)
+
+    cache.set("b", b"1")
+    cache.clear()
+    assert cache.get("b") is None and cache.size_bytes == 0
+
+
+def test_render_prometheus_reports_hit_rate():
+    cache = LRUResultCache()
+    cache.set("a", b"1")
+    cache.get("a")
+    cache.get("b")
+
+    text = cache.render_prometheus()
+    assert 'fafsa_result_cache_requests_total{outcome="hit"} 1' in text
+    assert 'fafsa_result_cache_requests_total{outcome="miss"} 1' in text
+    assert "fafsa_result_cache_entries 1" in text
+
+
+def test_engine_reports_date_dependent_transforms():
+    assert RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml").date_dependent
+    assert not RulesEngine(rules=[], transforms=[]).date_dependent
+
+
+@pytest.mark.parametrize("max_entries,max_bytes", [(0, 1), (1, 0)])
+def test_limits_must_be_positive(max_entries, max_bytes):
+    with pytest.raises(ValueError):
+        LRUResultCache(max_entries=max_entries, max_bytes=max_bytes)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.executor import ExecutorSaturated, ValidationExecutor
+from app.responses import render_summary
+from app.rules.engine import RulesEngine
+from app.rules.models import ValidationSummary
+from tests.fixtures import FIXTURESPATH
+
+
+class BlockingEngine:
+    """Engine stand-in whose validate() waits until released."""
+    version = None
+    rules = []
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def validate(self, data, mode, owned=False):
+        self.release.wait(5)
+        return ValidationSummary(valid=True, errors=[], warnings=[], successes=[])
+
+
+def test_thread_executor_renders_validate_body():
+    engine = RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+    executor = ValidationExecutor(workers=1)
+    try:
+        body = asyncio.run(executor.validate(engine, {"stateOfResidence": "XX"}))
+    finally:
+        executor.shutdown()
+
+    result = json.loads(body)
+    assert result["valid"] is False
+    assert executor.completed == 1 and executor.wait.count == 1
+
+
+def test_executor_sheds_load_beyond_queue():
+    engine = BlockingEngine()
+    executor = ValidationExecutor(workers=1, max_queue=1)
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.validate(engine, {}))
+        queued = asyncio.ensure_future(executor.validate(engine, {}))
+        await asyncio.sleep(0)
+        assert (executor.in_flight, executor.queued) == (2, 1)
+
+        with pytest.raises(ExecutorSaturated):
+            await executor.validate(engine, {})
+
+        engine.release.set()
+        await asyncio.gather(running, queued)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert (executor.in_flight, executor.completed, executor.rejected) == (0, 2, 1)
+    text = executor.render_prometheus()
+    assert 'fafsa_validate_executor_rejected_total{kind="thread"} 1' in text
+    assert 'fafsa_validate_executor_wait_seconds_count{kind="thread"} 2' in text
+
+
+def test_executor_arguments_are_checked():
+    with pytest.raises(ValueError):
+        ValidationExecutor(kind="fiber")
+    with pytest.raises(ValueError):
+        ValidationExecutor(workers=0)
+
+
+def test_process_workers_use_the_parents_rules_not_the_file(tmp_path):
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text((FIXTURESPATH / "rules.yaml").read_text())
+    served = RulesEngine.load(rules_path)
+    # The file changes (here: breaks) while the parent still serves `served`
+    rules_path.write_text("rules:\n  - type: nope\n")
+    other = RulesEngine([], [])
+    data = {"stateOfResidence": "XX"}
+
+    executor = ValidationExecutor(kind="process", workers=2)
+
+    async def scenario():
+        bodies = await asyncio.gather(*[executor.validate(served, dict(data)) for _ in range(8)])
+        return bodies, await executor.validate(other, dict(data))
+
+    try:
+        bodies, other_body = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    expected = render_summary(served.validate(dict(data)), served)
+    assert bodies == [expected] * 8
+    assert json.loads(other_body)["valid"] is True
@@ -0,0 +1,179 @@
+import asyncio
+import copy
+import json
+import logging
+import shutil
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.executor import ValidationExecutor
+from app.main import app
+from app.registry import RuleSetRegistry
+from app.rules.engine import RulesEngine
+from app.rules.models import ValidationSummary
+from app.sessions import SessionStore
+from tests.fixtures import FIXTURESPATH
+
+
+SAMPLE = {
+    "studentInfo": {
+        "firstName": "John",
+        "lastName": "Doe",
+        "ssn": "123456789",
+        "dateOfBirth": "2000-01-01",
+    },
+    "dependencyStatus": "dependent",
+    "maritalStatus": "single",
+    "household": {"numberInHousehold": 4, "numberInCollege": 1},
+    "income": {"studentIncome": 15000, "parentIncome": 40000},
+    "stateOfResidence": "CA",
+    "spouseInfo": None,
+}
+
+
+class BlockingEngine:
+    """Engine stand-in whose validate() waits until released."""
+    version = None
+    rules = []
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def validate(self, data, mode, owned=False):
+        self.release.wait(5)
+        return ValidationSummary(valid=True, errors=[], warnings=[], successes=[])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A client on the app with its state set up directly (no lifespan)."""
+    executor = ValidationExecutor(workers=1)
+    state = {
+        "rules_engine": RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml"),
+        "rule_sets": None,
+        "result_cache": None,
+        "single_flight": None,
+        "shadow": None,
+        "delta_sessions": SessionStore(),
+        "validate_executor": executor,
+    }
+    for name, value in state.items():
+        monkeypatch.setattr(app.state, name, value, raising=False)
+    yield TestClient(app)
+    executor.shutdown()
+
+
+def test_validate_returns_the_summary(client):
+    response = client.post("/validate", json=SAMPLE)
+
+    assert response.status_code == 200
+    assert response.json()["valid"] is True
+
+
+def test_batch_reports_schema_errors_in_place(client):
+    invalid = copy.deepcopy(SAMPLE)
+    invalid["household"] = "four"
+    failing = copy.deepcopy(SAMPLE)
+    failing["stateOfResidence"] = "XX"
+
+    response = client.post("/validate/batch", json=[SAMPLE, invalid, failing, 7])
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 4
+    assert results[0]["valid"] is True and "schema_errors" not in results[0]
+    assert results[1]["valid"] is False
+    assert [error["loc"] for error in results[1]["schema_errors"]] == [["household"]]
+    assert results[2]["valid"] is False and "schema_errors" not in results[2]
+    assert results[2]["errors"]
+    assert results[3]["schema_errors"][0]["type"] == "model_type"
+
+
+def test_stream_reports_malformed_lines_and_keeps_going(client):
+    body = b"\n".join([
+        json.dumps(SAMPLE).encode(),
+        b"{not json",
+        b"",
+        json.dumps({**SAMPLE, "household": "four"}).encode(),
+        json.dumps(SAMPLE).encode(),
+    ])
+
+    response = client.post("/validate/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["line"] for result in results] == [1, 2, 4, 5]
+    assert [result["valid"] for result in results] == [True, False, False, True]
+    assert results[1]["schema_errors"][0]["type"] == "json_invalid"
+    assert results[2]["schema_errors"][0]["loc"] == ["household"]
+
+
+def test_delta_with_unknown_token_is_404(client):
+    response = client.post("/validate/delta", json={"token": "no-such-token", "changes": {"stateOfResidence": "CA"}})
+
+    assert response.status_code == 404
+
+
+def test_delta_edits_keep_one_stored_state(client):
+    sessions = app.state.delta_sessions
+    response = client.post("/validate/delta", json={"application": SAMPLE})
+    first = token = response.json()["token"]
+
+    for state in ["XX", "NY", "XX", "CA", "XX"]:
+        response = client.post("/validate/delta", json={"token": token, "changes": {"stateOfResidence": state}})
+        assert response.status_code == 200
+        token = response.json()["token"]
+
+    assert response.json()["valid"] is False
+    assert len(sessions) == 1
+    assert sessions.get(token).application["stateOfResidence"] == "XX"
+    assert client.post("/validate/delta", json={"token": first, "changes": {}}).status_code == 404
+
+
+def test_saturated_executor_answers_503_with_retry_after(client, monkeypatch):
+    executor = ValidationExecutor(workers=1, max_queue=0)
+    monkeypatch.setattr(app.state, "validate_executor", executor)
+    engine = BlockingEngine()
+    # Occupy the only worker from another event loop
+    busy = threading.Thread(target=asyncio.run, args=(executor.validate(engine, {}),))
+    busy.start()
+    try:
+        deadline = time.monotonic() + 5
+        while executor.in_flight == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        response = client.post("/validate", json=SAMPLE)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert executor.rejected == 1
+    finally:
+        engine.release.set()
+        busy.join()
+        executor.shutdown()
+
+
+def test_unknown_award_year_is_404(client, monkeypatch, tmp_path):
+    assert client.post("/validate", params={"award_year": "1999-00"}, json=SAMPLE).status_code == 404
+    assert client.post("/validate/batch", headers={"X-Award-Year": "1999-00"}, json=[SAMPLE]).status_code == 404
+
+    shutil.copy(FIXTURESPATH / "rules.yaml", tmp_path / "2024-25.yaml")
+    monkeypatch.setattr(app.state, "rule_sets", RuleSetRegistry(tmp_path, build=RulesEngine.load))
+    assert client.post("/validate", params={"award_year": "2024-25"}, json=SAMPLE).status_code == 200
+    assert client.post("/validate", params={"award_year": "2023-24"}, json=SAMPLE).status_code == 404
+
+
+def test_process_executor_starts_with_engine_metrics_off(monkeypatch, caplog):
+    monkeypatch.setitem(vars(app.state), "_state", {})  # the lifespan's state is dropped afterwards
+    monkeypatch.setenv("FAFSA_RULES_PATH", str(FIXTURESPATH / "rules.yaml"))
+    monkeypatch.setenv("FAFSA_VALIDATE_EXECUTOR", "process")
+    monkeypatch.setenv("FAFSA_VALIDATE_WORKERS", "1")
+    monkeypatch.delenv("FAFSA_METRICS_ENABLED", raising=False)
+
+    with caplog.at_level(logging.WARNING, logger="app.main"), TestClient(app) as client:
+        assert app.state.engine_metrics is None
+        assert client.post("/validate", json=SAMPLE).json()["valid"] is True
+    assert "Engine metrics are disabled" in caplog.text
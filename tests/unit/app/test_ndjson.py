@@ -0,0 +1,38 @@
+import asyncio
+
+from app.ndjson import iter_ndjson_lines
+
+
+def collect_lines(body: bytes, chunk_size: int, max_line_bytes: int = 1024):
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    async def run():
+        lines = []
+        async for batch in iter_ndjson_lines(chunks(), max_line_bytes=max_line_bytes):
+            lines.extend(batch)
+        return lines
+
+    return asyncio.run(run())
+
+
+def test_lines_are_numbered_across_chunk_boundaries():
+    body = b'{"a":1}\n\n{"b":2}\n{"c":3}'
+
+    for chunk_size in (1, 3, 64):
+        assert collect_lines(body, chunk_size) == [
+            (1, b'{"a":1}'),
+            (3, b'{"b":2}'),
+            (4, b'{"c":3}'),  # no trailing newline
+        ]
+
+
+def test_oversized_lines_are_reported_not_buffered():
+    body = b'{"a":1}\n' + b"x" * 50 + b'\n{"b":2}\n'
+
+    assert collect_lines(body, chunk_size=7, max_line_bytes=10) == [
+        (1, b'{"a":1}'),
+        (2, None),
+        (3, b'{"b":2}'),
+    ]
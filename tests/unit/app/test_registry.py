@@ -0,0 +1,128 @@
+import shutil
+import threading
+import time
+
+import pytest
+
+from app.registry import RuleSetRegistry, UnknownAwardYear, estimate_size
+from app.rules.engine import RulesEngine
+from app.rules.instrumentation import EngineMetrics
+from tests.fixtures import FIXTURESPATH
+
+
+@pytest.fixture
+def rules_dir(tmp_path):
+    for award_year in ("2023-24", "2024-25", "2025-26"):
+        shutil.copy(FIXTURESPATH / "rules.yaml", tmp_path / f"{award_year}.yaml")
+    (tmp_path / "notes.yaml").write_text("rules: []\n")
+    return tmp_path
+
+
+class CountingBuild:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path.stem)
+        time.sleep(self.delay)
+        return RulesEngine.load(path)
+
+
+def test_engines_load_on_first_use_and_are_reused(rules_dir):
+    build = CountingBuild()
+    registry = RuleSetRegistry(rules_dir, build=build)
+
+    assert registry.award_years == ["2023-24", "2024-25", "2025-26"]
+    assert build.calls == []
+    engine = registry.get("2024-25")
+    assert registry.get("2024-25") is engine
+    assert build.calls == ["2024-25"]
+    assert (registry.loads, registry.hits) == (1, 1)
+    assert registry.status()["loaded"]["2024-25"]["size_bytes"] > 0
+
+
+def test_unknown_award_years_are_rejected(rules_dir):
+    registry = RuleSetRegistry(rules_dir, build=CountingBuild())
+
+    for award_year in ("2030-31", "notes", "../rules"):
+        with pytest.raises(UnknownAwardYear):
+            registry.get(award_year)
+
+    # Files added later are found on a miss
+    shutil.copy(FIXTURESPATH / "rules.yaml", rules_dir / "2030-31.yaml")
+    assert registry.get("2030-31").version
+
+
+def test_least_recently_used_engine_is_evicted(rules_dir):
+    build = CountingBuild()
+    registry = RuleSetRegistry(rules_dir, build=build, max_engines=2)
+
+    registry.get("2023-24")
+    registry.get("2024-25")
+    registry.get("2023-24")
+    registry.get("2025-26")  # evicts 2024-25
+
+    assert set(registry.status()["loaded"]) == {"2023-24", "2025-26"}
+    assert registry.evictions == 1
+    registry.get("2024-25")
+    assert build.calls == ["2023-24", "2024-25", "2025-26", "2024-25"]
+
+
+def test_byte_budget_keeps_at_least_the_newest_engine(rules_dir):
+    registry = RuleSetRegistry(rules_dir, build=CountingBuild(), max_bytes=150, sizer=lambda engine: 100)
+
+    registry.get("2023-24")
+    registry.get("2024-25")
+
+    assert list(registry.status()["loaded"]) == ["2024-25"]
+    assert registry.status()["size_bytes"] == 100
+
+
+def test_concurrent_first_requests_share_one_build(rules_dir):
+    build = CountingBuild(delay=0.2)
+    registry = RuleSetRegistry(rules_dir, build=build)
+    engines = []
+
+    threads = [threading.Thread(target=lambda: engines.append(registry.get("2024-25"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert build.calls == ["2024-25"]
+    assert len(engines) == 8 and all(engine is engines[0] for engine in engines)
+    assert registry.loads + registry.coalesced + registry.hits == 8
+
+
+def test_failed_build_is_raised_to_every_waiter_and_retried(rules_dir):
+    (rules_dir / "2024-25.yaml").write_text("rules:\n  - type: not_a_rule_type\n    name: broken\n")
+    registry = RuleSetRegistry(rules_dir, build=CountingBuild())
+
+    with pytest.raises(ValueError, match="Unsupported rule type"):
+        registry.get("2024-25")
+    assert registry.failures == 1
+
+    shutil.copy(FIXTURESPATH / "rules.yaml", rules_dir / "2024-25.yaml")
+    assert registry.get("2024-25").version
+
+
+def test_clear_drops_loaded_engines(rules_dir):
+    build = CountingBuild()
+    registry = RuleSetRegistry(rules_dir, build=build)
+    first = registry.get("2024-25")
+
+    registry.clear()
+
+    assert registry.status()["loaded"] == {}
+    assert registry.get("2024-25") is not first
+    assert "fafsa_rule_sets_loaded 1\n" in registry.render_prometheus()
+
+
+def test_estimate_size_skips_shared_objects():
+    metrics = EngineMetrics()
+    bare = RulesEngine.load(FIXTURESPATH / "rules.yaml")
+    instrumented = RulesEngine.load(FIXTURESPATH / "rules.yaml", metrics=metrics)
+
+    assert estimate_size(bare) > estimate_size({"rules": []})
+    assert estimate_size(instrumented, shared=[metrics]) < estimate_size(instrumented)
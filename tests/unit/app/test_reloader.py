@@ -0,0 +1,59 @@
+import asyncio
+import shutil
+
+import pytest
+
+from app.reloader import RulesReloader
+from app.rules.engine import RulesEngine
+from tests.fixtures import FIXTURESPATH
+
+
+EXTRA_RULE = """
+  - type: presence
+    name: first_name_present
+    field: studentInfo.firstName
+"""
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / "rules.yaml"
+    shutil.copy(FIXTURESPATH / "rules.yaml", path)
+    return path
+
+
+def test_reload_swaps_engine_and_notifies(rules_file):
+    reloader = RulesReloader(rules_file, build=RulesEngine.from_yaml)
+    swapped = []
+    reloader.add_listener(swapped.append)
+    original = reloader.engine
+
+    # Unchanged file: nothing to swap
+    result = asyncio.run(reloader.reload())
+    assert not result.reloaded
+    assert reloader.engine is original
+
+    with open(rules_file, "a") as f:
+        f.write(EXTRA_RULE)
+    result = asyncio.run(reloader.reload())
+
+    assert result.reloaded
+    assert result.previous_version == original.version
+    assert reloader.engine is not original
+    assert reloader.engine.version == result.version != original.version
+    assert swapped == [reloader.engine]
+
+
+def test_failed_reload_keeps_current_engine(rules_file):
+    reloader = RulesReloader(rules_file, build=RulesEngine.from_yaml)
+    original = reloader.engine
+
+    with open(rules_file, "a") as f:
+        f.write("\n  - type: not_a_rule_type\n    name: broken\n")
+    result = asyncio.run(reloader.reload())
+
+    assert not result.reloaded
+    assert "Unsupported rule type" in result.error
+    assert reloader.engine is original
+    assert reloader.last_error == result.error
+    assert reloader.failures == 1
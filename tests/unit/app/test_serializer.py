@@ -0,0 +1,88 @@
+import copy
+import random
+
+import pytest
+
+from app.responses import render_summary
+from app.rules.engine import RulesEngine
+from app.rules.helpers import set_by_path
+from app.rules.models import RuleResult, RuleSeverity, ValidationSummary
+from app.serializer import SummaryEncoder, encode_value, encoder_for
+from tests.fixtures import FIXTURESPATH
+
+
+@pytest.fixture(scope="module")
+def rules_engine():
+    return RulesEngine.from_yaml(FIXTURESPATH / "rules.yaml")
+
+
+SAMPLE = {
+    "studentInfo": {
+        "firstName": "John",
+        "lastName": "Doe",
+        "ssn": "123456789",
+        "dateOfBirth": "2000-01-01",
+    },
+    "dependencyStatus": "dependent",
+    "maritalStatus": "single",
+    "household": {"numberInHousehold": 4, "numberInCollege": 1},
+    "income": {"studentIncome": 15000, "parentIncome": 40000},
+    "stateOfResidence": "CA",
+    "spouseInfo": None,
+}
+
+
+def test_matches_stdlib_encoding_on_random_applications(rules_engine):
+    rng = random.Random(7)
+    paths = [
+        "studentInfo.ssn", "studentInfo.dateOfBirth", "studentInfo.firstName", "dependencyStatus",
+        "maritalStatus", "household.numberInCollege", "household", "income.parentIncome",
+        "income.studentIncome", "stateOfResidence", "spouseInfo",
+    ]
+    values = [None, "", "12", "123456789", 0, -5, 3, 2 ** 70, 1e16, 1e-5, 0.1, -0.0, 12345.678,
+              "dependent", "married", "XX", "CA", "Zoë   \"quoted\"\n", "2015-06-01",
+              {"ssn": "1"}, {"numberInHousehold": 2}, [1, "a", None], [1.5e300]]
+
+    encoder = encoder_for(rules_engine)
+    for _ in range(500):
+        application = copy.deepcopy(SAMPLE)
+        for _ in range(rng.randint(0, 4)):
+            set_by_path(application, rng.choice(paths), copy.deepcopy(rng.choice(values)))
+        summary = rules_engine.validate(application)
+
+        assert encoder.encode(summary) == render_summary(summary), application
+
+
+def test_results_that_differ_from_the_rule_are_encoded_generically(rules_engine):
+    summary = ValidationSummary(
+        valid=False,
+        warnings=[],
+        errors=[
+            RuleResult("ssn_format", False, RuleSeverity.WARNING, "other", {1: "int key"}),
+            RuleResult("not_a_rule", False, RuleSeverity.ERROR, None, None),
+        ],
+        successes=[
+            RuleResult("ssn_format", True, RuleSeverity.ERROR, None, {"reason": "condition_not_met"}),
+            RuleResult("ssn_format", False, RuleSeverity.ERROR, None, {"value": (1, 2)}),
+        ],
+    )
+
+    assert encoder_for(rules_engine).encode(summary) == render_summary(summary)
+
+
+def test_duplicate_rule_names_fall_back_to_generic_encoding(rules_engine):
+    rule = rules_engine.rules[0]
+    encoder = SummaryEncoder([rule, copy.copy(rule)])
+    summary = ValidationSummary(
+        valid=True, errors=[], warnings=[], successes=[RuleResult(rule.name, True, rule.severity, None, {"x": 1})]
+    )
+
+    assert encoder.encode(summary) == render_summary(summary)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_non_finite_floats_are_rejected_like_the_stdlib(value):
+    with pytest.raises(ValueError):
+        encode_value(value)
+    with pytest.raises(ValueError):
+        encode_value({"a": [value]})
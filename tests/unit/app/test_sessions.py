@@ -0,0 +1,59 @@
+import pytest
+
+from app.rules.engine import RulesEngine
+from app.sessions import DeltaSession, SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_session():
+    engine = RulesEngine(rules=[], transforms=[])
+    return DeltaSession(application={}, state=engine.validate_state({}))
+
+
+def test_sessions_are_bounded_lru():
+    store = SessionStore(max_sessions=2)
+    first, second = store.put(make_session()), store.put(make_session())
+    assert store.get(first) is not None  # first is now most recently used
+
+    store.put(make_session())
+
+    assert len(store) == 2
+    assert store.get(second) is None
+    assert store.get(first) is not None
+
+
+def test_sessions_expire_when_idle():
+    clock = FakeClock()
+    store = SessionStore(ttl_seconds=10, clock=clock)
+    token = store.put(make_session())
+
+    clock.now = 9
+    assert store.get(token) is not None  # refreshes the idle timer
+    clock.now = 18
+    assert store.get(token) is not None
+    clock.now = 28
+    assert store.get(token) is None
+
+
+def test_successor_replaces_the_session_it_came_from():
+    store = SessionStore()
+    token = first = store.put(make_session())
+    other = store.put(make_session())
+    for _ in range(5):
+        token = store.put(make_session(), replaces=token)
+
+    assert len(store) == 2
+    assert store.get(first) is None
+    assert store.get(token) is not None and store.get(other) is not None
+
+
+def test_max_sessions_must_be_positive():
+    with pytest.raises(ValueError):
+        SessionStore(max_sessions=0)
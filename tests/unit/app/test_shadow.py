@@ -0,0 +1,129 @@
+import shutil
+import threading
+
+from app.models import ApplicationData
+from app.responses import render_summary
+from app.rules.engine import RulesEngine
+from app.rules.models import EvaluationMode
+from app.shadow import ShadowDiff, ShadowEvaluator
+from tests.fixtures import FIXTURESPATH
+
+
+APPLICATION = {
+    "studentInfo": {"firstName": "Ann", "lastName": "Lee", "ssn": "123456789", "dateOfBirth": "2000-01-01"},
+    "household": {"numberInHousehold": 4, "numberInCollege": 2},
+    "income": {"studentIncome": 1500, "parentIncome": 40000},
+    "spouseInfo": None,
+    "stateOfResidence": "CA",
+    "dependencyStatus": "dependent",
+    "maritalStatus": "single",
+}
+
+CANDIDATE_RULES = """
+  - type: presence
+    name: middle_name_present
+    field: studentInfo.middleName
+  - type: string_match
+    name: state_is_ny
+    field: stateOfResidence
+    pattern: "^NY$"
+    severity: warning
+"""
+
+
+def test_diff_counts_new_resolved_and_severity_changes():
+    diff = ShadowDiff()
+
+    diff.add(True, {}, True, {})
+    diff.add(False, {"a": "error", "b": "warning"}, False, {"a": "warning", "c": "error"})
+    diff.add(False, {"a": "error"}, True, {})
+
+    assert diff.to_dict() == {
+        "compared": 3,
+        "identical": 1,
+        "became_invalid": 0,
+        "became_valid": 1,
+        "rules": {
+            "a": {"new_failures": 0, "resolved_failures": 1, "severity_changes": 1},
+            "b": {"new_failures": 0, "resolved_failures": 1, "severity_changes": 0},
+            "c": {"new_failures": 1, "resolved_failures": 0, "severity_changes": 0},
+        },
+    }
+
+
+def test_shadow_compares_candidate_with_served_results(tmp_path):
+    candidate_path = tmp_path / "candidate.yaml"
+    shutil.copy(FIXTURESPATH / "rules.yaml", candidate_path)
+    with open(candidate_path, "a") as f:
+        f.write(CANDIDATE_RULES)
+    primary = RulesEngine.load(FIXTURESPATH / "rules.yaml")
+    shadow = ShadowEvaluator(RulesEngine.load(candidate_path), sample_every=2)
+    payload = ApplicationData.model_validate(APPLICATION)
+    body = render_summary(primary.validate_model(payload), primary)
+
+    shadow.start()
+    offered = [shadow.offer(payload, EvaluationMode.FULL, body) for _ in range(4)]
+    shadow.stop()
+
+    assert offered == [True, False, True, False]
+    report = shadow.report()
+    assert (report["sampled"], report["compared"], report["became_invalid"]) == (2, 2, 2)
+    assert report["rules"] == {
+        "middle_name_present": {"new_failures": 2, "resolved_failures": 0, "severity_changes": 0},
+        "state_is_ny": {"new_failures": 2, "resolved_failures": 0, "severity_changes": 0},
+    }
+    assert 'fafsa_shadow_comparisons_total{outcome="different"} 2\n' in shadow.render_prometheus()
+
+    shadow.reset()
+    assert shadow.report()["compared"] == 0
+
+
+def test_fail_fast_requests_are_skipped():
+    primary = RulesEngine.load(FIXTURESPATH / "rules.yaml")
+    shadow = ShadowEvaluator(primary, sample_every=1)
+    data = {**APPLICATION, "studentInfo": {**APPLICATION["studentInfo"], "ssn": "12"}, "stateOfResidence": "ZZ"}
+    payload = ApplicationData.model_validate(data)
+    body = render_summary(primary.validate_model(payload, EvaluationMode.FAIL_FAST), primary)
+
+    shadow.start()
+    assert not shadow.offer(payload, EvaluationMode.FAIL_FAST, body)
+    assert shadow.offer(payload, EvaluationMode.ERRORS_ONLY, render_summary(
+        primary.validate_model(payload, EvaluationMode.ERRORS_ONLY), primary
+    ))
+    shadow.stop()
+
+    report = shadow.report()
+    # The same rules on both sides: nothing resolved or new
+    assert (report["skipped_fail_fast"], report["compared"], report["identical"]) == (1, 1, 1)
+    assert 'fafsa_shadow_samples_total{outcome="skipped_fail_fast"} 1\n' in shadow.render_prometheus()
+
+
+class BlockingEngine:
+    """Stands in for the candidate: blocks the worker until released."""
+    version = "blocking"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def validate_model(self, model, mode):
+        self.release.wait()
+        raise RuntimeError("boom")
+
+
+def test_full_queue_drops_samples_without_blocking():
+    candidate = BlockingEngine()
+    shadow = ShadowEvaluator(candidate, sample_every=1, max_queue=2)
+    payload = ApplicationData.model_validate(APPLICATION)
+    body = b'{"valid":true,"errors":[],"warnings":[],"passed":[]}'
+
+    shadow.start()
+    results = [shadow.offer(payload, EvaluationMode.FULL, body) for _ in range(10)]
+    candidate.release.set()
+    shadow.stop()
+
+    report = shadow.report()
+    # One taken by the worker, two queued, the rest dropped
+    assert results.count(True) in (2, 3)
+    assert report["dropped"] == results.count(False)
+    assert report["failures"] == report["sampled"]
+    assert report["compared"] == 0
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.executor import ExecutorSaturated
+from app.singleflight import SingleFlight, single_flight_key
+
+
+class Work:
+    """Counts calls; each call finishes when `release` is set."""
+
+    def __init__(self, result=b"{}", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_identical_requests_share_one_evaluation():
+    flight = SingleFlight()
+
+    async def scenario():
+        work, other = Work(b"a"), Work(b"b")
+        waiting = [asyncio.ensure_future(flight.do("k", work)) for _ in range(5)]
+        waiting.append(asyncio.ensure_future(flight.do("other", other)))
+        await asyncio.sleep(0)
+        assert len(flight) == 2
+
+        work.release.set()
+        other.release.set()
+        assert await asyncio.gather(*waiting) == [b"a"] * 5 + [b"b"]
+        assert (work.calls, other.calls) == (1, 1)
+
+        # Nothing is kept once the evaluation is done
+        assert len(flight) == 0
+        again = Work(b"c")
+        again.release.set()
+        assert await flight.do("k", again) == b"c"
+
+    asyncio.run(scenario())
+    assert (flight.leaders, flight.coalesced) == (3, 4)
+    assert 'fafsa_single_flight_requests_total{role="coalesced"} 4' in flight.render_prometheus()
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def scenario():
+        work = Work(error=ExecutorSaturated("full"))
+        waiting = [asyncio.ensure_future(flight.do("k", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        work.release.set()
+        results = await asyncio.gather(*waiting, return_exceptions=True)
+        assert all(isinstance(r, ExecutorSaturated) for r in results)
+        assert work.calls == 1 and len(flight) == 0
+
+    asyncio.run(scenario())
+
+
+def test_a_caller_going_away_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def scenario():
+        work = Work(b"a")
+        leader = asyncio.ensure_future(flight.do("k", work))
+        follower = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        work.release.set()
+        assert await follower == b"a"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(scenario())
+
+
+def test_key_covers_body_rules_mode_and_day():
+    key = single_flight_key(b'{"a": 1}', "v1", "full")
+    assert key == single_flight_key(b'{"a": 1}', "v1", "full")
+    assert len({
+        key,
+        single_flight_key(b'{"a":1}', "v1", "full"),
+        single_flight_key(b'{"a": 1}', "v2", "full"),
+        single_flight_key(b'{"a": 1}', "v1", "fail_fast"),
+        single_flight_key(b'{"a": 1}', "v1", "full", date(2024, 1, 1)),
+    }) == 5